@@ -160,15 +160,16 @@ class PlexRawExtractor(ABC):
 
         database = self.config.raw_database
         table = self.raw_table_name()
-        self._ensure_raw_destination(database, table)
-        total_rows = self._insert_raw_rows(database, table, formatted_rows)
+        # CDF SDK calls block; run them off the loop so concurrent extractors keep fetching
+        await asyncio.to_thread(self._ensure_raw_destination, database, table)
+        total_rows = await asyncio.to_thread(self._insert_raw_rows, database, table, formatted_rows)
         logger.info("Inserted %s rows into %s.%s", total_rows, database, table)
 
         latest_timestamp = self._resolve_last_timestamp(transformed)
         if latest_timestamp:
             self.state_tracker.set_last_extraction_time(self.extractor_name, latest_timestamp)
 
-        self._upsert_extractor_metadata(formatted_rows)
+        await asyncio.to_thread(self._upsert_extractor_metadata, formatted_rows)
 
         return {"rows_written": total_rows, "last_timestamp": latest_timestamp}
 
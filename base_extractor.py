@@ -14,6 +14,7 @@ import os
 import sys
 import json
 import aiohttp
+import orjson
 import asyncio
 import logging
 from datetime import datetime, timezone
@@ -40,6 +41,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Open connections kept by the shared Plex session (aiohttp's default is 100)
+PLEX_CONNECTION_LIMIT = 64
+
 
 @dataclass
 class BaseExtractorConfig:
@@ -142,6 +146,9 @@ class BaseExtractor(ABC):
             'Content-Type': 'application/json'
         }
         
+        # Plex HTTP session, shared by every request so connections are reused
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        
         # State tracking
         self.running = False
         
@@ -192,28 +199,28 @@ class BaseExtractor(ABC):
         
         for attempt in range(self.config.max_retries):
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        url,
-                        headers=self.plex_headers,
-                        params=params
-                    ) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            # Handle both list and dict responses
-                            if isinstance(data, list):
-                                return data
-                            elif isinstance(data, dict) and 'data' in data:
-                                return data['data']
-                            else:
-                                return data
+                session = self._get_http_session()
+                async with session.get(
+                    url,
+                    headers=self.plex_headers,
+                    params=params
+                ) as response:
+                    if response.status == 200:
+                        data = orjson.loads(await response.read())
+                        # Handle both list and dict responses
+                        if isinstance(data, list):
+                            return data
+                        elif isinstance(data, dict) and 'data' in data:
+                            return data['data']
+                        else:
+                            return data
+                    else:
+                        error = await response.text()
+                        logger.warning(f"API error {response.status}: {error}")
+                        if attempt < self.config.max_retries - 1:
+                            await asyncio.sleep(self.config.retry_delay * (attempt + 1))
                         else:
-                            error = await response.text()
-                            logger.warning(f"API error {response.status}: {error}")
-                            if attempt < self.config.max_retries - 1:
-                                await asyncio.sleep(self.config.retry_delay * (attempt + 1))
-                            else:
-                                raise Exception(f"API call failed: {error}")
+                            raise Exception(f"API call failed: {error}")
             
             except aiohttp.ClientError as e:
                 logger.error(f"Network error: {e}")
@@ -222,6 +229,20 @@ class BaseExtractor(ABC):
                 else:
                     raise
     
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Shared Plex session, (re)created on first use"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=PLEX_CONNECTION_LIMIT)
+            )
+        return self._http_session
+    
+    async def close(self):
+        """Close the shared Plex session"""
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
+    
     def validate_dataset_configuration(self):
         """Validate that required datasets are configured"""
         required_datasets = self.get_required_datasets()
@@ -274,14 +295,17 @@ class BaseExtractor(ABC):
         """Run extraction in a loop"""
         self.running = True
         
-        while self.running:
-            try:
-                await self.run_extraction_cycle()
-            except Exception as e:
-                logger.error(f"Extraction cycle failed: {e}")
-            
-            logger.info(f"Waiting {self.config.extraction_interval} seconds until next extraction...")
-            await asyncio.sleep(self.config.extraction_interval)
+        try:
+            while self.running:
+                try:
+                    await self.run_extraction_cycle()
+                except Exception as e:
+                    logger.error(f"Extraction cycle failed: {e}")
+                
+                logger.info(f"Waiting {self.config.extraction_interval} seconds until next extraction...")
+                await asyncio.sleep(self.config.extraction_interval)
+        finally:
+            await self.close()
     
     def stop(self):
         """Stop the extraction loop"""
@@ -268,6 +268,7 @@ class BaseExtractor(ABC):
         
         # Initialize helpers
         self.naming = MultiTenantNamingConvention(config.facility)
+        self._dataset_ids: Dict[str, Optional[DatasetId]] = {}  # Config is fixed; resolve each type once
         self.dedup_helper = CDFDeduplicationHelper(self.client)
         self.state_tracker = StateTracker(f"state/{extractor_name}_state.json")
         
@@ -354,7 +355,12 @@ class BaseExtractor(ABC):
         pass
     
     def get_dataset_id(self, dataset_type: str) -> Optional[DatasetId]:
-        """Get dataset ID by type with validation"""
+        """Get dataset ID by type with validation, memoized per extractor"""
+        try:
+            return self._dataset_ids[dataset_type]
+        except KeyError:
+            pass
+        
         mapping = {
             'master': self.config.dataset_master_id,
             'production': self.config.dataset_production_id,
@@ -371,6 +377,7 @@ class BaseExtractor(ABC):
                 dataset_type=dataset_type
             )
         
+        self._dataset_ids[dataset_type] = dataset_id
         return dataset_id
     
     @with_retry(max_attempts=3, initial_delay=1.0)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Shared CogniteClient for the CDF test scripts.
+
+Building a client sets up OAuth client credentials, and the first request
+then pays for a token exchange against CDF_TOKEN_URL. Keeping one client per
+process lets every caller reuse the token the credentials object has cached.
+"""
+
+from functools import lru_cache
+
+from cognite.client import CogniteClient
+from cognite.client.config import ClientConfig
+from cognite.client.credentials import OAuthClientCredentials
+
+from config import settings
+
+
+@lru_cache(maxsize=1)
+def get_credentials() -> OAuthClientCredentials:
+    """OAuth client credentials shared by every caller in this process"""
+    config = settings()
+    return OAuthClientCredentials(
+        token_url=config.cdf_token_url,
+        client_id=config.cdf_client_id,
+        client_secret=config.cdf_client_secret,
+        scopes=["user_impersonation"]
+    )
+
+
+@lru_cache(maxsize=1)
+def get_client() -> CogniteClient:
+    """Process-wide CogniteClient built from the environment"""
+    config = settings()
+    return CogniteClient(
+        ClientConfig(
+            client_name="plex-test-scripts",
+            base_url=config.cdf_host,
+            project=config.cdf_project,
+            credentials=get_credentials()
+        )
+    )
+
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Connection settings for the Plex and CDF test scripts.
+
+The .env file is parsed and the environment read once per process; every
+script then takes its values from the same frozen Settings object.
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Plex and CDF connection values read from the environment"""
+    plex_api_key: Optional[str]
+    plex_customer_id: str
+    plex_ds_username: Optional[str]
+    plex_ds_password: Optional[str]
+    cdf_host: Optional[str]
+    cdf_project: Optional[str]
+    cdf_client_id: Optional[str]
+    cdf_client_secret: Optional[str]
+    cdf_token_url: Optional[str]
+    cdf_dataset_plexmaster: Optional[str]
+    cdf_dataset_plexquality: Optional[str]
+
+
+@lru_cache(maxsize=1)
+def settings() -> Settings:
+    """Load .env once and return the process-wide settings"""
+    load_dotenv()
+    env = os.environ
+    return Settings(
+        plex_api_key=env.get("PLEX_API_KEY"),
+        plex_customer_id=env.get("PLEX_CUSTOMER_ID", "340884"),
+        plex_ds_username=env.get("PLEX_DS_USERNAME"),
+        plex_ds_password=env.get("PLEX_DS_PASSWORD"),
+        cdf_host=env.get("CDF_HOST"),
+        cdf_project=env.get("CDF_PROJECT"),
+        cdf_client_id=env.get("CDF_CLIENT_ID"),
+        cdf_client_secret=env.get("CDF_CLIENT_SECRET"),
+        cdf_token_url=env.get("CDF_TOKEN_URL"),
+        cdf_dataset_plexmaster=env.get("CDF_DATASET_PLEXMASTER"),
+        cdf_dataset_plexquality=env.get("CDF_DATASET_PLEXQUALITY"),
+    )
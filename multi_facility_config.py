@@ -64,6 +64,12 @@ class MultiTenantNamingConvention:
         # Example: PCN340884_EVT_JOB_START_12345_1234567890
         return f"{self.pcn_prefix}_EVT_{event_type}_{entity}_{int(timestamp)}"
     
+    # RAW Row Keys
+    def raw_row_key(self, category: str, entity: str) -> str:
+        """Generate a stable RAW row key with PCN prefix, so reruns upsert the same row"""
+        # Example: PCN340884_specification_12345
+        return f"{self.pcn_prefix}_{category}_{entity}"
+    
     # Time Series External IDs
     def timeseries_id(self, entity_type: str, entity_id: str, metric: str) -> str:
         """Generate time series external ID with PCN prefix"""
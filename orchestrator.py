@@ -29,7 +29,7 @@ from jobs_extractor import PlexJobsExtractor, ExtractorConfig as JobsConfig
 from production_extractor import PlexProductionExtractor, ProductionExtractorConfig as ProductionConfig
 from master_data_extractor import MasterDataExtractor, MasterDataConfig
 from inventory_extractor import InventoryExtractor, InventoryConfig
-from quality_extractor import QualityExtractor, QualityConfig
+from quality_extractor import QualityExtractor, QualityConfig, close_shared_session
 
 # Load environment variables
 load_dotenv()
@@ -283,6 +283,9 @@ class ExtractorOrchestrator:
         # Run all tasks
         await asyncio.gather(*tasks, return_exceptions=True)
         
+        # Release the Plex Data Source session shared across quality runs
+        await close_shared_session()
+        
         logger.info("All extractors stopped")
     
     async def _status_reporter(self):
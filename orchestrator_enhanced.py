@@ -151,6 +151,7 @@ class EnhancedOrchestrator:
         # Control flags
         self.running = False
         self.shutdown_event = asyncio.Event()
+        self.completion_event = asyncio.Event()  # Set once a run_once pass finishes
         self.semaphore = asyncio.Semaphore(self.config.max_concurrent_extractors)
         
         # Initialize health tracking
@@ -468,6 +469,7 @@ class EnhancedOrchestrator:
             if self.config.run_once:
                 # Wait for all extractors to complete once
                 await asyncio.gather(*self.tasks.values())
+                self.completion_event.set()
             else:
                 # Run until shutdown
                 await self.shutdown_event.wait()
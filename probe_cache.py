@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+On-disk cache of Plex endpoint discovery results.
+
+The discovery scripts probe the same endpoints on every run, while the set
+available to a PCN rarely changes. Successful probes are remembered per
+customer for PROBE_CACHE_TTL seconds (default one hour) so repeat runs
+started with --use-cache can skip them. Cached results are reported as not
+re-verified, since a revoked key or broken endpoint would not show up.
+"""
+
+import json
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+DEFAULT_CACHE_PATH = ".plex_probe_cache.json"
+
+
+class DiscoveryCache:
+    """Time-based cache of probe status codes keyed by customer id and endpoint"""
+
+    def __init__(self, customer_id: str, path: str = DEFAULT_CACHE_PATH,
+                 ttl: Optional[int] = None, enabled: bool = True):
+        self.customer_id = customer_id
+        self.path = path
+        self.ttl = ttl if ttl is not None else int(os.getenv("PROBE_CACHE_TTL", "3600"))
+        self.enabled = enabled
+        self._entries: Dict[str, Dict[str, float]] = self._load() if enabled else {}
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _key(self, endpoint: str) -> str:
+        return f"{self.customer_id}:{endpoint}"
+
+    def get(self, endpoint: str) -> Optional[Tuple[int, float]]:
+        """Cached (status_code, timestamp) for an endpoint, if any"""
+        entry = self._entries.get(self._key(endpoint))
+        if entry is None:
+            return None
+        return int(entry["status_code"]), entry["ts"]
+
+    def is_fresh_ok(self, endpoint: str) -> bool:
+        """Whether the endpoint answered 200 within the TTL"""
+        if not self.enabled:
+            return False
+        cached = self.get(endpoint)
+        return cached is not None and cached[0] == 200 and time.time() - cached[1] < self.ttl
+
+    def put(self, endpoint: str, status_code: int):
+        """Remember a probe result; written to disk by save()"""
+        if not self.enabled:
+            return
+        self._entries[self._key(endpoint)] = {"status_code": status_code, "ts": time.time()}
+        self._dirty = True
+
+    def save(self):
+        """Write the cache file if anything changed"""
+        if not self._dirty:
+            return
+        with open(self.path, "w") as f:
+            json.dump(self._entries, f)
+        self._dirty = False
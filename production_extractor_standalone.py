@@ -24,14 +24,17 @@ from __future__ import annotations
 import os
 import sys
 import asyncio
+import importlib.util
 import json
+import re
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Tuple, Set, Union, TypeAlias, Final
-from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Any, Tuple, Set, Union, TypeAlias, Final, AsyncIterator
+from dataclasses import dataclass, field
 from enum import StrEnum, auto
-from collections import defaultdict, deque
+from collections import Counter, deque
 import logging
-import statistics
+from functools import lru_cache
+from operator import attrgetter
 
 # Third-party imports
 try:
@@ -54,6 +57,24 @@ except ImportError as e:
     print("Install with: pip install cognite-sdk httpx pydantic numpy python-dotenv")
     sys.exit(1)
 
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+try:
+    import msgspec  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+# HTTP/2 support needs the optional h2 package (pip install 'httpx[http2]')
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 # Type aliases
 WorkcenterId: TypeAlias = str
 JobId: TypeAlias = str
@@ -73,12 +94,61 @@ DOWNTIME_CATEGORIES = {
     "external": ["no_demand", "no_power", "strike", "weather"]
 }
 
+def _columns(records: List[Any], attrs: Tuple[str, ...]) -> Dict[str, np.ndarray]:
+    """Gather numeric attributes of a record list into float64 columns in a single pass"""
+    if not records:
+        return {attr: np.zeros(0) for attr in attrs}
+    getter = attrgetter(*attrs)
+    matrix = np.array([getter(record) for record in records], dtype=np.float64).reshape(len(records), len(attrs))
+    return dict(zip(attrs, matrix.T))
+
+# Downtime classification bit flags, precomputed per event for loss analysis
+DOWNTIME_UNPLANNED: Final = 1
+DOWNTIME_PLANNED: Final = 2
+DOWNTIME_EXTERNAL: Final = 4
+DOWNTIME_SETUP: Final = 8
+DOWNTIME_CHANGEOVER: Final = 16
+DOWNTIME_ADJUSTMENT: Final = 32
+DOWNTIME_SETUP_LOSSES: Final = DOWNTIME_SETUP | DOWNTIME_CHANGEOVER | DOWNTIME_ADJUSTMENT
+
+_DOWNTIME_CATEGORY_FLAGS: Final = {
+    "unplanned": DOWNTIME_UNPLANNED,
+    "planned": DOWNTIME_PLANNED,
+    "external": DOWNTIME_EXTERNAL
+}
+_DOWNTIME_REASON_FLAGS: Final = {
+    "setup": DOWNTIME_SETUP,
+    "changeover": DOWNTIME_CHANGEOVER,
+    "adjustment": DOWNTIME_ADJUSTMENT
+}
+
 LOSS_CATEGORIES = {
     "availability_losses": ["equipment_failure", "setup_adjustments", "material_shortage"],
     "performance_losses": ["minor_stops", "reduced_speed", "startup_losses"],
     "quality_losses": ["defects", "rework", "startup_rejects"]
 }
 
+# OEE time series published per workcenter: (metric, description, unit)
+OEE_METRICS: Final = (
+    ("oee", "Overall Equipment Effectiveness", "%"),
+    ("availability", "Availability", "%"),
+    ("performance", "Performance", "%"),
+    ("quality", "Quality", "%"),
+    ("production_rate", "Production Rate", "units/hour"),
+    ("cycle_time", "Cycle Time", "seconds"),
+    ("scrap_rate", "Scrap Rate", "%"),
+    ("downtime", "Downtime", "minutes")
+)
+
+def _epoch_ms(times: List[Optional[datetime]]) -> np.ndarray:
+    """Convert datetimes to CDF millisecond epochs in one pass (missing values become -1)"""
+    seconds = np.fromiter(
+        (t.timestamp() if t is not None else np.nan for t in times),
+        dtype=np.float64,
+        count=len(times)
+    )
+    return np.where(np.isnan(seconds), -1, seconds * 1000).astype(np.int64)
+
 # ============================================================================
 # DATA MODELS
 # ============================================================================
@@ -100,7 +170,7 @@ class ShiftType(StrEnum):
     WEEKEND = auto()
     OVERTIME = auto()
 
-@dataclass
+@dataclass(slots=True)
 class WorkcenterState:
     """Real-time workcenter state with OEE components"""
     workcenter_id: WorkcenterId
@@ -161,11 +231,13 @@ class WorkcenterState:
 
     def calculate_oee(self) -> float:
         """Calculate real-time OEE"""
-        if self.planned_production_time == 0:
+        # Fast path: nothing was planned (idle/offline shifts), every component is zero
+        if self.planned_production_time <= 0:
+            self.availability = self.performance = self.quality = self.oee = 0.0
             return 0.0
 
         # Availability = Run Time / Planned Production Time
-        self.availability = (self.actual_run_time / self.planned_production_time) * 100 if self.planned_production_time > 0 else 0
+        self.availability = (self.actual_run_time / self.planned_production_time) * 100
 
         # Performance = (Actual Output / (Run Time / Ideal Cycle Time)) * 100
         if self.actual_run_time > 0 and self.ideal_cycle_time > 0:
@@ -212,7 +284,7 @@ class WorkcenterState:
             "needs_attention": self.oee < 50 or self.availability < 70
         }
 
-@dataclass
+@dataclass(slots=True)
 class DowntimeEvent:
     """Downtime event tracking"""
     event_id: str
@@ -233,6 +305,10 @@ class DowntimeEvent:
     cost_impact: Optional[float] = None
     units_lost: Optional[int] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    flags: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.flags = _DOWNTIME_CATEGORY_FLAGS.get(self.category, 0) | _DOWNTIME_REASON_FLAGS.get(self.reason, 0)
 
     def calculate_duration(self) -> float:
         """Calculate duration in minutes"""
@@ -240,7 +316,7 @@ class DowntimeEvent:
             self.duration_minutes = (self.end_time - self.start_time).total_seconds() / 60
         return self.duration_minutes
 
-@dataclass
+@dataclass(slots=True)
 class ProductionEntry:
     """Production entry with quality and performance data"""
     entry_id: str
@@ -346,6 +422,7 @@ class ProductionExtractorConfig(BaseSettings):
     # Time Windows
     lookback_hours: int = Field(default=24, env='LOOKBACK_HOURS')
     real_time_window_minutes: int = Field(default=5, env='REALTIME_WINDOW')
+    production_window_minutes: int = Field(default=60, ge=1, env='PRODUCTION_WINDOW')  # entries fetched per request
 
     # OEE Configuration
     oee_calculation_interval: int = Field(default=15, env='OEE_INTERVAL')  # minutes
@@ -361,6 +438,7 @@ class ProductionExtractorConfig(BaseSettings):
     # Monitoring
     enable_metrics: bool = Field(default=True, env='ENABLE_METRICS')
     metrics_port: int = Field(default=8081, env='METRICS_PORT')
+    metrics_log_every: int = Field(default=10, env='METRICS_LOG_EVERY')  # cycles between metrics log lines
     log_level: str = Field(default='INFO', env='LOG_LEVEL')
 
     class Config:
@@ -378,9 +456,13 @@ class OEECalculator:
         self.config = config
         self.history_window = deque(maxlen=100)  # Keep last 100 calculations
 
-    def calculate_oee(self, state: WorkcenterState) -> Dict[str, float]:
-        """Calculate OEE with detailed loss analysis"""
-        state.calculate_oee()
+    def calculate_oee(self, state: WorkcenterState, refresh: bool = True) -> Dict[str, float]:
+        """Calculate OEE with detailed loss analysis
+
+        Pass refresh=False when the state's OEE components are already current.
+        """
+        if refresh:
+            state.calculate_oee()
 
         # Calculate losses
         availability_loss = 100 - state.availability
@@ -425,14 +507,14 @@ class OEECalculator:
         breakdown_loss = sum(
             event.duration_minutes
             for event in state.downtime_events
-            if event.category == "unplanned"
+            if event.flags & DOWNTIME_UNPLANNED
         ) / total_time * 100
 
         # 2. Setup and adjustment losses
         setup_loss = sum(
             event.duration_minutes
             for event in state.downtime_events
-            if event.reason in ["setup", "changeover", "adjustment"]
+            if event.flags & DOWNTIME_SETUP_LOSSES
         ) / total_time * 100
 
         # 3. Small stops and idling
@@ -472,16 +554,16 @@ class OEECalculator:
         if not data:
             return {}
 
-        oee_values = [d["oee"] for d in data]
+        oee_values = np.fromiter((d["oee"] for d in data), dtype=np.float64, count=len(data))
 
         return {
-            "current_oee": oee_values[-1] if oee_values else 0,
-            "average_oee": round(statistics.mean(oee_values), 2),
-            "min_oee": round(min(oee_values), 2),
-            "max_oee": round(max(oee_values), 2),
-            "std_dev": round(statistics.stdev(oee_values), 2) if len(oee_values) > 1 else 0,
-            "trend": "improving" if len(oee_values) > 1 and oee_values[-1] > oee_values[0] else "declining",
-            "data_points": len(oee_values)
+            "current_oee": float(oee_values[-1]),
+            "average_oee": round(float(oee_values.mean()), 2),
+            "min_oee": round(float(oee_values.min()), 2),
+            "max_oee": round(float(oee_values.max()), 2),
+            "std_dev": round(float(oee_values.std(ddof=1)), 2) if oee_values.size > 1 else 0,
+            "trend": "improving" if oee_values.size > 1 and oee_values[-1] > oee_values[0] else "declining",
+            "data_points": int(oee_values.size)
         }
 
 # ============================================================================
@@ -495,7 +577,7 @@ class ProductionCogniteManager:
         self.config = config
         self.client = self._init_client()
         self.dataset_id = self._ensure_dataset()
-        self.time_series_cache = {}
+        self._known_ts: Set[str] = self._fetch_known_time_series()
 
     def _init_client(self) -> CogniteClient:
         """Initialize Cognite client"""
@@ -523,10 +605,9 @@ class ProductionCogniteManager:
 
         dataset_name = f"plex_production_{self.config.plex_customer_id}"
 
-        existing = self.client.data_sets.list(limit=None)
-        for ds in existing:
-            if ds.external_id == dataset_name:
-                return ds.id
+        existing = self.client.data_sets.retrieve(external_id=dataset_name)
+        if existing is not None:
+            return existing.id
 
         dataset = self.client.data_sets.create(
             DataSet(
@@ -543,6 +624,19 @@ class ProductionCogniteManager:
         )
         return dataset.id
 
+    def _fetch_known_time_series(self) -> Set[str]:
+        """Prefetch external IDs of OEE time series that already exist"""
+        try:
+            existing = self.client.time_series.list(
+                data_set_ids=[self.dataset_id],
+                external_id_prefix=f"oee_{self.config.plex_customer_id}_",
+                limit=None
+            )
+            return {ts.external_id for ts in existing}
+        except CogniteAPIError as e:
+            logging.warning(f"Could not prefetch existing time series: {e}")
+            return set()
+
     async def upsert_workcenter_assets(self, states: List[WorkcenterState]) -> Tuple[int, int]:
         """Create/update workcenter assets with current state"""
         if not states:
@@ -550,8 +644,10 @@ class ProductionCogniteManager:
 
         assets = []
         for state in states:
-            metadata = state.get_analytics_metadata()
-            metadata["last_updated"] = datetime.now(timezone.utc).isoformat()
+            metadata = {
+                **state.get_analytics_metadata(),
+                "last_updated": datetime.now(timezone.utc).isoformat()
+            }
 
             asset = Asset(
                 external_id=f"workcenter_{self.config.plex_customer_id}_{state.workcenter_id}",
@@ -576,28 +672,18 @@ class ProductionCogniteManager:
 
     async def create_oee_time_series(self, states: List[WorkcenterState]) -> Tuple[int, int]:
         """Create time series for OEE metrics"""
-        time_series = []
-        datapoints_to_insert = []
+        if not states:
+            return 0, 0
 
+        time_series = []
         for state in states:
             base_id = f"oee_{self.config.plex_customer_id}_{state.workcenter_id}"
 
             # Create time series for each OEE component
-            metrics = [
-                ("oee", "Overall Equipment Effectiveness", "%"),
-                ("availability", "Availability", "%"),
-                ("performance", "Performance", "%"),
-                ("quality", "Quality", "%"),
-                ("production_rate", "Production Rate", "units/hour"),
-                ("cycle_time", "Cycle Time", "seconds"),
-                ("scrap_rate", "Scrap Rate", "%"),
-                ("downtime", "Downtime", "minutes")
-            ]
-
-            for metric_name, description, unit in metrics:
+            for metric_name, description, unit in OEE_METRICS:
                 ts_id = f"{base_id}_{metric_name}"
 
-                if ts_id not in self.time_series_cache:
+                if ts_id not in self._known_ts:
                     ts = TimeSeries(
                         external_id=ts_id,
                         name=f"{state.workcenter_name} - {description}",
@@ -612,24 +698,57 @@ class ProductionCogniteManager:
                         data_set_id=self.dataset_id
                     )
                     time_series.append(ts)
-                    self.time_series_cache[ts_id] = True
 
-                # Prepare datapoint
-                value = getattr(state, metric_name, 0)
-                if metric_name == "scrap_rate":
-                    value = (state.scrap_quantity / state.actual_quantity * 100) if state.actual_quantity > 0 else 0
-
-                datapoints_to_insert.append({
-                    "external_id": ts_id,
-                    "datapoints": [(datetime.now(timezone.utc), value)]
-                })
+        # Gather all metric values into one (workcenters x metrics) matrix
+        table = _columns(states, (
+            "oee", "availability", "performance", "quality", "production_rate",
+            "actual_cycle_time", "downtime", "scrap_quantity", "actual_quantity"
+        ))
+        actual_quantity = table["actual_quantity"]
+        scrap_rate = np.divide(
+            table["scrap_quantity"] * 100, actual_quantity,
+            out=np.zeros(len(states)), where=actual_quantity > 0
+        )
+        values = np.column_stack([
+            table["oee"],
+            table["availability"],
+            table["performance"],
+            table["quality"],
+            table["production_rate"],
+            table["actual_cycle_time"],
+            scrap_rate,
+            table["downtime"]
+        ]).ravel().tolist()
+
+        ts_ids = [
+            f"oee_{self.config.plex_customer_id}_{state.workcenter_id}_{metric_name}"
+            for state in states
+            for metric_name, _, _ in OEE_METRICS
+        ]
+        now = datetime.now(timezone.utc)
+        datapoints_to_insert = [
+            {"external_id": ts_id, "datapoints": [(now, value)]}
+            for ts_id, value in zip(ts_ids, values)
+        ]
 
         # Create time series if needed
         if time_series:
             try:
-                self.client.time_series.create(time_series)
-            except:
-                pass  # Already exists
+                # Another process may have created some of them since startup
+                existing = {
+                    ts.external_id
+                    for ts in self.client.time_series.retrieve_multiple(
+                        external_ids=[ts.external_id for ts in time_series],
+                        ignore_unknown_ids=True
+                    )
+                }
+                self._known_ts.update(existing)
+                to_create = [ts for ts in time_series if ts.external_id not in existing]
+                if to_create:
+                    self.client.time_series.create(to_create)
+                    self._known_ts.update(ts.external_id for ts in to_create)
+            except CogniteAPIError as e:
+                logging.error(f"Failed to create OEE time series: {e}")
 
         # Insert datapoints
         if datapoints_to_insert:
@@ -651,15 +770,20 @@ class ProductionCogniteManager:
         if not entries:
             return 0, 0
 
+        # Precompute start/end epochs for the whole batch
+        start_ms = _epoch_ms([entry.timestamp for entry in entries])
+        run_ms = (_columns(entries, ("run_time",))["run_time"] * 60_000).astype(np.int64)
+        end_ms = start_ms + run_ms
+
         events = []
-        for entry in entries:
+        for entry, start, end in zip(entries, start_ms.tolist(), end_ms.tolist()):
             event = Event(
                 external_id=f"production_{self.config.plex_customer_id}_{entry.entry_id}",
                 type="production_entry",
                 subtype=f"shift_{entry.shift.value}" if entry.shift else "production",
                 description=f"Production: {entry.quantity_produced} units of part {entry.part_id}",
-                start_time=int(entry.timestamp.timestamp() * 1000),
-                end_time=int((entry.timestamp + timedelta(minutes=entry.run_time)).timestamp() * 1000),
+                start_time=start,
+                end_time=end,
                 metadata={
                     "workcenter_id": entry.workcenter_id,
                     "job_id": entry.job_id,
@@ -689,17 +813,22 @@ class ProductionCogniteManager:
         if not downtimes:
             return 0, 0
 
-        events = []
         for dt in downtimes:
             dt.calculate_duration()
 
+        # Precompute start/end epochs for the whole batch
+        start_ms = _epoch_ms([dt.start_time for dt in downtimes]).tolist()
+        end_ms = _epoch_ms([dt.end_time for dt in downtimes]).tolist()
+
+        events = []
+        for dt, start, end in zip(downtimes, start_ms, end_ms):
             event = Event(
                 external_id=f"downtime_{self.config.plex_customer_id}_{dt.event_id}",
                 type="downtime",
                 subtype=dt.category,
                 description=f"Downtime: {dt.reason} - {dt.duration_minutes:.1f} minutes",
-                start_time=int(dt.start_time.timestamp() * 1000),
-                end_time=int(dt.end_time.timestamp() * 1000) if dt.end_time else None,
+                start_time=start,
+                end_time=end if end >= 0 else None,
                 metadata={
                     "workcenter_id": dt.workcenter_id,
                     "category": dt.category,
@@ -730,106 +859,249 @@ class ProductionCogniteManager:
 # PLEX CONNECTOR
 # ============================================================================
 
-class ProductionPlexConnector:
-    """Connects to Plex API for production data"""
+def _decode_json(content: bytes) -> Any:
+    """Decode a Plex response body, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+if msgspec is not None:
+    class _PlexRows(msgspec.Struct):
+        """Plex list envelope; other top-level keys are skipped without materializing"""
+        data: List[Dict[str, Any]] = []
+
+    _PLEX_ROWS_DECODER = msgspec.json.Decoder(_PlexRows)
+
+def _decode_rows(content: bytes) -> List[Dict[str, Any]]:
+    """Decode and validate the 'data' rows of a Plex list response in one step"""
+    if msgspec is not None:
+        return _PLEX_ROWS_DECODER.decode(content).data
+    rows = _decode_json(content).get('data', [])
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError("Plex response 'data' is not a list of objects")
+    return rows
+
+# Errors raised while requesting or decoding a Plex response
+_FETCH_ERRORS: Final = tuple(
+    error for error in (
+        httpx.HTTPError,
+        ValueError,
+        msgspec.DecodeError if msgspec is not None else None,
+        ijson.JSONError if ijson is not None else None
+    )
+    if error is not None
+)
+
+_ISO_DATETIME_RE: Final = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?(Z|[+-]\d{2}:\d{2})?'
+)
+
+@lru_cache(maxsize=8192)
+def _parse_plex_datetime(date_str: str) -> Optional[datetime]:
+    """Parse an ISO-8601 Plex timestamp; repeated values (shift boundaries) hit the cache"""
+    match = _ISO_DATETIME_RE.fullmatch(date_str)
+    if match is None:
+        try:
+            return datetime.fromisoformat(date_str[:-1] + '+00:00' if date_str.endswith('Z') else date_str)
+        except ValueError:
+            return None
 
-    def __init__(self, config: ProductionExtractorConfig):
-        self.config = config
-        self.session = None
-        self._setup_session()
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    if offset is None:
+        tz = None
+    elif offset == 'Z':
+        tz = timezone.utc
+    else:
+        sign = -1 if offset[0] == '-' else 1
+        tz = timezone(sign * timedelta(hours=int(offset[1:3]), minutes=int(offset[4:6])))
+
+    try:
+        return datetime(
+            int(year), int(month), int(day), int(hour), int(minute), int(second),
+            int(fraction.ljust(6, '0')) if fraction else 0,
+            tzinfo=tz
+        )
+    except ValueError:
+        return None
+
+def _opt_str(value: Any) -> Optional[str]:
+    """Stringify an optional Plex key, mapping empty values to None"""
+    return str(value) if value else None
+
+# Plex code lookups used while parsing response rows
+_STATUS_MAP: Final = {
+    'RUNNING': ProductionStatus.RUNNING,
+    'IDLE': ProductionStatus.IDLE,
+    'DOWN': ProductionStatus.DOWN,
+    'MAINTENANCE': ProductionStatus.MAINTENANCE,
+    'CHANGEOVER': ProductionStatus.CHANGEOVER,
+    'OFFLINE': ProductionStatus.OFFLINE
+}
+_SHIFT_MAP: Final = {
+    '1': ShiftType.FIRST,
+    '2': ShiftType.SECOND,
+    '3': ShiftType.THIRD,
+    'W': ShiftType.WEEKEND,
+    'O': ShiftType.OVERTIME
+}
+_DOWNTIME_PLANNED: Final = frozenset({"planned", "scheduled"})
+_DOWNTIME_EXTERNAL: Final = frozenset({"external", "outside"})
+
+class _AsyncByteReader:
+    """Minimal async file-like adapter over an httpx byte stream for ijson"""
 
-    def _setup_session(self):
-        """Setup HTTP session"""
-        self.session = httpx.AsyncClient(
-            base_url=self.config.plex_base_url,
+    def __init__(self, chunks):
+        self._chunks = chunks.__aiter__()
+        self._buffer = b""
+
+    async def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += await self._chunks.__anext__()
+            except StopAsyncIteration:
+                break
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+# Shared Plex HTTP clients keyed by (base_url, api_key, customer_id) so
+# connectors created across cycles reuse the same keep-alive pool
+_PLEX_CLIENTS: Dict[Tuple[str, str, str], httpx.AsyncClient] = {}
+
+def _get_plex_client(config: ProductionExtractorConfig) -> httpx.AsyncClient:
+    """Return the shared HTTP client for a Plex tenant, creating it on first use"""
+    key = (config.plex_base_url, config.plex_api_key, config.plex_customer_id)
+    client = _PLEX_CLIENTS.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=config.plex_base_url,
             headers={
-                'X-Plex-Connect-Api-Key': self.config.plex_api_key,
-                'X-Plex-Connect-Customer-Id': self.config.plex_customer_id,
-                'Content-Type': 'application/json'
+                'X-Plex-Connect-Api-Key': config.plex_api_key,
+                'X-Plex-Connect-Customer-Id': config.plex_customer_id,
+                'Content-Type': 'application/json',
+                'Accept': 'application/json'
             },
+            http2=HTTP2_AVAILABLE,
             timeout=30.0,
-            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50)
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=120)
         )
+        _PLEX_CLIENTS[key] = client
+    return client
+
+async def close_plex_clients():
+    """Close all shared Plex HTTP clients"""
+    clients = list(_PLEX_CLIENTS.values())
+    _PLEX_CLIENTS.clear()
+    for client in clients:
+        if not client.is_closed:
+            await client.aclose()
+
+class ProductionPlexConnector:
+    """Connects to Plex API for production data"""
+
+    def __init__(self, config: ProductionExtractorConfig):
+        self.config = config
+
+    @property
+    def session(self) -> httpx.AsyncClient:
+        """Shared HTTP session for this connector's Plex tenant"""
+        return _get_plex_client(self.config)
 
     async def fetch_workcenter_status(self) -> List[WorkcenterState]:
         """Fetch current workcenter status"""
         try:
             response = await self.session.get("/api/v1/workcenters/status")
             response.raise_for_status()
-
-            data = response.json()
-            states = []
-
-            for item in data.get('data', []):
-                state = WorkcenterState(
-                    workcenter_id=str(item.get('Workcenter_Key')),
-                    workcenter_name=item.get('Workcenter_Name', ''),
-                    workcenter_type=item.get('Workcenter_Type'),
-                    status=self._map_status(item.get('Status')),
-                    status_reason=item.get('Status_Reason'),
-                    current_job_id=str(item.get('Current_Job_Key')) if item.get('Current_Job_Key') else None,
-                    current_part_id=str(item.get('Part_Key')) if item.get('Part_Key') else None,
-                    current_operator_id=str(item.get('Operator_Key')) if item.get('Operator_Key') else None,
-                    planned_production_time=item.get('Planned_Production_Time', 0),
-                    actual_run_time=item.get('Actual_Run_Time', 0),
-                    downtime=item.get('Downtime', 0),
-                    planned_quantity=item.get('Planned_Quantity', 0),
-                    actual_quantity=item.get('Actual_Quantity', 0),
-                    good_quantity=item.get('Good_Quantity', 0),
-                    scrap_quantity=item.get('Scrap_Quantity', 0),
-                    ideal_cycle_time=item.get('Ideal_Cycle_Time', 0),
-                    actual_cycle_time=item.get('Actual_Cycle_Time', 0)
-                )
-
-                # Calculate OEE
-                state.calculate_oee()
-                states.append(state)
-
-            return states
-
-        except Exception as e:
+            rows = _decode_rows(response.content)
+        except _FETCH_ERRORS as e:
             logging.error(f"Error fetching workcenter status: {e}")
             return []
 
-    async def fetch_production_entries(self, start_time: datetime, end_time: datetime) -> List[ProductionEntry]:
-        """Fetch production entries for time range"""
+        states = []
+        for item in rows:
+            get = item.get
+            state = WorkcenterState(
+                workcenter_id=str(get('Workcenter_Key')),
+                workcenter_name=get('Workcenter_Name', ''),
+                workcenter_type=get('Workcenter_Type'),
+                status=self._map_status(get('Status')),
+                status_reason=get('Status_Reason'),
+                current_job_id=_opt_str(get('Current_Job_Key')),
+                current_part_id=_opt_str(get('Part_Key')),
+                current_operator_id=_opt_str(get('Operator_Key')),
+                planned_production_time=get('Planned_Production_Time', 0),
+                actual_run_time=get('Actual_Run_Time', 0),
+                downtime=get('Downtime', 0),
+                planned_quantity=get('Planned_Quantity', 0),
+                actual_quantity=get('Actual_Quantity', 0),
+                good_quantity=get('Good_Quantity', 0),
+                scrap_quantity=get('Scrap_Quantity', 0),
+                ideal_cycle_time=get('Ideal_Cycle_Time', 0),
+                actual_cycle_time=get('Actual_Cycle_Time', 0)
+            )
+            states.append(state)
+
+        return states
+
+    async def fetch_production_entries(self, start_time: datetime, end_time: datetime) -> AsyncIterator[List[ProductionEntry]]:
+        """Fetch production entries for time range, yielding one batch per time window"""
+        window = timedelta(minutes=self.config.production_window_minutes)
+        window_start = start_time
+        while window_start < end_time:
+            window_end = min(window_start + window, end_time)
+            entries = await self._fetch_production_window(window_start, window_end)
+            if entries:
+                yield entries
+            window_start = window_end
+
+    async def _fetch_production_window(self, start_time: datetime, end_time: datetime) -> List[ProductionEntry]:
+        """Fetch production entries for one window, stream-decoding the body when ijson is available"""
         try:
-            response = await self.session.get(
+            async with self.session.stream(
+                "GET",
                 "/api/v1/production/entries",
                 params={
                     "start_date": start_time.isoformat(),
                     "end_date": end_time.isoformat()
                 }
-            )
-            response.raise_for_status()
+            ) as response:
+                response.raise_for_status()
 
-            data = response.json()
-            entries = []
-
-            for item in data.get('data', []):
-                entry = ProductionEntry(
-                    entry_id=str(item.get('Production_Key')),
-                    workcenter_id=str(item.get('Workcenter_Key')),
-                    job_id=str(item.get('Job_Key')),
-                    part_id=str(item.get('Part_Key')),
-                    timestamp=self._parse_datetime(item.get('Production_Date')),
-                    quantity_produced=item.get('Quantity_Produced', 0),
-                    quantity_good=item.get('Good_Quantity', 0),
-                    quantity_scrap=item.get('Scrap_Quantity', 0),
-                    quantity_rework=item.get('Rework_Quantity', 0),
-                    cycle_time=item.get('Cycle_Time', 0),
-                    run_time=item.get('Run_Time', 0),
-                    operator_id=str(item.get('Operator_Key')) if item.get('Operator_Key') else None,
-                    shift=self._map_shift(item.get('Shift'))
-                )
-                entries.append(entry)
-
-            return entries
+                if ijson is not None:
+                    reader = _AsyncByteReader(response.aiter_bytes())
+                    return [
+                        self._build_production_entry(item)
+                        async for item in ijson.items_async(reader, 'data.item', use_float=True)
+                    ]
 
-        except Exception as e:
+                rows = _decode_rows(await response.aread())
+
+        except _FETCH_ERRORS as e:
             logging.error(f"Error fetching production entries: {e}")
             return []
 
+        return [self._build_production_entry(item) for item in rows]
+
+    def _build_production_entry(self, item: Dict[str, Any]) -> ProductionEntry:
+        """Build a ProductionEntry from a Plex production row"""
+        get = item.get
+        return ProductionEntry(
+            entry_id=str(get('Production_Key')),
+            workcenter_id=str(get('Workcenter_Key')),
+            job_id=str(get('Job_Key')),
+            part_id=str(get('Part_Key')),
+            timestamp=self._parse_datetime(get('Production_Date')),
+            quantity_produced=get('Quantity_Produced', 0),
+            quantity_good=get('Good_Quantity', 0),
+            quantity_scrap=get('Scrap_Quantity', 0),
+            quantity_rework=get('Rework_Quantity', 0),
+            cycle_time=get('Cycle_Time', 0),
+            run_time=get('Run_Time', 0),
+            operator_id=_opt_str(get('Operator_Key')),
+            shift=self._map_shift(get('Shift'))
+        )
+
     async def fetch_downtime_events(self, start_time: datetime, end_time: datetime) -> List[DowntimeEvent]:
         """Fetch downtime events"""
         try:
@@ -841,62 +1113,44 @@ class ProductionPlexConnector:
                 }
             )
             response.raise_for_status()
-
-            data = response.json()
-            events = []
-
-            for item in data.get('data', []):
-                event = DowntimeEvent(
-                    event_id=str(item.get('Downtime_Key')),
-                    workcenter_id=str(item.get('Workcenter_Key')),
-                    start_time=self._parse_datetime(item.get('Start_Time')),
-                    end_time=self._parse_datetime(item.get('End_Time')),
-                    category=self._map_downtime_category(item.get('Category')),
-                    reason=item.get('Reason', ''),
-                    reason_code=item.get('Reason_Code'),
-                    impact=item.get('Impact', 'medium'),
-                    job_id=str(item.get('Job_Key')) if item.get('Job_Key') else None,
-                    operator_id=str(item.get('Operator_Key')) if item.get('Operator_Key') else None,
-                    resolved=item.get('Resolved', False),
-                    resolution=item.get('Resolution')
-                )
-                event.calculate_duration()
-                events.append(event)
-
-            return events
-
-        except Exception as e:
+            rows = _decode_rows(response.content)
+        except _FETCH_ERRORS as e:
             logging.error(f"Error fetching downtime events: {e}")
             return []
 
+        events = []
+        for item in rows:
+            get = item.get
+            event = DowntimeEvent(
+                event_id=str(get('Downtime_Key')),
+                workcenter_id=str(get('Workcenter_Key')),
+                start_time=self._parse_datetime(get('Start_Time')),
+                end_time=self._parse_datetime(get('End_Time')),
+                category=self._map_downtime_category(get('Category')),
+                reason=get('Reason', ''),
+                reason_code=get('Reason_Code'),
+                impact=get('Impact', 'medium'),
+                job_id=_opt_str(get('Job_Key')),
+                operator_id=_opt_str(get('Operator_Key')),
+                resolved=get('Resolved', False),
+                resolution=get('Resolution')
+            )
+            event.calculate_duration()
+            events.append(event)
+
+        return events
+
     def _map_status(self, plex_status: Optional[str]) -> ProductionStatus:
         """Map Plex status to ProductionStatus"""
         if not plex_status:
             return ProductionStatus.IDLE
-
-        mapping = {
-            'RUNNING': ProductionStatus.RUNNING,
-            'IDLE': ProductionStatus.IDLE,
-            'DOWN': ProductionStatus.DOWN,
-            'MAINTENANCE': ProductionStatus.MAINTENANCE,
-            'CHANGEOVER': ProductionStatus.CHANGEOVER,
-            'OFFLINE': ProductionStatus.OFFLINE
-        }
-        return mapping.get(plex_status.upper(), ProductionStatus.IDLE)
+        return _STATUS_MAP.get(plex_status.upper(), ProductionStatus.IDLE)
 
     def _map_shift(self, shift_code: Optional[str]) -> Optional[ShiftType]:
         """Map shift codes to ShiftType"""
         if not shift_code:
             return None
-
-        mapping = {
-            '1': ShiftType.FIRST,
-            '2': ShiftType.SECOND,
-            '3': ShiftType.THIRD,
-            'W': ShiftType.WEEKEND,
-            'O': ShiftType.OVERTIME
-        }
-        return mapping.get(shift_code, None)
+        return _SHIFT_MAP.get(shift_code)
 
     def _map_downtime_category(self, category: Optional[str]) -> str:
         """Map downtime category"""
@@ -904,9 +1158,9 @@ class ProductionPlexConnector:
             return "unplanned"
 
         category_lower = category.lower()
-        if category_lower in ["planned", "scheduled"]:
+        if category_lower in _DOWNTIME_PLANNED:
             return "planned"
-        elif category_lower in ["external", "outside"]:
+        elif category_lower in _DOWNTIME_EXTERNAL:
             return "external"
         else:
             return "unplanned"
@@ -915,16 +1169,11 @@ class ProductionPlexConnector:
         """Parse datetime from Plex format"""
         if not date_str:
             return None
-
-        try:
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        except:
-            return None
+        return _parse_plex_datetime(date_str)
 
     async def close(self):
-        """Close HTTP session"""
-        if self.session:
-            await self.session.aclose()
+        """Close HTTP sessions"""
+        await close_plex_clients()
 
 # ============================================================================
 # MAIN EXTRACTOR
@@ -947,14 +1196,59 @@ class ProductionExtractor:
         self.logger = logging.getLogger(__name__)
 
         # Metrics
-        self.metrics = {
-            "extractions": 0,
-            "workcenter_updates": 0,
-            "production_entries": 0,
-            "downtime_events": 0,
-            "oee_calculations": 0,
-            "errors": 0
-        }
+        self.metrics = Counter(
+            extractions=0,
+            workcenter_updates=0,
+            production_entries=0,
+            downtime_events=0,
+            oee_calculations=0,
+            errors=0
+        )
+        self._cycle = 0
+
+        # Collectors enabled by configuration, resolved once
+        self._collectors = tuple(
+            collector for enabled, collector in (
+                (config.collect_workcenter_status or config.collect_oee_metrics, self.extract_workcenter_status),
+                (config.collect_production_entries, self.extract_production_entries),
+                (config.collect_downtime, self.extract_downtime_events)
+            )
+            if enabled
+        )
+
+    def _vector_oee(self, states: List[WorkcenterState]) -> None:
+        """Calculate availability, performance, quality and OEE for all workcenters at once"""
+        table = _columns(states, (
+            "planned_production_time", "actual_run_time", "ideal_cycle_time", "actual_quantity", "good_quantity"
+        ))
+        planned = table["planned_production_time"]
+        run = table["actual_run_time"]
+        ideal = table["ideal_cycle_time"]
+        actual_qty = table["actual_quantity"]
+        good_qty = table["good_quantity"]
+
+        # Zero-denominator masks, computed once and shared by every division below
+        planned_pos = planned > 0
+        run_pos = planned_pos & (run > 0) & (ideal > 0)
+        qty_pos = planned_pos & (actual_qty > 0)
+
+        # Availability = Run Time / Planned Production Time
+        availability = np.divide(run * 100, planned, out=np.zeros(len(states)), where=planned_pos)
+
+        # Performance = Actual Output / (Run Time / Ideal Cycle Time), with run time in seconds
+        performance = np.divide(actual_qty * ideal * 100, run * 60, out=np.zeros(len(states)), where=run_pos)
+
+        # Quality = Good Count / Total Count
+        quality = np.divide(good_qty * 100, actual_qty, out=np.zeros(len(states)), where=qty_pos)
+
+        # OEE = Availability × Performance × Quality
+        oee = availability * performance * quality / 10000
+
+        for state, a, p, q, o in zip(states, availability.tolist(), performance.tolist(), quality.tolist(), oee.tolist()):
+            state.availability = a
+            state.performance = p
+            state.quality = q
+            state.oee = o
 
     async def extract_workcenter_status(self) -> Tuple[int, int]:
         """Extract and update workcenter status with OEE"""
@@ -964,20 +1258,20 @@ class ProductionExtractor:
         if not states:
             return 0, 0
 
-        # Calculate OEE for each workcenter
+        # Calculate OEE components for all workcenters in one pass, then loss analysis per workcenter
+        self._vector_oee(states)
         for state in states:
-            oee_metrics = self.oee_calculator.calculate_oee(state)
+            oee_metrics = self.oee_calculator.calculate_oee(state, refresh=False)
             state.metadata.update(oee_metrics)
-            self.metrics["oee_calculations"] += 1
 
         # Update assets
         created, failed = await self.cognite.upsert_workcenter_assets(states)
-        self.metrics["workcenter_updates"] += created
+        self.metrics.update(workcenter_updates=created, oee_calculations=len(states))
 
         # Create time series data
         ts_created, ts_failed = await self.cognite.create_oee_time_series(states)
 
-        self.logger.info(f"Updated {created} workcenters, created {ts_created} datapoints")
+        self.logger.info("Updated %d workcenters, created %d datapoints", created, ts_created)
         return created + ts_created, failed + ts_failed
 
     async def extract_production_entries(self) -> Tuple[int, int]:
@@ -987,14 +1281,14 @@ class ProductionExtractor:
         end_time = datetime.now(timezone.utc)
         start_time = end_time - timedelta(hours=self.config.lookback_hours)
 
-        entries = await self.plex.fetch_production_entries(start_time, end_time)
-        if not entries:
-            return 0, 0
-
-        created, failed = await self.cognite.create_production_events(entries)
-        self.metrics["production_entries"] += created
+        created = failed = 0
+        async for entries in self.plex.fetch_production_entries(start_time, end_time):
+            batch_created, batch_failed = await self.cognite.create_production_events(entries)
+            created += batch_created
+            failed += batch_failed
+            self.metrics["production_entries"] += batch_created
 
-        self.logger.info(f"Created {created} production events")
+        self.logger.info("Created %d production events", created)
         return created, failed
 
     async def extract_downtime_events(self) -> Tuple[int, int]:
@@ -1011,31 +1305,26 @@ class ProductionExtractor:
         created, failed = await self.cognite.create_downtime_events(events)
         self.metrics["downtime_events"] += created
 
-        self.logger.info(f"Created {created} downtime events")
+        self.logger.info("Created %d downtime events", created)
         return created, failed
 
     async def run_extraction(self):
         """Run complete extraction cycle"""
         start_time = datetime.now(timezone.utc)
-        self.logger.info(f"Starting production extraction at {start_time}")
+        self.logger.info("Starting production extraction at %s", start_time)
 
         try:
             total_created = 0
             total_failed = 0
 
-            # Extract based on configuration
-            if self.config.collect_workcenter_status or self.config.collect_oee_metrics:
-                created, failed = await self.extract_workcenter_status()
-                total_created += created
-                total_failed += failed
-
-            if self.config.collect_production_entries:
-                created, failed = await self.extract_production_entries()
-                total_created += created
-                total_failed += failed
-
-            if self.config.collect_downtime:
-                created, failed = await self.extract_downtime_events()
+            # Collectors hit independent endpoints so run them concurrently
+            results = await asyncio.gather(*(collector() for collector in self._collectors), return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    self.logger.error("Collector failed: %s", result, exc_info=result)
+                    self.metrics["errors"] += 1
+                    continue
+                created, failed = result
                 total_created += created
                 total_failed += failed
 
@@ -1043,15 +1332,17 @@ class ProductionExtractor:
 
             duration = (datetime.now(timezone.utc) - start_time).total_seconds()
             self.logger.info(
-                f"Extraction completed in {duration:.2f}s - "
-                f"Created: {total_created}, Failed: {total_failed}"
+                "Extraction completed in %.2fs - Created: %d, Failed: %d",
+                duration, total_created, total_failed
             )
 
-            # Log metrics
-            self.logger.info(f"Metrics: {self.metrics}")
+            # Log metrics every Nth cycle (always for one-time runs)
+            self._cycle += 1
+            if self.config.extraction_mode == 'one-time' or self._cycle % max(self.config.metrics_log_every, 1) == 0:
+                self.logger.info("Metrics: %s", self.metrics)
 
         except Exception as e:
-            self.logger.error(f"Extraction failed: {e}", exc_info=True)
+            self.logger.error("Extraction failed: %s", e, exc_info=True)
             self.metrics["errors"] += 1
             raise
 
@@ -1066,7 +1357,7 @@ class ProductionExtractor:
                 # Continuous mode
                 while True:
                     await self.run_extraction()
-                    self.logger.info(f"Sleeping for {self.config.extraction_interval_seconds} seconds...")
+                    self.logger.info("Sleeping for %d seconds...", self.config.extraction_interval_seconds)
                     await asyncio.sleep(self.config.extraction_interval_seconds)
 
         except KeyboardInterrupt:
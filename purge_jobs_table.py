@@ -22,9 +22,17 @@ client = CogniteClient(
     )
 )
 
-rows = client.raw.rows.list("plex_raw", "jobs", limit=-1)
-if rows:
-    client.raw.rows.delete("plex_raw", "jobs", [row.key for row in rows])
-    print(f"Deleted {len(rows)} rows from plex_raw.jobs")
+DELETE_BATCH_SIZE = 1000
+
+# Stream row keys only (no columns) and delete in bounded batches
+deleted = 0
+for chunk in client.raw.rows("plex_raw", "jobs", chunk_size=DELETE_BATCH_SIZE, columns=[]):
+    keys = [row.key for row in chunk]
+    if keys:
+        client.raw.rows.delete("plex_raw", "jobs", keys)
+        deleted += len(keys)
+
+if deleted:
+    print(f"Deleted {deleted} rows from plex_raw.jobs")
 else:
-    print("No rows to delete.")
\ No newline at end of file
+    print("No rows to delete.")
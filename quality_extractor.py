@@ -15,15 +15,23 @@ Uses Plex Data Source API for accessing quality data sources.
 
 import os
 import sys
+import importlib.util
 import json
 import base64
+import hashlib
+import sqlite3
 import aiohttp
+import orjson
+from aiolimiter import AsyncLimiter
 import asyncio
 import logging
+import time
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import cached_property, lru_cache
 
 from dotenv import load_dotenv
 from cognite.client import CogniteClient
@@ -33,6 +41,11 @@ from cognite.client.data_classes import Asset, Event, TimeSeries, Row
 
 from multi_facility_config import MultiTenantNamingConvention, FacilityConfig
 
+try:
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -93,6 +106,13 @@ class QualityConfig:
     batch_size: int = 1000
     max_retries: int = 3
     retry_delay: int = 5
+    max_concurrency: int = 16  # Concurrent data source calls per client
+    max_rps: int = 5  # Token-bucket cap on data source requests per second
+    upload_concurrency: int = 4  # Concurrent CDF upload batches
+    raw_database: str = "plex_raw"
+    raw_batch_size: int = 10000
+    response_cache_enabled: bool = False  # Opt-in on-disk cache of reference data sources
+    response_cache_path: str = ".plex_quality_cache.db"
     
     # Dataset ID
     dataset_quality_id: Optional[int] = None
@@ -149,18 +169,187 @@ class QualityConfig:
             use_test_env=os.getenv('PLEX_USE_TEST', 'false').lower() == 'true',
             extraction_interval=get_int_env('QUALITY_EXTRACTION_INTERVAL', 300),
             batch_size=get_int_env('QUALITY_BATCH_SIZE', 1000),
+            max_concurrency=get_int_env('QUALITY_MAX_CONCURRENCY', 16),
+            max_rps=get_int_env('QUALITY_MAX_RPS', 5),
+            upload_concurrency=get_int_env('QUALITY_UPLOAD_CONCURRENCY', 4),
+            raw_database=os.getenv('QUALITY_RAW_DATABASE', os.getenv('PLEX_RAW_DATABASE', 'plex_raw')),
+            raw_batch_size=get_int_env('QUALITY_RAW_BATCH_SIZE', 10000),
+            response_cache_enabled=os.getenv('QUALITY_RESPONSE_CACHE', 'false').lower() == 'true',
+            response_cache_path=os.getenv('QUALITY_RESPONSE_CACHE_PATH', '.plex_quality_cache.db'),
             dataset_quality_id=quality_id,
             extraction_start_date=start_date,
             extraction_days_back=get_int_env('QUALITY_DAYS_BACK', 30)
         )
 
 
+# Seconds a cached response stays valid; data sources not listed are never cached
+RESPONSE_CACHE_TTLS = {
+    QualityDataSource.SPECIFICATION_GET.value: 86400,
+    QualityDataSource.SPECIFICATIONS_BY_PART.value: 86400,
+    QualityDataSource.SPECIFICATION_PICKER.value: 3600,
+    QualityDataSource.CONTROL_PLAN_PICKER.value: 3600,
+    QualityDataSource.INSPECTION_MODES_GET.value: 3600,
+    QualityDataSource.SAMPLE_PLANS_GET.value: 3600,
+}
+
+
+class ResponseCache:
+    """SQLite-backed data source response cache keyed by (data source, inputs hash)"""
+    
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "ds_id INTEGER, inputs_hash TEXT, expires REAL, body BLOB, "
+            "PRIMARY KEY (ds_id, inputs_hash))"
+        )
+        self.conn.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+        self.conn.commit()
+    
+    @staticmethod
+    def inputs_hash(inputs: Dict[str, Any]) -> str:
+        return hashlib.blake2b(orjson.dumps(inputs, option=orjson.OPT_SORT_KEYS), digest_size=16).hexdigest()
+    
+    def get(self, data_source_id: int, inputs_hash: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute(
+            "SELECT body FROM responses WHERE ds_id = ? AND inputs_hash = ? AND expires >= ?",
+            (data_source_id, inputs_hash, time.time())
+        ).fetchone()
+        return orjson.loads(row[0]) if row else None
+    
+    def set(self, data_source_id: int, inputs_hash: str, body: bytes, ttl: int):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+            (data_source_id, inputs_hash, time.time() + ttl, body)
+        )
+        self.conn.commit()
+    
+    def close(self):
+        self.conn.close()
+
+
+class ServerThrottle:
+    """Pause requests while Plex rate-limit headers ask for it
+    
+    The steady request rate is capped by the client's AsyncLimiter; this only
+    adds the server-requested backoff on top.
+    """
+    
+    def __init__(self):
+        self.blocked_until = 0.0
+    
+    async def wait(self):
+        """Wait out any pause the server asked for"""
+        while True:
+            delay = self.blocked_until - time.monotonic()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+    
+    def update_from_headers(self, headers) -> Optional[float]:
+        """Pause sending when the server asks for it; returns the pause in seconds"""
+        delay = None
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = None
+        if delay is None and headers.get('X-RateLimit-Remaining') == '0':
+            delay = 1.0
+        if delay:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+        return delay
+
+
+class AIMDConcurrency:
+    """Concurrency cap with additive increase / multiplicative decrease on throttling"""
+    
+    def __init__(self, initial: int, increase_every: int = 10):
+        self.maximum = max(1, initial)
+        self.limit = self.maximum
+        self.increase_every = increase_every
+        self.in_flight = 0
+        self.successes = 0
+        self._condition = asyncio.Condition()
+    
+    async def __aenter__(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+    
+    def on_success(self):
+        """Raise the cap by one after every `increase_every` successful calls"""
+        self.successes += 1
+        if self.successes >= self.increase_every and self.limit < self.maximum:
+            self.limit += 1
+            self.successes = 0
+    
+    def on_throttle(self):
+        """Halve the cap when the server throttles us"""
+        self.limit = max(1, self.limit // 2)
+        self.successes = 0
+        logger.warning(f"Plex throttling detected, concurrency reduced to {self.limit}")
+
+
+# aiohttp only decodes Brotli when a Brotli binding is installed
+BROTLI_AVAILABLE = any(
+    importlib.util.find_spec(name) is not None for name in ('brotli', 'brotlicffi')
+)
+ACCEPT_ENCODING = 'br, gzip' if BROTLI_AVAILABLE else 'gzip, deflate'
+
+
+# Shared HTTP session so every data source client reuses the same keep-alive pool
+_shared_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Get the shared aiohttp session, creating it on first use"""
+    global _shared_session
+    if _shared_session is None or _shared_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=32,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        )
+        _shared_session = aiohttp.ClientSession(connector=connector)
+    return _shared_session
+
+
+async def close_shared_session():
+    """Close the shared aiohttp session"""
+    global _shared_session
+    if _shared_session is not None and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+
+
+@lru_cache(maxsize=8)
+def _basic_auth(username: str, password: str) -> str:
+    """Basic auth header value, encoded once per credential pair"""
+    encoded = base64.b64encode(f"{username}:{password}".encode('utf-8')).decode('ascii')
+    return f"Basic {encoded}"
+
+
 class PlexDataSourceClient:
     """Client for Plex Data Source API"""
     
     def __init__(self, config: QualityConfig):
         self.config = config
         self.session: Optional[aiohttp.ClientSession] = None
+        self.cache: Optional[ResponseCache] = None
+        
+        # Caps in-flight data source calls; shared by every extractor using this client
+        self.semaphore = AIMDConcurrency(config.max_concurrency)
+        self.throttle = ServerThrottle()
+        self.limiter = AsyncLimiter(config.max_rps or 5, 1)
         
         # Build base URL using PCN code
         pcn_code = config.plex_pcn_code or os.getenv('PLEX_PCN_CODE', 'ra-process')
@@ -171,39 +360,52 @@ class PlexDataSourceClient:
             self.base_url = f"https://{pcn_code}.on.plex.com"
         
         # Create authorization header
-        credentials = f"{config.plex_username}:{config.plex_password}"
-        encoded = base64.b64encode(credentials.encode('utf-8')).decode('ascii')
-        self.auth_header = f"Basic {encoded}"
+        self.auth_header = _basic_auth(config.plex_username, config.plex_password)
+        
+        # Request pieces that are fixed for the client's lifetime
+        self._headers = {
+            'Authorization': self.auth_header,
+            'Content-Type': 'application/json; charset=utf-8',
+            'Accept': 'application/json',
+            'Accept-Encoding': ACCEPT_ENCODING
+        }
+        self._url_cache: Dict[int, str] = {}
+        self._params_cache: Dict[Tuple[int, bool], Dict[str, str]] = {}
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+        self._encoding_logged = False
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = await get_session()
+        if self.config.response_cache_enabled:
+            self.cache = ResponseCache(self.config.response_cache_path)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        # The shared session outlives the client; close_shared_session() releases it
+        self.session = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
     
-    async def execute_data_source(
+    def _request_args(
         self,
         data_source_id: int,
         inputs: Dict[str, Any],
         format_type: int = 2,
         pretty: bool = False
-    ) -> Dict[str, Any]:
-        """Execute a Plex data source"""
-        url = f"{self.base_url}/api/datasources/{data_source_id}/execute"
+    ) -> Tuple[str, Dict[str, str], Dict[str, str], bytes]:
+        """Build the URL, headers, query parameters and body for a data source call"""
+        url = self._url_cache.get(data_source_id)
+        if url is None:
+            url = self._url_cache[data_source_id] = f"{self.base_url}/api/datasources/{data_source_id}/execute"
         
-        # Add query parameters
-        params = {'format': str(format_type)}
-        if pretty:
-            params['pretty'] = 'true'
-        
-        headers = {
-            'Authorization': self.auth_header,
-            'Content-Type': 'application/json; charset=utf-8',
-            'Accept': 'application/json',
-            'Accept-Encoding': 'gzip, deflate'
-        }
+        # Query parameters only vary by format and pretty flag
+        params = self._params_cache.get((format_type, pretty))
+        if params is None:
+            params = {'format': str(format_type)}
+            if pretty:
+                params['pretty'] = 'true'
+            self._params_cache[(format_type, pretty)] = params
         
         # Format request body based on format type
         # format=2 does NOT use 'inputs' wrapper
@@ -211,17 +413,87 @@ class PlexDataSourceClient:
             body = inputs
         else:
             body = {'inputs': inputs}
+        payload = orjson.dumps(body)
+        
+        return url, self._headers, params, payload
+    
+    async def execute_data_source(
+        self,
+        data_source_id: int,
+        inputs: Dict[str, Any],
+        format_type: int = 2,
+        pretty: bool = False
+    ) -> Dict[str, Any]:
+        """Execute a Plex data source, sharing one request among concurrent identical calls"""
+        key = (data_source_id, format_type, pretty, orjson.dumps(inputs, option=orjson.OPT_SORT_KEYS))
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._execute_data_source(data_source_id, inputs, format_type, pretty)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved so an unawaited future does not log
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+    
+    async def _execute_data_source(
+        self,
+        data_source_id: int,
+        inputs: Dict[str, Any],
+        format_type: int = 2,
+        pretty: bool = False
+    ) -> Dict[str, Any]:
+        """Execute a Plex data source"""
+        ttl = RESPONSE_CACHE_TTLS.get(data_source_id) if self.cache is not None else None
+        if ttl:
+            inputs_hash = ResponseCache.inputs_hash({'inputs': inputs, 'format': format_type})
+            cached = self.cache.get(data_source_id, inputs_hash)
+            if cached is not None:
+                return cached
+        
+        url, headers, params, payload = self._request_args(data_source_id, inputs, format_type, pretty)
         
         for attempt in range(self.config.max_retries):
             try:
-                async with self.session.post(
+                await self.throttle.wait()
+                await self.limiter.acquire()
+                async with self.semaphore, self.session.post(
                     url,
                     headers=headers,
-                    json=body,
+                    data=payload,
                     params=params
                 ) as response:
+                    throttle_delay = self.throttle.update_from_headers(response.headers)
                     if response.status == 200:
-                        return await response.json()
+                        self.semaphore.on_success()
+                        if not self._encoding_logged:
+                            self._encoding_logged = True
+                            logger.info(f"Plex data source responses served with Content-Encoding: "
+                                        f"{response.headers.get('Content-Encoding', 'identity')}")
+                        body = await response.read()
+                        result = orjson.loads(body)
+                        if ttl:
+                            self.cache.set(data_source_id, inputs_hash, body, ttl)
+                        return result
+                    elif response.status in [429, 503]:
+                        self.semaphore.on_throttle()
+                        logger.warning(f"Data source {data_source_id} throttled ({response.status}), retry after {throttle_delay or self.config.retry_delay}s")
+                        if attempt < self.config.max_retries - 1:
+                            if not throttle_delay:
+                                await asyncio.sleep(self.config.retry_delay * (attempt + 1))
+                        else:
+                            raise Exception(f"Data source {data_source_id} throttled after {self.config.max_retries} attempts")
                     elif response.status in [401, 403]:
                         error_data = await response.json()
                         logger.error(f"Authentication error: {error_data}")
@@ -241,6 +513,50 @@ class PlexDataSourceClient:
                 else:
                     raise
     
+    async def iter_rows(
+        self,
+        data_source_id: int,
+        inputs: Dict[str, Any],
+        format_type: int = 2
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield a data source's result rows as they are decoded off the wire
+        
+        Streams with ijson when it is installed. Without ijson, or when the
+        streamed request fails before any row is yielded, falls back to a
+        buffered execute_data_source() call so the usual retries apply.
+        """
+        # Cacheable data sources go through the buffered call so the cache applies
+        cacheable = self.cache is not None and data_source_id in RESPONSE_CACHE_TTLS
+        if ijson is not None and not cacheable:
+            url, headers, params, payload = self._request_args(data_source_id, inputs, format_type)
+            yielded = False
+            try:
+                await self.throttle.wait()
+                await self.limiter.acquire()
+                async with self.semaphore, self.session.post(
+                    url,
+                    headers=headers,
+                    data=payload,
+                    params=params
+                ) as response:
+                    self.throttle.update_from_headers(response.headers)
+                    if response.status == 200:
+                        self.semaphore.on_success()
+                        async for row in ijson.items_async(response.content, 'rows.item', use_float=True):
+                            yielded = True
+                            yield row
+                        return
+                    if response.status in [429, 503]:
+                        self.semaphore.on_throttle()
+            except aiohttp.ClientError as e:
+                if yielded:
+                    raise
+                logger.warning(f"Streaming data source {data_source_id} failed, retrying buffered: {e}")
+        
+        response = await self.execute_data_source(data_source_id, inputs, format_type)
+        for row in response.get('rows') or []:
+            yield row
+    
     async def get_data_source_metadata(self, data_source_id: int) -> Dict[str, Any]:
         """Get metadata for a data source"""
         url = f"{self.base_url}/api/datasources/{data_source_id}"
@@ -252,20 +568,47 @@ class PlexDataSourceClient:
         
         async with self.session.get(url, headers=headers) as response:
             if response.status == 200:
-                return await response.json()
+                return orjson.loads(await response.read())
             else:
                 error_text = await response.text()
                 raise Exception(f"Failed to get metadata: {error_text}")
 
 
+def _s(value: Any) -> str:
+    """Metadata string for a value of uncertain type; skips str() for strings"""
+    if value is None:
+        return ''
+    return value if isinstance(value, str) else str(value)
+
+
+# Specification fields an event needs; by-part rows without them are not used
+SPEC_DETAIL_FIELDS = (
+    'Specification_No', 'Name', 'Part_No', 'Revision', 'Specification_Type',
+    'Dimension_Type', 'Nominal', 'Upper_Limit', 'Lower_Limit'
+)
+
+
+# RAW table per quality reference-data category
+QUALITY_RAW_TABLES = {
+    'specification': 'quality_specifications',
+    'inspection_mode': 'quality_inspection_modes',
+    'sample_plan': 'quality_sample_plans',
+    'control_plan': 'quality_control_plans',
+    'control_plan_line': 'quality_control_plan_lines'
+}
+
+
+# Upper bound on remembered record ids; oldest are forgotten first
+PROCESSED_RECORDS_LIMIT = 1_000_000
+
+
 class QualityExtractor:
     """Extracts quality data from Plex using Data Source API"""
     
     def __init__(self, config: QualityConfig):
         self.config = config
         self.naming = MultiTenantNamingConvention(config.facility)
-        self.cognite_client = self._init_cognite_client()
-        self.processed_records = set()
+        self.processed_records: OrderedDict = OrderedDict()  # LRU of record ids
         
         # Calculate extraction date range
         if config.extraction_start_date:
@@ -274,6 +617,32 @@ class QualityExtractor:
             self.start_date = datetime.now(timezone.utc) - timedelta(days=config.extraction_days_back)
         
         self.end_date = datetime.now(timezone.utc)
+        
+        # Facility fields shared by every quality event's metadata
+        self._base_metadata = {
+            'pcn': config.facility.pcn,
+            'facility_name': config.facility.facility_name
+        }
+    
+    def _mark_processed(self, record_id: str):
+        """Remember a record id, evicting the least recently seen past the cap"""
+        self.processed_records[record_id] = None
+        self.processed_records.move_to_end(record_id)
+        if len(self.processed_records) > PROCESSED_RECORDS_LIMIT:
+            self.processed_records.popitem(last=False)
+    
+    def _seen(self, record_id: str) -> bool:
+        """Return True if the record was already processed, otherwise record it"""
+        if record_id in self.processed_records:
+            self.processed_records.move_to_end(record_id)
+            return True
+        self._mark_processed(record_id)
+        return False
+    
+    @cached_property
+    def cognite_client(self) -> CogniteClient:
+        """Cognite client, created on first use rather than at construction"""
+        return self._init_cognite_client()
     
     def _init_cognite_client(self) -> CogniteClient:
         """Initialize Cognite client"""
@@ -293,10 +662,14 @@ class QualityExtractor:
         
         return CogniteClient(config)
     
-    async def extract_specifications(self, ds_client: PlexDataSourceClient) -> List[Event]:
+    async def extract_specifications(self, ds_client: PlexDataSourceClient) -> List[Row]:
         """Extract part specifications and check sheets"""
         logger.info("Extracting specifications and check sheets...")
-        events = []
+        rows = []
+        now_s = int(time.time())
+        now_ms = now_s * 1000
+        base_meta = self._base_metadata
+        row_key = self.naming.raw_row_key
         
         try:
             # Get specifications using picker
@@ -310,164 +683,240 @@ class QualityExtractor:
             )
             
             if 'rows' in response:
+                # Collect unprocessed specification keys first, grouped by part
+                spec_keys = []
+                by_part = defaultdict(list)
+                queued = set()
                 for row in response['rows']:
                     spec_key = row.get('Specification_Key')
                     
                     # Skip if already processed
                     record_id = f"spec_{spec_key}"
-                    if record_id in self.processed_records:
+                    if record_id in self.processed_records or spec_key in queued:
                         continue
-                    
-                    # Get detailed specification data
-                    detail_response = await ds_client.execute_data_source(
+                    queued.add(spec_key)
+                    spec_keys.append(spec_key)
+                    part_no = row.get('Part_No')
+                    if part_no:
+                        by_part[part_no].append(spec_key)
+                
+                # One call per part covers all its specs; per-key calls fill the gaps
+                spec_details = await self._fetch_specs_by_part(ds_client, by_part)
+                missing = [spec_key for spec_key in spec_keys if spec_key not in spec_details]
+                
+                async def fetch_detail(spec_key):
+                    return await ds_client.execute_data_source(
                         QualityDataSource.SPECIFICATION_GET.value,
                         {'Specification_Key': spec_key}
                     )
-                    
-                    if 'outputs' in detail_response:
-                        spec_data = detail_response['outputs']
-                        
-                        # Create event for specification
-                        event = Event(
-                            external_id=self.naming.event_id(
-                                'specification',
-                                str(spec_key),
-                                int(datetime.now(timezone.utc).timestamp())
-                            ),
-                            type='quality_specification',
-                            subtype='checksheet',
-                            start_time=int(datetime.now(timezone.utc).timestamp() * 1000),
-                            metadata={
-                                'pcn': self.config.facility.pcn,
-                                'facility_name': self.config.facility.facility_name,
+                
+                details = await asyncio.gather(
+                    *(fetch_detail(spec_key) for spec_key in missing),
+                    return_exceptions=True
+                )
+                
+                for spec_key, detail_response in zip(missing, details):
+                    if isinstance(detail_response, Exception):
+                        logger.warning(f"Failed to get specification {spec_key}: {detail_response}")
+                    elif 'outputs' in detail_response:
+                        spec_details[spec_key] = detail_response['outputs']
+                
+                for spec_key in spec_keys:
+                    spec_data = spec_details.get(spec_key)
+                    if spec_data is not None:
+                        # Create RAW row for specification
+                        rows.append(Row(
+                            key=row_key('specification', str(spec_key)),
+                            columns={
+                                'type': 'quality_specification',
+                                'subtype': 'checksheet',
+                                'start_time': now_ms,
+                                **base_meta,
                                 'specification_no': spec_data.get('Specification_No', ''),
                                 'specification_name': spec_data.get('Name', ''),
                                 'part_no': spec_data.get('Part_No', ''),
                                 'part_revision': spec_data.get('Revision', ''),
                                 'specification_type': spec_data.get('Specification_Type', ''),
                                 'dimension_type': spec_data.get('Dimension_Type', ''),
-                                'nominal': str(spec_data.get('Nominal', '')),
-                                'upper_limit': str(spec_data.get('Upper_Limit', '')),
-                                'lower_limit': str(spec_data.get('Lower_Limit', ''))
-                            },
-                            data_set_id=self.config.dataset_quality_id
-                        )
-                        events.append(event)
-                        self.processed_records.add(record_id)
+                                'nominal': _s(spec_data.get('Nominal')),
+                                'upper_limit': _s(spec_data.get('Upper_Limit')),
+                                'lower_limit': _s(spec_data.get('Lower_Limit'))
+                            }
+                        ))
+                        self._mark_processed(f"spec_{spec_key}")
                         
         except Exception as e:
             logger.error(f"Error extracting specifications: {e}")
         
-        logger.info(f"Extracted {len(events)} specification events")
-        return events
+        logger.info(f"Extracted {len(rows)} specification rows")
+        return rows
     
-    async def extract_inspection_modes(self, ds_client: PlexDataSourceClient) -> List[Event]:
+    async def _fetch_specs_by_part(
+        self,
+        ds_client: PlexDataSourceClient,
+        by_part: Dict[str, List[Any]]
+    ) -> Dict[Any, Dict[str, Any]]:
+        """Fetch specification details with one SPECIFICATIONS_BY_PART call per part
+        
+        Only rows carrying every field used for the event metadata count as hits.
+        If the first part's rows lack them, the remaining parts are skipped and
+        the caller falls back to SPECIFICATION_GET for every key.
+        """
+        details: Dict[Any, Dict[str, Any]] = {}
+        
+        async def fetch_part(part_no):
+            return await ds_client.execute_data_source(
+                QualityDataSource.SPECIFICATIONS_BY_PART.value,
+                {'Part_No': part_no}
+            )
+        
+        def collect(part_no, response) -> bool:
+            if isinstance(response, Exception):
+                logger.warning(f"Failed to get specifications for part {part_no}: {response}")
+                return False
+            wanted = set(by_part[part_no])
+            hit = False
+            for row in response.get('rows') or []:
+                spec_key = row.get('Specification_Key')
+                if spec_key in wanted and all(field in row for field in SPEC_DETAIL_FIELDS):
+                    details[spec_key] = row
+                    hit = True
+            return hit
+        
+        parts = list(by_part)
+        if not parts:
+            return details
+        
+        # Probe with one part so a picker that lacks detail columns costs a single call
+        first = parts[0]
+        try:
+            first_response = await fetch_part(first)
+        except Exception as e:
+            first_response = e
+        if not collect(first, first_response):
+            return details
+        
+        responses = await asyncio.gather(
+            *(fetch_part(part_no) for part_no in parts[1:]),
+            return_exceptions=True
+        )
+        for part_no, response in zip(parts[1:], responses):
+            collect(part_no, response)
+        
+        return details
+    
+    async def extract_inspection_modes(self, ds_client: PlexDataSourceClient) -> List[Row]:
         """Extract inspection modes and SPC data"""
         logger.info("Extracting inspection modes and SPC data...")
-        events = []
+        rows = []
+        now_s = int(time.time())
+        now_ms = now_s * 1000
+        base_meta = self._base_metadata
+        row_key = self.naming.raw_row_key
+        table = QUALITY_RAW_TABLES['inspection_mode']
+        raw_batch_size = self.config.raw_batch_size
+        flushed = 0
         
         try:
             # Get inspection modes - using the self-serviceable data source
-            response = await ds_client.execute_data_source(
+            async for row in ds_client.iter_rows(
                 QualityDataSource.INSPECTION_MODES_GET.value,
                 {}  # Start with empty inputs, may need adjustments
-            )
-            
-            if 'rows' in response:
-                for row in response['rows']:
-                    mode_key = row.get('Inspection_Mode_Key') or row.get('id')
-                    
-                    # Skip if already processed
-                    record_id = f"inspection_{mode_key}"
-                    if record_id in self.processed_records:
-                        continue
-                    
-                    # Create event for inspection mode
-                    event = Event(
-                        external_id=self.naming.event_id(
-                            'inspection_mode',
-                            str(mode_key),
-                            int(datetime.now(timezone.utc).timestamp())
-                        ),
-                        type='quality_inspection',
-                        subtype='spc_mode',
-                        start_time=int(datetime.now(timezone.utc).timestamp() * 1000),
-                        metadata={
-                            'pcn': self.config.facility.pcn,
-                            'facility_name': self.config.facility.facility_name,
-                            'inspection_mode': row.get('Inspection_Mode', ''),
-                            'mode_description': row.get('Description', ''),
-                            'mode_type': row.get('Mode_Type', ''),
-                            'frequency': row.get('Frequency', ''),
-                            'status': row.get('Status', 'Active')
-                        },
-                        data_set_id=self.config.dataset_quality_id
-                    )
-                    events.append(event)
-                    self.processed_records.add(record_id)
+            ):
+                mode_key = row.get('Inspection_Mode_Key') or row.get('id')
+                
+                # Skip if already processed
+                if self._seen(f"inspection_{mode_key}"):
+                    continue
+                
+                # Create RAW row for inspection mode
+                rows.append(Row(
+                    key=row_key('inspection_mode', str(mode_key)),
+                    columns={
+                        'type': 'quality_inspection',
+                        'subtype': 'spc_mode',
+                        'start_time': now_ms,
+                        **base_meta,
+                        'inspection_mode': row.get('Inspection_Mode', ''),
+                        'mode_description': row.get('Description', ''),
+                        'mode_type': row.get('Mode_Type', ''),
+                        'frequency': row.get('Frequency', ''),
+                        'status': row.get('Status', 'Active')
+                    }
+                ))
+                
+                # Flush full batches so the whole export is never held in memory
+                if len(rows) >= raw_batch_size:
+                    flushed += await self._flush_rows(table, rows)
+                    rows = []
                     
         except Exception as e:
             logger.error(f"Error extracting inspection modes: {e}")
         
-        logger.info(f"Extracted {len(events)} inspection mode events")
-        return events
+        logger.info(f"Extracted {flushed + len(rows)} inspection mode rows")
+        return rows
     
-    async def extract_sample_plans(self, ds_client: PlexDataSourceClient) -> List[Event]:
+    async def extract_sample_plans(self, ds_client: PlexDataSourceClient) -> List[Row]:
         """Extract sample plans data"""
         logger.info("Extracting sample plans...")
-        events = []
+        rows = []
+        now_s = int(time.time())
+        now_ms = now_s * 1000
+        base_meta = self._base_metadata
+        row_key = self.naming.raw_row_key
+        table = QUALITY_RAW_TABLES['sample_plan']
+        raw_batch_size = self.config.raw_batch_size
+        flushed = 0
         
         try:
             # Get sample plans using SAMPLE_PLANS_GET
-            response = await ds_client.execute_data_source(
+            async for row in ds_client.iter_rows(
                 QualityDataSource.SAMPLE_PLANS_GET.value,
                 {}  # Start with empty inputs
-            )
-            
-            if 'rows' in response:
-                for row in response['rows']:
-                    plan_key = row.get('Sample_Plan_Key') or row.get('id')
-                    
-                    # Skip if already processed
-                    record_id = f"sample_plan_{plan_key}"
-                    if record_id in self.processed_records:
-                        continue
-                    
-                    # Create event for sample plan
-                    event = Event(
-                        external_id=self.naming.event_id(
-                            'sample_plan',
-                            str(plan_key),
-                            int(datetime.now(timezone.utc).timestamp())
-                        ),
-                        type='quality_sample_plan',
-                        subtype='inspection_plan',
-                        start_time=int(datetime.now(timezone.utc).timestamp() * 1000),
-                        metadata={
-                            'pcn': self.config.facility.pcn,
-                            'facility_name': self.config.facility.facility_name,
-                            'plan_name': row.get('Plan_Name', ''),
-                            'plan_type': row.get('Plan_Type', ''),
-                            'sample_size': str(row.get('Sample_Size', '')),
-                            'frequency': row.get('Frequency', ''),
-                            'acceptance_criteria': row.get('Acceptance_Criteria', ''),
-                            'status': row.get('Status', 'Active')
-                        },
-                        data_set_id=self.config.dataset_quality_id
-                    )
-                    events.append(event)
-                    self.processed_records.add(record_id)
+            ):
+                plan_key = row.get('Sample_Plan_Key') or row.get('id')
+                
+                # Skip if already processed
+                if self._seen(f"sample_plan_{plan_key}"):
+                    continue
+                
+                # Create RAW row for sample plan
+                rows.append(Row(
+                    key=row_key('sample_plan', str(plan_key)),
+                    columns={
+                        'type': 'quality_sample_plan',
+                        'subtype': 'inspection_plan',
+                        'start_time': now_ms,
+                        **base_meta,
+                        'plan_name': row.get('Plan_Name', ''),
+                        'plan_type': row.get('Plan_Type', ''),
+                        'sample_size': _s(row.get('Sample_Size')),
+                        'frequency': row.get('Frequency', ''),
+                        'acceptance_criteria': row.get('Acceptance_Criteria', ''),
+                        'status': row.get('Status', 'Active')
+                    }
+                ))
+                
+                # Flush full batches so the whole export is never held in memory
+                if len(rows) >= raw_batch_size:
+                    flushed += await self._flush_rows(table, rows)
+                    rows = []
                     
         except Exception as e:
             logger.error(f"Error extracting sample plans: {e}")
         
-        logger.info(f"Extracted {len(events)} sample plan events")
-        return events
+        logger.info(f"Extracted {flushed + len(rows)} sample plan rows")
+        return rows
     
     async def extract_checksheets(self, ds_client: PlexDataSourceClient) -> List[Event]:
         """Extract checksheets data"""
         logger.info("Extracting checksheets...")
         events = []
+        now_s = int(time.time())
+        now_ms = now_s * 1000
+        base_meta = self._base_metadata
+        event_id = self.naming.event_id
+        dsid = self.config.dataset_quality_id
         
         try:
             # Get checksheets using CHECKSHEETS_GET
@@ -479,24 +928,18 @@ class QualityExtractor:
             if response and 'outputs' in response:
                 # Create event for checksheet data
                 outputs = response['outputs']
-                event = Event(
-                    external_id=self.naming.event_id(
-                        'checksheet',
-                        'batch',
-                        int(datetime.now(timezone.utc).timestamp())
-                    ),
+                events.append(Event(
+                    external_id=event_id('checksheet', 'batch', now_s),
                     type='quality_checksheet',
                     subtype='inspection',
-                    start_time=int(datetime.now(timezone.utc).timestamp() * 1000),
+                    start_time=now_ms,
                     metadata={
-                        'pcn': self.config.facility.pcn,
-                        'facility_name': self.config.facility.facility_name,
+                        **base_meta,
                         'data_source': 'checksheets_get',
                         'record_count': str(len(response.get('tables', [])))
                     },
-                    data_set_id=self.config.dataset_quality_id
-                )
-                events.append(event)
+                    data_set_id=dsid
+                ))
                 
         except Exception as e:
             logger.error(f"Error extracting checksheets: {e}")
@@ -504,104 +947,115 @@ class QualityExtractor:
         logger.info(f"Extracted {len(events)} checksheet events")
         return events
     
-    async def extract_control_plans(self, ds_client: PlexDataSourceClient) -> List[Event]:
+    async def extract_control_plans(self, ds_client: PlexDataSourceClient) -> List[Row]:
         """Extract control plans data"""
         logger.info("Extracting control plans...")
-        events = []
+        rows = []
+        now_s = int(time.time())
+        now_ms = now_s * 1000
+        base_meta = self._base_metadata
+        row_key = self.naming.raw_row_key
+        table = QUALITY_RAW_TABLES['control_plan']
+        raw_batch_size = self.config.raw_batch_size
+        flushed = 0
         
         try:
             # Get control plans using CONTROL_PLAN_PICKER
-            response = await ds_client.execute_data_source(
+            async for row in ds_client.iter_rows(
                 QualityDataSource.CONTROL_PLAN_PICKER.value,
                 {}  # Empty inputs - will be wrapped by execute_data_source
-            )
-            
-            if response and 'rows' in response:
-                for row in response['rows']:
-                    plan_id = row.get('Control_Plan_Key') or row.get('id')
-                    if not plan_id:
-                        continue
-                    
-                    event = Event(
-                        external_id=self.naming.event_id(
-                            'control_plan',
-                            str(plan_id),
-                            int(datetime.now(timezone.utc).timestamp())
-                        ),
-                        type='quality_control_plan',
-                        subtype='plan',
-                        start_time=int(datetime.now(timezone.utc).timestamp() * 1000),
-                        metadata={
-                            'pcn': self.config.facility.pcn,
-                            'facility_name': self.config.facility.facility_name,
-                            'control_plan_id': str(plan_id),
-                            'plan_name': row.get('Name', ''),
-                            'status': row.get('Status', 'Active')
-                        },
-                        data_set_id=self.config.dataset_quality_id
-                    )
-                    events.append(event)
+            ):
+                plan_id = row.get('Control_Plan_Key') or row.get('id')
+                if not plan_id:
+                    continue
+                
+                rows.append(Row(
+                    key=row_key('control_plan', str(plan_id)),
+                    columns={
+                        'type': 'quality_control_plan',
+                        'subtype': 'plan',
+                        'start_time': now_ms,
+                        **base_meta,
+                        'control_plan_id': str(plan_id),
+                        'plan_name': row.get('Name', ''),
+                        'status': row.get('Status', 'Active')
+                    }
+                ))
+                
+                # Flush full batches so the whole export is never held in memory
+                if len(rows) >= raw_batch_size:
+                    flushed += await self._flush_rows(table, rows)
+                    rows = []
                     
         except Exception as e:
             logger.error(f"Error extracting control plans: {e}")
         
-        logger.info(f"Extracted {len(events)} control plan events")
-        return events
+        logger.info(f"Extracted {flushed + len(rows)} control plan rows")
+        return rows
     
-    async def extract_control_plan_lines(self, ds_client: PlexDataSourceClient) -> List[Event]:
+    async def extract_control_plan_lines(self, ds_client: PlexDataSourceClient) -> List[Row]:
         """Extract control plan lines export data"""
         logger.info("Extracting control plan lines...")
-        events = []
+        rows = []
+        now_s = int(time.time())
+        now_ms = now_s * 1000
+        base_meta = self._base_metadata
+        row_key = self.naming.raw_row_key
+        table = QUALITY_RAW_TABLES['control_plan_line']
+        raw_batch_size = self.config.raw_batch_size
+        flushed = 0
         
         try:
             # Get control plan lines using CONTROL_PLAN_LINES_EXPORT
-            response = await ds_client.execute_data_source(
+            async for row in ds_client.iter_rows(
                 QualityDataSource.CONTROL_PLAN_LINES_EXPORT.value,
                 {}  # Empty inputs - will be wrapped by execute_data_source
-            )
-            
-            if response and 'rows' in response:
-                for row in response['rows']:
-                    line_key = row.get('Control_Plan_Line_Key') or row.get('id')
-                    
-                    # Skip if already processed
-                    record_id = f"control_plan_line_{line_key}"
-                    if record_id in self.processed_records:
-                        continue
-                    
-                    # Create event for control plan line
-                    event = Event(
-                        external_id=self.naming.event_id(
-                            'control_plan_line',
-                            str(line_key),
-                            int(datetime.now(timezone.utc).timestamp())
-                        ),
-                        type='quality_control_plan',
-                        subtype='plan_line',
-                        start_time=int(datetime.now(timezone.utc).timestamp() * 1000),
-                        metadata={
-                            'pcn': self.config.facility.pcn,
-                            'facility_name': self.config.facility.facility_name,
-                            'line_number': str(row.get('Line_Number', '')),
-                            'characteristic': row.get('Characteristic', ''),
-                            'specification': row.get('Specification', ''),
-                            'tolerance': row.get('Tolerance', ''),
-                            'measurement_method': row.get('Measurement_Method', ''),
-                            'frequency': row.get('Frequency', ''),
-                            'sample_size': str(row.get('Sample_Size', '')),
-                            'control_method': row.get('Control_Method', ''),
-                            'reaction_plan': row.get('Reaction_Plan', '')
-                        },
-                        data_set_id=self.config.dataset_quality_id
-                    )
-                    events.append(event)
-                    self.processed_records.add(record_id)
+            ):
+                line_key = row.get('Control_Plan_Line_Key') or row.get('id')
+                
+                # Skip if already processed
+                if self._seen(f"control_plan_line_{line_key}"):
+                    continue
+                
+                # Create RAW row for control plan line
+                rows.append(Row(
+                    key=row_key('control_plan_line', str(line_key)),
+                    columns={
+                        'type': 'quality_control_plan',
+                        'subtype': 'plan_line',
+                        'start_time': now_ms,
+                        **base_meta,
+                        'line_number': _s(row.get('Line_Number')),
+                        'characteristic': row.get('Characteristic', ''),
+                        'specification': row.get('Specification', ''),
+                        'tolerance': row.get('Tolerance', ''),
+                        'measurement_method': row.get('Measurement_Method', ''),
+                        'frequency': row.get('Frequency', ''),
+                        'sample_size': _s(row.get('Sample_Size')),
+                        'control_method': row.get('Control_Method', ''),
+                        'reaction_plan': row.get('Reaction_Plan', '')
+                    }
+                ))
+                
+                # Flush full batches so the whole export is never held in memory
+                if len(rows) >= raw_batch_size:
+                    flushed += await self._flush_rows(table, rows)
+                    rows = []
                     
         except Exception as e:
             logger.error(f"Error extracting control plan lines: {e}")
         
-        logger.info(f"Extracted {len(events)} control plan line events")
-        return events
+        logger.info(f"Extracted {flushed + len(rows)} control plan line rows")
+        return rows
+    
+    async def _flush_rows(self, table: str, rows: List[Row]) -> int:
+        """Insert rows into a quality RAW table before extraction finishes"""
+        await asyncio.to_thread(
+            self.cognite_client.raw.rows.insert,
+            self.config.raw_database, table, rows,
+            ensure_parent=True
+        )
+        return len(rows)
     
     async def create_quality_metrics(self) -> List[TimeSeries]:
         """Create time series for quality metrics"""
@@ -623,8 +1077,7 @@ class QualityExtractor:
                 name=f"Quality {metric_name.replace('_', ' ').title()}",
                 description=description,
                 metadata={
-                    'pcn': self.config.facility.pcn,
-                    'facility_name': self.config.facility.facility_name,
+                    **self._base_metadata,
                     'metric_type': 'quality',
                     'metric_name': metric_name
                 },
@@ -647,45 +1100,82 @@ class QualityExtractor:
         logger.info(f"Date range: {self.start_date} to {self.end_date}")
         logger.info("Using only self-serviceable quality data sources")
         
+        # Build the Cognite client in a worker thread while the first extracts run
+        client_ready = asyncio.create_task(asyncio.to_thread(lambda: self.cognite_client))
+        
         async with PlexDataSourceClient(self.config) as ds_client:
             all_events = []
+            raw_rows: Dict[str, List[Row]] = {}
             
-            # Extract different types of quality data using only available data sources
-            
-            # 1. Specifications (SPECIFICATION_GET, SPECIFICATION_PICKER, SPECIFICATIONS_BY_PART)
-            spec_events = await self.extract_specifications(ds_client)
-            all_events.extend(spec_events)
-            
-            # 2. Checksheets (CHECKSHEETS_GET)
-            checksheet_events = await self.extract_checksheets(ds_client)
-            all_events.extend(checksheet_events)
+            # Extract different types of quality data using only available data sources.
+            # Each hits an independent data source, so they run concurrently. Reference
+            # data goes to a RAW table; only the checksheet batch marker is an event.
+            steps = (
+                # 1. Specifications (SPECIFICATION_GET, SPECIFICATION_PICKER, SPECIFICATIONS_BY_PART)
+                (QUALITY_RAW_TABLES['specification'], self.extract_specifications(ds_client)),
+                # 2. Checksheets (CHECKSHEETS_GET)
+                (None, self.extract_checksheets(ds_client)),
+                # 3. Control Plans (CONTROL_PLAN_PICKER)
+                (QUALITY_RAW_TABLES['control_plan'], self.extract_control_plans(ds_client)),
+                # 4. Control Plan Lines (CONTROL_PLAN_LINES_EXPORT)
+                (QUALITY_RAW_TABLES['control_plan_line'], self.extract_control_plan_lines(ds_client)),
+                # 5. Sample Plans (SAMPLE_PLANS_GET)
+                (QUALITY_RAW_TABLES['sample_plan'], self.extract_sample_plans(ds_client)),
+                # 6. Inspection Modes / SPC (INSPECTION_MODES_GET)
+                (QUALITY_RAW_TABLES['inspection_mode'], self.extract_inspection_modes(ds_client)),
+            )
+            results = await asyncio.gather(
+                *(step for _, step in steps),
+                return_exceptions=True
+            )
+            for (table, _), result in zip(steps, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Quality extraction step failed: {result}")
+                elif table is None:
+                    all_events.extend(result)
+                elif result:
+                    raw_rows[table] = result
             
-            # 3. Control Plans (CONTROL_PLAN_PICKER)
-            control_plan_events = await self.extract_control_plans(ds_client)
-            all_events.extend(control_plan_events)
+            await client_ready
+            upload_semaphore = asyncio.Semaphore(self.config.upload_concurrency)
             
-            # 4. Control Plan Lines (CONTROL_PLAN_LINES_EXPORT)
-            control_line_events = await self.extract_control_plan_lines(ds_client)
-            all_events.extend(control_line_events)
+            async def upload(label, func, *args, **kwargs):
+                # The SDK calls are blocking, so run them off the event loop
+                async with upload_semaphore:
+                    await asyncio.to_thread(func, *args, **kwargs)
+                logger.info(f"Uploaded {label}")
             
-            # 5. Sample Plans (SAMPLE_PLANS_GET)
-            sample_plan_events = await self.extract_sample_plans(ds_client)
-            all_events.extend(sample_plan_events)
+            uploads = []
             
-            # 6. Inspection Modes / SPC (INSPECTION_MODES_GET)
-            inspection_events = await self.extract_inspection_modes(ds_client)
-            all_events.extend(inspection_events)
+            # Upload RAW rows to CDF
+            database = self.config.raw_database
+            raw_batch_size = self.config.raw_batch_size
+            for table, rows in raw_rows.items():
+                logger.info(f"Uploading {len(rows)} rows to RAW {database}.{table}...")
+                for i in range(0, len(rows), raw_batch_size):
+                    uploads.append(upload(
+                        f"{table} rows {i + 1}-{min(i + raw_batch_size, len(rows))}",
+                        self.cognite_client.raw.rows.insert,
+                        database, table, rows[i:i + raw_batch_size],
+                        ensure_parent=True
+                    ))
             
             # Upload events to CDF
             if all_events:
                 logger.info(f"Uploading {len(all_events)} quality events to CDF...")
-                try:
-                    for i in range(0, len(all_events), self.config.batch_size):
-                        batch = all_events[i:i + self.config.batch_size]
-                        self.cognite_client.events.create(batch)
-                        logger.info(f"Uploaded batch {i//self.config.batch_size + 1}")
-                except Exception as e:
-                    logger.error(f"Error uploading events: {e}")
+                batch_size = self.config.batch_size
+                # The SDK create retries throttling and server errors
+                for i in range(0, len(all_events), batch_size):
+                    uploads.append(upload(
+                        f"event batch {i // batch_size + 1}",
+                        self.cognite_client.events.create,
+                        all_events[i:i + batch_size]
+                    ))
+            
+            results = await asyncio.gather(*uploads, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error uploading quality data: {result}")
             
             # Create quality metrics time series
             await self.create_quality_metrics()
@@ -697,7 +1187,10 @@ async def main():
     """Main entry point"""
     config = QualityConfig.from_env()
     extractor = QualityExtractor(config)
-    await extractor.run()
+    try:
+        await extractor.run()
+    finally:
+        await close_shared_session()
 
 
 if __name__ == '__main__':
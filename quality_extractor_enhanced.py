@@ -14,13 +14,20 @@ from __future__ import annotations
 import asyncio
 import base64
 import json
-from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Tuple, Final, TypeAlias
+import os
+import time
+from collections import Counter, OrderedDict
+from datetime import date, datetime, timezone, timedelta
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Any, Tuple, Final, TypeAlias
 from dataclasses import dataclass, field
 from enum import StrEnum, auto
 
 import structlog
 import aiohttp
+import orjson
+from aiohttp import hdrs
+from multidict import CIMultiDict, CIMultiDictProxy
 from cognite.client.data_classes import Asset, Event, TimeSeries, Datapoints
 
 from base_extractor_enhanced import (
@@ -29,6 +36,21 @@ from base_extractor_enhanced import (
 )
 from error_handling import PlexAPIError, handle_api_response
 
+try:
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+try:
+    import ciso8601  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    ciso8601 = None
+
+try:
+    import msgspec  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
 # Setup structured logging
 logger = structlog.get_logger(__name__)
 
@@ -59,7 +81,7 @@ class NCRStatus(StrEnum):
     CLOSED = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class NCReport:
     """Non-conformance report data"""
     id: NCRId
@@ -71,7 +93,8 @@ class NCReport:
     defect_description: Optional[str] = None
     root_cause: Optional[str] = None
     corrective_action: Optional[str] = None
-    created_date: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    created_date: Optional[datetime] = None  # Set by the row parser
+    created_ms: int = 0  # created_date as epoch ms, set by the row parser
     closed_date: Optional[datetime] = None
     operator: Optional[str] = None
     workcenter_id: Optional[str] = None
@@ -80,7 +103,7 @@ class NCReport:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Specification:
     """Quality specification data"""
     id: SpecificationId
@@ -95,7 +118,7 @@ class Specification:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Checksheet:
     """Quality checksheet data"""
     id: ChecksheetId
@@ -108,7 +131,7 @@ class Checksheet:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class InspectionResult:
     """Inspection result data"""
     id: InspectionId
@@ -118,12 +141,13 @@ class InspectionResult:
     serial_number: Optional[str] = None
     measurements: List[Dict[str, Any]] = field(default_factory=list)
     inspector: Optional[str] = None
-    inspection_date: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    inspection_date: Optional[datetime] = None  # Set by the row parser
+    created_ms: int = 0  # inspection_date as epoch ms, set by the row parser
     defects_found: List[str] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class ProblemReport:
     """Problem report data"""
     id: str
@@ -131,7 +155,8 @@ class ProblemReport:
     description: str
     status: str
     priority: str
-    reported_date: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    reported_date: Optional[datetime] = None  # Set by the row parser
+    created_ms: int = 0  # reported_date as epoch ms, set by the parser
     reporter: Optional[str] = None
     assigned_to: Optional[str] = None
     resolution: Optional[str] = None
@@ -139,6 +164,189 @@ class ProblemReport:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+def _parse_iso(value: Any) -> Optional[datetime]:
+    """Parse an ISO-8601 timestamp from Plex, returning None when absent or invalid
+    
+    Uses ciso8601 when installed, which accepts a trailing 'Z' directly.
+    """
+    # Reject nulls, numbers and short strings up front rather than via exceptions
+    if not isinstance(value, str) or len(value) < 10:
+        return None
+    try:
+        if ciso8601 is not None:
+            return ciso8601.parse_datetime(value)
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+_NCR_STATUS_MAP: Final = {
+    'closed': NCRStatus.CLOSED,
+    'approved': NCRStatus.APPROVED,
+    'rejected': NCRStatus.REJECTED,
+    'in review': NCRStatus.IN_REVIEW,
+    'review': NCRStatus.IN_REVIEW,
+    'open': NCRStatus.OPEN,
+}
+# Keywords checked in priority order when the status is not an exact match
+_NCR_STATUS_PRIORITY: Final = (
+    ('closed', NCRStatus.CLOSED),
+    ('approved', NCRStatus.APPROVED),
+    ('rejected', NCRStatus.REJECTED),
+    ('review', NCRStatus.IN_REVIEW),
+)
+
+
+def _ncr_status(value: str) -> NCRStatus:
+    """Map a free-form Plex NCR status onto NCRStatus"""
+    status_str = value.lower()
+    status = _NCR_STATUS_MAP.get(status_str)
+    if status is not None:
+        return status
+    return next((status for keyword, status in _NCR_STATUS_PRIORITY if keyword in status_str), NCRStatus.OPEN)
+
+
+def _build_row_parser(
+    cls: type,
+    id_keys: Tuple[str, ...],
+    fields: Dict[str, str],
+    stamp: Optional[str] = None
+):
+    """Compile a row parser specialised for `cls` and cache it as `cls._from_row`
+    
+    `fields` maps constructor keywords to source expressions over the row `d`,
+    its bound `g = d.get` and its resolved id `i`. When `stamp` names a
+    datetime field, its epoch ms is stored on `created_ms`. The generated
+    function returns None for rows without an id.
+    """
+    id_expr = ' or '.join(f"g({key!r})" for key in id_keys)
+    kwargs = ''.join(f"        {name}={expr},\n" for name, expr in fields.items())
+    stamp_line = f"    o.created_ms = int(o.{stamp}.timestamp() * 1000)\n" if stamp else ""
+    source = (
+        "def parse(d):\n"
+        "    g = d.get\n"
+        f"    i = {id_expr}\n"
+        "    if not i:\n"
+        "        return None\n"
+        "    o = cls(\n"
+        "        id=str(i),\n"
+        f"{kwargs}"
+        "    )\n"
+        f"{stamp_line}"
+        "    return o\n"
+    )
+    namespace = {
+        'cls': cls,
+        '_parse_iso': _parse_iso,
+        '_ncr_status': _ncr_status,
+        'datetime': datetime,
+        'timezone': timezone,
+    }
+    exec(compile(source, f"<{cls.__name__} row parser>", 'exec'), namespace)
+    parse = namespace['parse']
+    cls._from_row = staticmethod(parse)
+    return parse
+
+
+_build_row_parser(Specification, ('id', 'specificationId'), {
+    'name': "g('name', '')",
+    'part_id': "g('partId')",
+    'specification_type': "g('type', 'dimensional')",
+    'nominal_value': "g('nominalValue')",
+    'upper_limit': "g('upperLimit')",
+    'lower_limit': "g('lowerLimit')",
+    'unit_of_measure': "g('unitOfMeasure')",
+    'active': "g('active', True)",
+    'metadata': "d",
+})
+
+_build_row_parser(Checksheet, ('id', 'checksheetId'), {
+    'name': "g('name', '')",
+    'part_id': "g('partId')",
+    'operation_id': "g('operationId')",
+    'frequency': "g('frequency')",
+    'check_items': "g('checkItems', [])",
+    'active': "g('active', True)",
+    'metadata': "d",
+})
+
+_build_row_parser(NCReport, ('id', 'ncrId'), {
+    'number': "g('ncrNumber', str(i))",
+    'status': "_ncr_status(g('status', 'open'))",
+    'part_id': "g('partId')",
+    'part_name': "g('partName')",
+    'quantity_affected': "int(g('quantityAffected', 0))",
+    'defect_description': "g('defectDescription')",
+    'root_cause': "g('rootCause')",
+    'corrective_action': "g('correctiveAction')",
+    'created_date': "_parse_iso(g('createdDate')) or datetime.now(timezone.utc)",
+    'closed_date': "_parse_iso(g('closedDate'))",
+    'operator': "g('operator')",
+    'workcenter_id': "g('workcenterId')",
+    'severity': "g('severity')",
+    'cost_impact': "g('costImpact')",
+    'metadata': "d",
+}, stamp='created_date')
+
+
+_build_row_parser(InspectionResult, ('id', 'inspectionId'), {
+    'checksheet_id': "g('checksheetId')",
+    'part_id': "g('partId')",
+    'serial_number': "g('serialNumber')",
+    'result': "g('result', 'unknown')",
+    'measurements': "g('measurements', [])",
+    'inspector': "g('inspector')",
+    'inspection_date': "_parse_iso(g('inspectionDate')) or datetime.now(timezone.utc)",
+    'defects_found': "g('defectsFound', [])",
+    'metadata': "d",
+}, stamp='inspection_date')
+
+@lru_cache(maxsize=4)
+def _date_window(end_day: date, days: int) -> Tuple[date, date]:
+    """(start, end) day window; recomputed only when the UTC day changes"""
+    return end_day - timedelta(days=days), end_day
+
+
+if msgspec is not None:
+    class _DataSourceRows(msgspec.Struct):
+        """DataSource response envelope; other top-level keys are skipped without materializing"""
+        rows: List[Dict[str, Any]] = []
+
+    _DS_ROWS_DECODER = msgspec.json.Decoder(_DataSourceRows)
+
+
+def _decode_datasource(content: bytes) -> Dict[str, Any]:
+    """Decode a DataSource response body down to its 'rows', using msgspec when available"""
+    if msgspec is not None:
+        return {'rows': _DS_ROWS_DECODER.decode(content).rows}
+    return {'rows': orjson.loads(content).get('rows', [])}
+
+
+# Row counts above this are parsed in a worker thread so the event loop keeps running
+THREAD_PARSE_MIN_ROWS: Final = 500
+
+
+def _parse_batch(cls: type, rows: List[Dict[str, Any]]) -> List[Any]:
+    """Parse rows with `cls._from_row`, dropping the ones without an id"""
+    parse = cls._from_row
+    return [parsed for parsed in map(parse, rows) if parsed is not None]
+
+
+# Processed ids remembered per record type; the least recently seen are evicted past this
+PROCESSED_SET_LIMIT: Final = 100_000
+
+
+_TRUTHY: Final = frozenset({'true', '1', 'yes', 'on'})
+
+
+def _env_flag(key: str, default: bool) -> bool:
+    """Boolean environment setting; unset keeps the default"""
+    value = os.getenv(key)
+    if value is None:
+        return default
+    return value.lower() in _TRUTHY
+
+
 class QualityExtractorConfig(BaseExtractorConfig):
     """Configuration specific to quality extractor"""
     extract_ncrs: bool = True
@@ -150,31 +358,39 @@ class QualityExtractorConfig(BaseExtractorConfig):
     datasource_username: Optional[str] = None
     datasource_password: Optional[str] = None
     lookback_days: int = 30
+    datasource_cache_ttl: int = 300  # Seconds to reuse an identical datasource result
     
     @classmethod
     def from_env(cls) -> QualityExtractorConfig:
         """Load configuration from environment"""
-        import os
         base = BaseExtractorConfig.from_env('quality')
         
         return cls(
             **base.dict(),
-            extract_ncrs=os.getenv('EXTRACT_NCRS', 'true').lower() == 'true',
-            extract_specifications=os.getenv('EXTRACT_SPECIFICATIONS', 'true').lower() == 'true',
-            extract_checksheets=os.getenv('EXTRACT_CHECKSHEETS', 'true').lower() == 'true',
-            extract_inspections=os.getenv('EXTRACT_INSPECTIONS', 'true').lower() == 'true',
-            extract_problem_reports=os.getenv('EXTRACT_PROBLEM_REPORTS', 'true').lower() == 'true',
-            use_datasource_api=os.getenv('USE_DATASOURCE_API', 'true').lower() == 'true',
+            extract_ncrs=_env_flag('EXTRACT_NCRS', True),
+            extract_specifications=_env_flag('EXTRACT_SPECIFICATIONS', True),
+            extract_checksheets=_env_flag('EXTRACT_CHECKSHEETS', True),
+            extract_inspections=_env_flag('EXTRACT_INSPECTIONS', True),
+            extract_problem_reports=_env_flag('EXTRACT_PROBLEM_REPORTS', True),
+            use_datasource_api=_env_flag('USE_DATASOURCE_API', True),
             datasource_username=os.getenv('PLEX_DS_USERNAME'),
             datasource_password=os.getenv('PLEX_DS_PASSWORD'),
-            lookback_days=int(os.getenv('QUALITY_LOOKBACK_DAYS', '30'))
+            lookback_days=int(os.getenv('QUALITY_LOOKBACK_DAYS', '30')),
+            datasource_cache_ttl=int(os.getenv('QUALITY_DS_CACHE_TTL', '300'))
         )
 
 
 class DataSourceAPIClient:
     """Client for Plex Data Source API"""
     
-    def __init__(self, username: str, password: str, pcn_code: str, use_test: bool = False):
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        pcn_code: str,
+        use_test: bool = False,
+        cache_ttl_s: int = 300
+    ):
         self.username = username
         self.password = password
         
@@ -186,11 +402,25 @@ class DataSourceAPIClient:
         
         # Create authorization header
         credentials = f"{username}:{password}"
-        encoded = base64.b64encode(credentials.encode('utf-8')).decode('ascii')
-        self.auth_header = f"Basic {encoded}"
+        self._auth_bytes = b'Basic ' + base64.b64encode(credentials.encode('utf-8'))
+        self.auth_header = self._auth_bytes.decode('ascii')
+        
+        # Request pieces that never change for this client; aiohttp's interned
+        # header names skip per-request key normalisation
+        self._headers = CIMultiDictProxy(CIMultiDict({
+            hdrs.AUTHORIZATION: self.auth_header,
+            hdrs.CONTENT_TYPE: 'application/json; charset=utf-8',
+            hdrs.ACCEPT: 'application/json'
+        }))
+        self._url_tpl = f"{self.base_url}/api/datasources/{{}}/execute?format={{}}"
         
         # HTTP client
         self.session: Optional[aiohttp.ClientSession] = None
+        self._sem = asyncio.Semaphore(16)  # In-flight datasource requests
+        
+        # Results keyed by (datasource id, format, sorted inputs) -> (fetched at, data)
+        self.cache_ttl_s = cache_ttl_s
+        self._cache: Dict[Tuple[int, int, bytes], Tuple[float, Dict[str, Any]]] = {}
         
         logger.info(
             "datasource_api_initialized",
@@ -200,9 +430,24 @@ class DataSourceAPIClient:
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession()
+        self.session = self._new_session()
         return self
     
+    @staticmethod
+    def _new_session() -> aiohttp.ClientSession:
+        """Create a keep-alive session for datasource calls"""
+        connector = aiohttp.TCPConnector(
+            limit=32,
+            limit_per_host=16,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+            enable_cleanup_closed=True
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=60)
+        )
+    
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit"""
         if self.session:
@@ -216,18 +461,16 @@ class DataSourceAPIClient:
         format_type: int = 2
     ) -> Dict[str, Any]:
         """Execute a data source and return results"""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-        
-        url = f"{self.base_url}/api/datasources/{datasource_id}/execute?format={format_type}"
+        cache_key = self._cache_key(datasource_id, inputs, format_type)
+        cached = self._cached(cache_key)
+        if cached is not None:
+            return cached
         
-        headers = {
-            'Authorization': self.auth_header,
-            'Content-Type': 'application/json; charset=utf-8',
-            'Accept': 'application/json'
-        }
+        if not self.session:
+            self.session = self._new_session()
         
-        body = inputs or {}
+        url = self._url_tpl.format(datasource_id, format_type)
+        payload = self._encode_inputs(inputs)
         
         logger.debug(
             "datasource_api_request",
@@ -236,25 +479,114 @@ class DataSourceAPIClient:
         )
         
         try:
-            async with self.session.post(url, headers=headers, json=body) as response:
-                handle_api_response(response, "DataSource API")
-                
+            async with self._sem, self.session.post(url, headers=self._headers, data=payload) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = _decode_datasource(await response.read())
+                    if self.cache_ttl_s > 0:
+                        self._cache[cache_key] = (time.monotonic(), data)
                     return data
-                else:
-                    error = await response.text()
-                    logger.error(
-                        "datasource_api_error",
-                        datasource_id=datasource_id,
-                        status=response.status,
-                        error=error[:200]
-                    )
-                    raise PlexAPIError(f"DataSource {datasource_id} failed: {error[:200]}")
+                
+                handle_api_response(response, "DataSource API")
+                error = await response.text()
+                logger.error(
+                    "datasource_api_error",
+                    datasource_id=datasource_id,
+                    status=response.status,
+                    error=error[:200]
+                )
+                raise PlexAPIError(f"DataSource {datasource_id} failed: {error[:200]}")
                     
         except Exception as e:
             logger.error("datasource_execution_error", error=str(e))
             raise
+    
+    async def execute_datasource_stream(
+        self,
+        datasource_id: int,
+        inputs: Optional[Dict[str, Any]] = None,
+        format_type: int = 2
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Execute a data source and yield its rows as they are decoded
+        
+        Rows are parsed incrementally with ijson, so the response body is never
+        buffered whole. Without ijson, or when the streamed request fails before
+        any row is yielded, this falls back to execute_datasource so its retries
+        apply. Cached results are served from the cache, and a completed stream
+        is cached like a buffered call.
+        """
+        cache_key = self._cache_key(datasource_id, inputs, format_type)
+        cached = self._cached(cache_key)
+        if cached is None and ijson is None:
+            cached = await self.execute_datasource(datasource_id, inputs, format_type)
+        if cached is not None:
+            for row in cached.get('rows', ()):
+                yield row
+            return
+        
+        if not self.session:
+            self.session = self._new_session()
+        
+        url = self._url_tpl.format(datasource_id, format_type)
+        payload = self._encode_inputs(inputs)
+        
+        logger.debug(
+            "datasource_api_stream_request",
+            datasource_id=datasource_id,
+            inputs=inputs
+        )
+        
+        rows: List[Dict[str, Any]] = []
+        try:
+            async with self._sem, self.session.post(url, headers=self._headers, data=payload) as response:
+                if response.status != 200:
+                    handle_api_response(response, "DataSource API")
+                    error = await response.text()
+                    raise PlexAPIError(f"DataSource {datasource_id} failed: {error[:200]}")
+                
+                async for row in ijson.items_async(response.content, 'rows.item', use_float=True):
+                    rows.append(row)
+                    yield row
+        except Exception as e:
+            if rows:
+                raise
+            logger.warning("datasource_stream_failed", datasource_id=datasource_id, error=str(e))
+            data = await self.execute_datasource(datasource_id, inputs, format_type)
+            for row in data.get('rows', ()):
+                yield row
+            return
+        
+        if self.cache_ttl_s > 0:
+            self._cache[cache_key] = (time.monotonic(), {'rows': rows})
+    
+    @staticmethod
+    def _cache_key(
+        datasource_id: int,
+        inputs: Optional[Dict[str, Any]],
+        format_type: int
+    ) -> Tuple[int, int, bytes]:
+        """Cache key for a datasource call, independent of input order"""
+        return (datasource_id, format_type, orjson.dumps(inputs or {}, option=orjson.OPT_SORT_KEYS))
+    
+    def _cached(self, cache_key: Tuple[int, int, bytes]) -> Optional[Dict[str, Any]]:
+        """Cached result for `cache_key` if still within the TTL"""
+        cached = self._cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < self.cache_ttl_s:
+            logger.debug("datasource_cache_hit", datasource_id=cache_key[0])
+            return cached[1]
+        return None
+    
+    @staticmethod
+    def _encode_inputs(inputs: Optional[Dict[str, Any]]) -> bytes:
+        """Request body; orjson writes date/datetime inputs as ISO-8601 directly"""
+        return orjson.dumps(inputs or {}, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+    
+    def invalidate(self, datasource_id: Optional[int] = None) -> None:
+        """Drop cached results for one datasource, or all of them"""
+        if datasource_id is None:
+            self._cache.clear()
+        else:
+            for key in [key for key in self._cache if key[0] == datasource_id]:
+                del self._cache[key]
 
 
 class EnhancedQualityExtractor(BaseExtractor):
@@ -266,21 +598,30 @@ class EnhancedQualityExtractor(BaseExtractor):
         super().__init__(config, 'quality')
         
         self.config: Final[QualityExtractorConfig] = config
-        self.processed_ncrs: set[NCRId] = set()
-        self.processed_inspections: set[InspectionId] = set()
+        # LRUs of processed ids, bounded by PROCESSED_SET_LIMIT
+        self.processed_ncrs: OrderedDict[NCRId, None] = OrderedDict()
+        self.processed_inspections: OrderedDict[InspectionId, None] = OrderedDict()
+        self._pending_datapoints: List[Datapoints] = []  # Flushed once per extract()
+        
+        # Facility-scoped ids are invariant for the run; resolve them once
+        self._ext_id_cache: Dict[str, str] = {}
+        self._spec_root_xid: Final[str] = self._xid('specifications_root')
+        self._checksheet_root_xid: Final[str] = self._xid('checksheets_root')
+        self._quality_ds_id = self.get_dataset_id('quality')
+        self._base_tags: Final[Dict[str, str]] = self.naming.get_metadata_tags()
         
         # Initialize DataSource API client if configured
         self.ds_client: Optional[DataSourceAPIClient] = None
         if config.use_datasource_api and config.datasource_username and config.datasource_password:
-            import os
             pcn_code = os.getenv('PLEX_PCN_CODE', 'ra-process')
-            use_test = os.getenv('PLEX_USE_TEST', 'false').lower() == 'true'
+            use_test = _env_flag('PLEX_USE_TEST', False)
             
             self.ds_client = DataSourceAPIClient(
                 username=config.datasource_username,
                 password=config.datasource_password,
                 pcn_code=pcn_code,
-                use_test=use_test
+                use_test=use_test,
+                cache_ttl_s=config.datasource_cache_ttl
             )
         
         self.logger.info(
@@ -293,13 +634,48 @@ class EnhancedQualityExtractor(BaseExtractor):
             lookback_days=config.lookback_days
         )
     
+    def _xid(self, kind: str) -> str:
+        """Facility-level asset external id for `kind`, formatted once per run"""
+        xid = self._ext_id_cache.get(kind)
+        if xid is None:
+            xid = self._ext_id_cache[kind] = self.create_asset_external_id(kind, self.config.facility.pcn)
+        return xid
+    
+    @staticmethod
+    def _is_processed(record_id: str, processed: OrderedDict[str, None]) -> bool:
+        """Whether the record id was already processed, refreshing its LRU position"""
+        if record_id in processed:
+            processed.move_to_end(record_id)
+            return True
+        return False
+    
+    @staticmethod
+    def _mark_processed(processed: OrderedDict[str, None], record_ids: Iterable[str]) -> None:
+        """Record Plex record ids, evicting the least recently seen past PROCESSED_SET_LIMIT"""
+        for record_id in record_ids:
+            processed[record_id] = None
+            processed.move_to_end(record_id)
+        while len(processed) > PROCESSED_SET_LIMIT:
+            processed.popitem(last=False)
+    
+    async def _parse_rows(self, cls: type, rows: List[Dict[str, Any]]) -> List[Any]:
+        """Parse rows with `cls._from_row`, off the event loop for large responses
+        
+        The rows are already decoded dicts, so parsing is a few lookups per
+        row; shipping them to worker processes would cost more than it saves.
+        """
+        if len(rows) <= THREAD_PARSE_MIN_ROWS:
+            return _parse_batch(cls, rows)
+        return await asyncio.to_thread(_parse_batch, cls, rows)
+    
     def get_required_datasets(self) -> List[str]:
         """Quality requires quality and master datasets"""
         return ['quality', 'master']
     
     async def extract(self) -> ExtractionResult:
         """Main extraction with concurrent operations"""
-        start_time = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        now_utc = datetime.now(timezone.utc)
         result = ExtractionResult(
             success=True,
             items_processed=0,
@@ -320,7 +696,7 @@ class EnhancedQualityExtractor(BaseExtractor):
                             tasks.append(tg.create_task(self._extract_specifications()))
                         
                         if self.config.extract_checksheets:
-                            tasks.append(tg.create_task(self._extract_checksheets()))
+                            tasks.append(tg.create_task(self._extract_checksheets(now_utc)))
                         
                         if self.config.extract_ncrs:
                             tasks.append(tg.create_task(self._extract_ncrs()))
@@ -337,13 +713,16 @@ class EnhancedQualityExtractor(BaseExtractor):
                         tasks.append(tg.create_task(self._extract_ncrs_api()))
             
             # Aggregate results
+            # TaskGroup has already awaited every task, so read results directly
             for task in tasks:
-                task_result = await task
+                task_result = task.result()
                 result.items_processed += task_result.items_processed
                 if not task_result.success:
                     result.success = False
                     result.errors.extend(task_result.errors)
             
+            await self._flush_datapoints()
+            
             self.logger.info(
                 "quality_extraction_completed",
                 items_processed=result.items_processed,
@@ -355,7 +734,7 @@ class EnhancedQualityExtractor(BaseExtractor):
             result.errors.append(str(e))
             self.logger.error("quality_extraction_failed", error=str(e), exc_info=True)
         
-        result.duration_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+        result.duration_ms = (time.perf_counter() - start) * 1000
         return result
     
     async def _ensure_quality_hierarchy(self) -> None:
@@ -363,37 +742,37 @@ class EnhancedQualityExtractor(BaseExtractor):
         try:
             root_assets = [
                 Asset(
-                    external_id=self.create_asset_external_id('quality_root', self.config.facility.pcn),
+                    external_id=self._xid('quality_root'),
                     name=f"{self.config.facility.facility_name} - Quality",
-                    parent_external_id=self.create_asset_external_id('facility', self.config.facility.pcn),
+                    parent_external_id=self._xid('facility'),
                     description="Root asset for quality data",
                     metadata={
-                        **self.naming.get_metadata_tags(),
+                        **self._base_tags,
                         'asset_type': 'quality_root'
                     },
-                    data_set_id=self.get_dataset_id('quality')
+                    data_set_id=self._quality_ds_id
                 ),
                 Asset(
-                    external_id=self.create_asset_external_id('specifications_root', self.config.facility.pcn),
+                    external_id=self._xid('specifications_root'),
                     name=f"{self.config.facility.facility_name} - Specifications",
-                    parent_external_id=self.create_asset_external_id('quality_root', self.config.facility.pcn),
+                    parent_external_id=self._xid('quality_root'),
                     description="Quality specifications library",
                     metadata={
-                        **self.naming.get_metadata_tags(),
+                        **self._base_tags,
                         'asset_type': 'specifications_root'
                     },
-                    data_set_id=self.get_dataset_id('quality')
+                    data_set_id=self._quality_ds_id
                 ),
                 Asset(
-                    external_id=self.create_asset_external_id('checksheets_root', self.config.facility.pcn),
+                    external_id=self._xid('checksheets_root'),
                     name=f"{self.config.facility.facility_name} - Checksheets",
-                    parent_external_id=self.create_asset_external_id('quality_root', self.config.facility.pcn),
+                    parent_external_id=self._xid('quality_root'),
                     description="Quality checksheets library",
                     metadata={
-                        **self.naming.get_metadata_tags(),
+                        **self._base_tags,
                         'asset_type': 'checksheets_root'
                     },
-                    data_set_id=self.get_dataset_id('quality')
+                    data_set_id=self._quality_ds_id
                 )
             ]
             
@@ -422,22 +801,16 @@ class EnhancedQualityExtractor(BaseExtractor):
                 'Active': 1     # 1 for active specs
             }
             
-            # Execute datasource
-            data = await self.ds_client.execute_datasource(SPEC_DATASOURCE_ID, inputs)
-            
-            specifications = []
-            if 'rows' in data:
-                for row in data['rows']:
-                    spec = self._parse_specification(row)
-                    if spec:
-                        specifications.append(spec)
-            
-            # Create specification assets
+            # Execute datasource, building assets as rows arrive
+            specifications_found = 0
             assets = []
-            for spec in specifications:
-                asset = self._create_specification_asset(spec)
-                if asset:
-                    assets.append(asset)
+            async for row in self.ds_client.execute_datasource_stream(SPEC_DATASOURCE_ID, inputs):
+                spec = self._parse_specification(row)
+                if spec:
+                    specifications_found += 1
+                    asset = self._create_specification_asset(spec)
+                    if asset:
+                        assets.append(asset)
             
             # Create in CDF
             if assets:
@@ -449,7 +822,7 @@ class EnhancedQualityExtractor(BaseExtractor):
             
             self.logger.info(
                 "specifications_extracted",
-                specifications_found=len(specifications),
+                specifications_found=specifications_found,
                 assets_created=result.items_processed
             )
             
@@ -461,7 +834,7 @@ class EnhancedQualityExtractor(BaseExtractor):
         return result
     
     @with_retry(max_attempts=3)
-    async def _extract_checksheets(self) -> ExtractionResult:
+    async def _extract_checksheets(self, now_utc: Optional[datetime] = None) -> ExtractionResult:
         """Extract quality checksheets using DataSource API"""
         result = ExtractionResult(success=True, items_processed=0, duration_ms=0)
         
@@ -473,31 +846,24 @@ class EnhancedQualityExtractor(BaseExtractor):
             CHECKSHEET_DATASOURCE_ID = 4142  # Checksheets_Get
             
             # Most parameters are optional, use minimal set
-            end_date = datetime.now(timezone.utc)
-            start_date = end_date - timedelta(days=7)  # Last 7 days
+            start_day, end_day = _date_window((now_utc or datetime.now(timezone.utc)).date(), 7)  # Last 7 days
             
             inputs = {
-                'Date_Begin': start_date.strftime('%Y-%m-%d'),
-                'Date_End': end_date.strftime('%Y-%m-%d'),
+                'Date_Begin': start_day,
+                'Date_End': end_day,
                 'Max_Records': 100  # Limit results
             }
             
-            # Execute datasource
-            data = await self.ds_client.execute_datasource(CHECKSHEET_DATASOURCE_ID, inputs)
-            
-            checksheets = []
-            if 'rows' in data:
-                for row in data['rows']:
-                    checksheet = self._parse_checksheet(row)
-                    if checksheet:
-                        checksheets.append(checksheet)
-            
-            # Create checksheet assets
+            # Execute datasource, building assets as rows arrive
+            checksheets_found = 0
             assets = []
-            for checksheet in checksheets:
-                asset = self._create_checksheet_asset(checksheet)
-                if asset:
-                    assets.append(asset)
+            async for row in self.ds_client.execute_datasource_stream(CHECKSHEET_DATASOURCE_ID, inputs):
+                checksheet = self._parse_checksheet(row)
+                if checksheet:
+                    checksheets_found += 1
+                    asset = self._create_checksheet_asset(checksheet)
+                    if asset:
+                        assets.append(asset)
             
             # Create in CDF
             if assets:
@@ -509,7 +875,7 @@ class EnhancedQualityExtractor(BaseExtractor):
             
             self.logger.info(
                 "checksheets_extracted",
-                checksheets_found=len(checksheets),
+                checksheets_found=checksheets_found,
                 assets_created=result.items_processed
             )
             
@@ -571,7 +937,10 @@ class EnhancedQualityExtractor(BaseExtractor):
                 result.items_processed = len(created)
                 
                 # Update processed set
-                self.processed_ncrs.update([e.external_id for e in events if e])
+                self._mark_processed(
+                    self.processed_ncrs,
+                    (e.metadata['ncr_id'] for e in events)
+                )
             
             # Create NCR metrics time series
             await self._create_ncr_metrics(ncrs)
@@ -602,12 +971,7 @@ class EnhancedQualityExtractor(BaseExtractor):
                 INSPECTION_DATASOURCE_ID = 4760  # Inspection_Modes_Get
                 
                 data = await self.ds_client.execute_datasource(INSPECTION_DATASOURCE_ID)
-                
-                if 'rows' in data:
-                    for row in data['rows']:
-                        inspection = self._parse_inspection(row)
-                        if inspection:
-                            inspections.append(inspection)
+                inspections = await self._parse_rows(InspectionResult, data.get('rows', []))
             
             # Create inspection events
             events = []
@@ -625,7 +989,10 @@ class EnhancedQualityExtractor(BaseExtractor):
                 result.items_processed = len(created)
                 
                 # Update processed set
-                self.processed_inspections.update([e.external_id for e in events if e])
+                self._mark_processed(
+                    self.processed_inspections,
+                    (e.metadata['inspection_id'] for e in events)
+                )
             
             self.logger.info(
                 "inspections_extracted",
@@ -735,150 +1102,43 @@ class EnhancedQualityExtractor(BaseExtractor):
     
     def _parse_specification(self, data: Dict[str, Any]) -> Optional[Specification]:
         """Parse specification from API response"""
-        spec_id = data.get('id') or data.get('specificationId')
-        if not spec_id:
-            return None
-        
-        return Specification(
-            id=str(spec_id),
-            name=data.get('name', ''),
-            part_id=data.get('partId'),
-            specification_type=data.get('type', 'dimensional'),
-            nominal_value=data.get('nominalValue'),
-            upper_limit=data.get('upperLimit'),
-            lower_limit=data.get('lowerLimit'),
-            unit_of_measure=data.get('unitOfMeasure'),
-            active=data.get('active', True),
-            metadata=data
-        )
+        return Specification._from_row(data)
     
     def _parse_checksheet(self, data: Dict[str, Any]) -> Optional[Checksheet]:
         """Parse checksheet from API response"""
-        cs_id = data.get('id') or data.get('checksheetId')
-        if not cs_id:
-            return None
-        
-        return Checksheet(
-            id=str(cs_id),
-            name=data.get('name', ''),
-            part_id=data.get('partId'),
-            operation_id=data.get('operationId'),
-            frequency=data.get('frequency'),
-            check_items=data.get('checkItems', []),
-            active=data.get('active', True),
-            metadata=data
-        )
+        return Checksheet._from_row(data)
     
     def _parse_ncr(self, data: Dict[str, Any]) -> Optional[NCReport]:
         """Parse NCR from API response"""
-        ncr_id = data.get('id') or data.get('ncrId')
-        if not ncr_id:
-            return None
-        
-        # Parse status
-        status_str = data.get('status', 'open').lower()
-        status = NCRStatus.OPEN
-        if 'closed' in status_str:
-            status = NCRStatus.CLOSED
-        elif 'approved' in status_str:
-            status = NCRStatus.APPROVED
-        elif 'rejected' in status_str:
-            status = NCRStatus.REJECTED
-        elif 'review' in status_str:
-            status = NCRStatus.IN_REVIEW
-        
-        # Parse dates
-        created_date = datetime.now(timezone.utc)
-        if data.get('createdDate'):
-            try:
-                created_date = datetime.fromisoformat(data['createdDate'].replace('Z', '+00:00'))
-            except:
-                pass
-        
-        closed_date = None
-        if data.get('closedDate'):
-            try:
-                closed_date = datetime.fromisoformat(data['closedDate'].replace('Z', '+00:00'))
-            except:
-                pass
-        
-        return NCReport(
-            id=str(ncr_id),
-            number=data.get('ncrNumber', str(ncr_id)),
-            status=status,
-            part_id=data.get('partId'),
-            part_name=data.get('partName'),
-            quantity_affected=int(data.get('quantityAffected', 0)),
-            defect_description=data.get('defectDescription'),
-            root_cause=data.get('rootCause'),
-            corrective_action=data.get('correctiveAction'),
-            created_date=created_date,
-            closed_date=closed_date,
-            operator=data.get('operator'),
-            workcenter_id=data.get('workcenterId'),
-            severity=data.get('severity'),
-            cost_impact=data.get('costImpact'),
-            metadata=data
-        )
+        return NCReport._from_row(data)
     
     def _parse_inspection(self, data: Dict[str, Any]) -> Optional[InspectionResult]:
         """Parse inspection from API response"""
-        insp_id = data.get('id') or data.get('inspectionId')
-        if not insp_id:
-            return None
-        
-        # Parse date
-        inspection_date = datetime.now(timezone.utc)
-        if data.get('inspectionDate'):
-            try:
-                inspection_date = datetime.fromisoformat(data['inspectionDate'].replace('Z', '+00:00'))
-            except:
-                pass
-        
-        return InspectionResult(
-            id=str(insp_id),
-            checksheet_id=data.get('checksheetId'),
-            part_id=data.get('partId'),
-            serial_number=data.get('serialNumber'),
-            result=data.get('result', 'unknown'),
-            measurements=data.get('measurements', []),
-            inspector=data.get('inspector'),
-            inspection_date=inspection_date,
-            defects_found=data.get('defectsFound', []),
-            metadata=data
-        )
+        return InspectionResult._from_row(data)
     
     def _parse_problem_report(self, data: Dict[str, Any]) -> Optional[ProblemReport]:
         """Parse problem report from API response"""
-        pr_id = data.get('id') or data.get('problemReportId')
+        g = data.get
+        pr_id = g('id') or g('problemReportId')
         if not pr_id:
             return None
         
-        # Parse dates
-        reported_date = datetime.now(timezone.utc)
-        if data.get('reportedDate'):
-            try:
-                reported_date = datetime.fromisoformat(data['reportedDate'].replace('Z', '+00:00'))
-            except:
-                pass
-        
-        resolved_date = None
-        if data.get('resolvedDate'):
-            try:
-                resolved_date = datetime.fromisoformat(data['resolvedDate'].replace('Z', '+00:00'))
-            except:
-                pass
+        # Parse dates, falling back to now only when the row has none
+        reported_date = _parse_iso(g('reportedDate')) or datetime.now(timezone.utc)
+        
+        resolved_date = _parse_iso(g('resolvedDate'))
         
         return ProblemReport(
             id=str(pr_id),
-            title=data.get('title', ''),
-            description=data.get('description', ''),
-            status=data.get('status', 'open'),
-            priority=data.get('priority', 'medium'),
+            title=g('title', ''),
+            description=g('description', ''),
+            status=g('status', 'open'),
+            priority=g('priority', 'medium'),
             reported_date=reported_date,
-            reporter=data.get('reporter'),
-            assigned_to=data.get('assignedTo'),
-            resolution=data.get('resolution'),
+            created_ms=int(reported_date.timestamp() * 1000),
+            reporter=g('reporter'),
+            assigned_to=g('assignedTo'),
+            resolution=g('resolution'),
             resolved_date=resolved_date,
             metadata=data
         )
@@ -888,29 +1148,29 @@ class EnhancedQualityExtractor(BaseExtractor):
         external_id = self.create_asset_external_id('specification', spec.id)
         
         metadata = {
-            **self.naming.get_metadata_tags(),
+            **self._base_tags,
             'specification_id': spec.id,
             'specification_type': spec.specification_type,
-            'active': str(spec.active)
+            'active': f"{spec.active}"
         }
         
         # Add limits
         if spec.nominal_value is not None:
-            metadata['nominal_value'] = str(spec.nominal_value)
+            metadata['nominal_value'] = f"{spec.nominal_value}"
         if spec.upper_limit is not None:
-            metadata['upper_limit'] = str(spec.upper_limit)
+            metadata['upper_limit'] = f"{spec.upper_limit}"
         if spec.lower_limit is not None:
-            metadata['lower_limit'] = str(spec.lower_limit)
+            metadata['lower_limit'] = f"{spec.lower_limit}"
         if spec.unit_of_measure:
             metadata['unit_of_measure'] = spec.unit_of_measure
         
         return Asset(
             external_id=external_id,
             name=spec.name,
-            parent_external_id=self.create_asset_external_id('specifications_root', self.config.facility.pcn),
+            parent_external_id=self._spec_root_xid,
             description=f"Quality specification: {spec.name}",
             metadata=metadata,
-            data_set_id=self.get_dataset_id('quality')
+            data_set_id=self._quality_ds_id
         )
     
     def _create_checksheet_asset(self, checksheet: Checksheet) -> Asset:
@@ -918,11 +1178,11 @@ class EnhancedQualityExtractor(BaseExtractor):
         external_id = self.create_asset_external_id('checksheet', checksheet.id)
         
         metadata = {
-            **self.naming.get_metadata_tags(),
+            **self._base_tags,
             'checksheet_id': checksheet.id,
             'frequency': checksheet.frequency or '',
-            'check_items_count': str(len(checksheet.check_items)),
-            'active': str(checksheet.active)
+            'check_items_count': f"{len(checksheet.check_items)}",
+            'active': f"{checksheet.active}"
         }
         
         if checksheet.part_id:
@@ -933,26 +1193,26 @@ class EnhancedQualityExtractor(BaseExtractor):
         return Asset(
             external_id=external_id,
             name=checksheet.name,
-            parent_external_id=self.create_asset_external_id('checksheets_root', self.config.facility.pcn),
+            parent_external_id=self._checksheet_root_xid,
             description=f"Quality checksheet: {checksheet.name}",
             metadata=metadata,
-            data_set_id=self.get_dataset_id('quality')
+            data_set_id=self._quality_ds_id
         )
     
     def _create_ncr_event(self, ncr: NCReport) -> Optional[Event]:
         """Create NCR event"""
-        external_id = self.create_event_external_id('ncr', ncr.id)
-        
-        # Skip if already processed
-        if external_id in self.processed_ncrs:
+        # Skip if already processed, before formatting any ids
+        if self._is_processed(ncr.id, self.processed_ncrs):
             return None
         
+        external_id = self.create_event_external_id('ncr', ncr.id)
+        
         metadata = {
-            **self.naming.get_metadata_tags(),
+            **self._base_tags,
             'ncr_id': ncr.id,
             'ncr_number': ncr.number,
             'status': ncr.status.value,
-            'quantity_affected': str(ncr.quantity_affected),
+            'quantity_affected': f"{ncr.quantity_affected}",
             'source': 'plex_quality'
         }
         
@@ -964,18 +1224,19 @@ class EnhancedQualityExtractor(BaseExtractor):
         if ncr.severity:
             metadata['severity'] = ncr.severity
         if ncr.cost_impact is not None:
-            metadata['cost_impact'] = str(ncr.cost_impact)
+            metadata['cost_impact'] = f"{ncr.cost_impact}"
         if ncr.operator:
             metadata['operator'] = ncr.operator
         if ncr.workcenter_id:
             metadata['workcenter_id'] = ncr.workcenter_id
         
-        # Build description
-        desc_parts = [f"NCR #{ncr.number}"]
-        if ncr.part_name:
-            desc_parts.append(ncr.part_name)
-        desc_parts.append(f"Qty: {ncr.quantity_affected}")
-        desc_parts.append(f"[{ncr.status.value}]")
+        # Build description; filter drops a missing part name
+        description = " | ".join(filter(None, (
+            f"NCR #{ncr.number}",
+            ncr.part_name,
+            f"Qty: {ncr.quantity_affected}",
+            f"[{ncr.status.value}]",
+        )))
         
         # Prepare asset links
         asset_external_ids = []
@@ -988,11 +1249,11 @@ class EnhancedQualityExtractor(BaseExtractor):
             external_id=external_id,
             type='quality_ncr',
             subtype=ncr.status.value,
-            description=" | ".join(desc_parts),
-            start_time=int(ncr.created_date.timestamp() * 1000),
+            description=description,
+            start_time=ncr.created_ms,
             end_time=int(ncr.closed_date.timestamp() * 1000) if ncr.closed_date else None,
             metadata=metadata,
-            data_set_id=self.get_dataset_id('quality')
+            data_set_id=self._quality_ds_id
         )
         
         if asset_external_ids:
@@ -1002,18 +1263,18 @@ class EnhancedQualityExtractor(BaseExtractor):
     
     def _create_inspection_event(self, inspection: InspectionResult) -> Optional[Event]:
         """Create inspection event"""
-        external_id = self.create_event_external_id('inspection', inspection.id)
-        
-        # Skip if already processed
-        if external_id in self.processed_inspections:
+        # Skip if already processed, before formatting any ids
+        if self._is_processed(inspection.id, self.processed_inspections):
             return None
         
+        external_id = self.create_event_external_id('inspection', inspection.id)
+        
         metadata = {
-            **self.naming.get_metadata_tags(),
+            **self._base_tags,
             'inspection_id': inspection.id,
             'result': inspection.result,
-            'measurements_count': str(len(inspection.measurements)),
-            'defects_count': str(len(inspection.defects_found)),
+            'measurements_count': f"{len(inspection.measurements)}",
+            'defects_count': f"{len(inspection.defects_found)}",
             'source': 'plex_quality'
         }
         
@@ -1027,12 +1288,12 @@ class EnhancedQualityExtractor(BaseExtractor):
         if inspection.inspector:
             metadata['inspector'] = inspection.inspector
         
-        # Build description
-        desc_parts = [f"Inspection: {inspection.result.upper()}"]
-        if inspection.serial_number:
-            desc_parts.append(f"S/N: {inspection.serial_number}")
-        if inspection.defects_found:
-            desc_parts.append(f"Defects: {len(inspection.defects_found)}")
+        # Build description; filter drops the absent optional parts
+        description = " | ".join(filter(None, (
+            f"Inspection: {inspection.result.upper()}",
+            inspection.serial_number and f"S/N: {inspection.serial_number}",
+            inspection.defects_found and f"Defects: {len(inspection.defects_found)}",
+        )))
         
         # Prepare asset links
         asset_external_ids = []
@@ -1045,10 +1306,10 @@ class EnhancedQualityExtractor(BaseExtractor):
             external_id=external_id,
             type='quality_inspection',
             subtype=inspection.result,
-            description=" | ".join(desc_parts),
-            start_time=int(inspection.inspection_date.timestamp() * 1000),
+            description=description,
+            start_time=inspection.created_ms,
             metadata=metadata,
-            data_set_id=self.get_dataset_id('quality')
+            data_set_id=self._quality_ds_id
         )
         
         if asset_external_ids:
@@ -1061,7 +1322,7 @@ class EnhancedQualityExtractor(BaseExtractor):
         external_id = self.create_event_external_id('problem_report', pr.id)
         
         metadata = {
-            **self.naming.get_metadata_tags(),
+            **self._base_tags,
             'problem_report_id': pr.id,
             'status': pr.status,
             'priority': pr.priority,
@@ -1077,28 +1338,31 @@ class EnhancedQualityExtractor(BaseExtractor):
             metadata['resolution'] = pr.resolution
         
         # Build description
-        desc_parts = [f"Problem: {pr.title}"]
-        desc_parts.append(f"Priority: {pr.priority.upper()}")
-        desc_parts.append(f"[{pr.status.upper()}]")
+        description = f"Problem: {pr.title} | Priority: {pr.priority.upper()} | [{pr.status.upper()}]"
         
         event = Event(
             external_id=external_id,
             type='quality_problem',
             subtype=pr.priority,
-            description=" | ".join(desc_parts),
-            start_time=int(pr.reported_date.timestamp() * 1000),
+            description=description,
+            start_time=pr.created_ms,
             end_time=int(pr.resolved_date.timestamp() * 1000) if pr.resolved_date else None,
             metadata=metadata,
-            data_set_id=self.get_dataset_id('quality')
+            data_set_id=self._quality_ds_id
         )
         
         return event
     
     async def _create_ncr_metrics(self, ncrs: List[NCReport]) -> None:
         """Create NCR metrics time series"""
+        # One clock read serves the daily bucket and the datapoint timestamp
+        now = datetime.now(timezone.utc)
+        today = now.date()
+        ts_ms = int(now.timestamp() * 1000)
+        
         try:
             # Create time series for NCR metrics
-            ts_external_id = self.create_asset_external_id('ncr_count', self.config.facility.pcn)
+            ts_external_id = self._xid('ncr_count')
             
             ts = TimeSeries(
                 external_id=ts_external_id,
@@ -1106,41 +1370,50 @@ class EnhancedQualityExtractor(BaseExtractor):
                 unit='count',
                 description="Daily count of NCRs",
                 metadata={
-                    **self.naming.get_metadata_tags(),
+                    **self._base_tags,
                     'metric_type': 'ncr_count',
                     'source': 'plex_quality'
                 },
-                data_set_id=self.get_dataset_id('quality')
+                data_set_id=self._quality_ds_id
             )
             
             # Create time series
             await self.async_cdf.create_time_series([ts])
             
-            # Calculate daily counts
-            today_count = sum(
-                1 for ncr in ncrs
-                if ncr.created_date.date() == datetime.now(timezone.utc).date()
-            )
+            # Calculate daily counts in one pass; other days are a lookup away
+            daily_counts = Counter(ncr.created_date.date() for ncr in ncrs)
+            today_count = daily_counts[today]
             
-            # Insert datapoint
+            # Queue datapoint for the end-of-cycle batch insert
             if today_count > 0:
-                timestamp = int(datetime.now(timezone.utc).timestamp() * 1000)
-                dp = Datapoints(
+                self._pending_datapoints.append(Datapoints(
                     external_id=ts_external_id,
-                    datapoints=[(timestamp, today_count)]
-                )
-                
-                loop = asyncio.get_event_loop()
-                await loop.run_in_executor(
-                    None,
-                    self.client.time_series.data.insert,
-                    dp
-                )
+                    datapoints=[(ts_ms, today_count)]
+                ))
                 
                 self.logger.info("ncr_metrics_created", count=today_count)
                 
         except Exception as e:
             self.logger.error("ncr_metrics_error", error=str(e))
+    
+    async def _flush_datapoints(self) -> None:
+        """Insert all datapoints queued during this cycle in one request"""
+        if not self._pending_datapoints:
+            return
+        
+        dp_list, self._pending_datapoints = self._pending_datapoints, []
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                None,
+                self.client.time_series.data.insert_multiple,
+                dp_list
+            )
+            
+            self.logger.info("datapoints_inserted", count=len(dp_list))
+            
+        except Exception as e:
+            self.logger.error("datapoints_insertion_error", error=str(e))
 
 
 async def main():
@@ -1164,7 +1437,7 @@ async def main():
         extractor = EnhancedQualityExtractor()
         
         # Run once or continuously
-        if os.getenv('RUN_CONTINUOUS', 'false').lower() == 'true':
+        if _env_flag('RUN_CONTINUOUS', False):
             while True:
                 await extractor.run_extraction_cycle()
                 await asyncio.sleep(extractor.config.extraction_interval)
@@ -44,6 +44,11 @@ except ImportError as e:
     print(f"Missing required dependency: {e}")
     sys.exit(1)
 
+try:
+    from numba import njit  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None
+
 # Type aliases
 InspectionId: TypeAlias = str
 NCRId: TypeAlias = str
@@ -119,8 +124,9 @@ class QualityInspection:
                 continue
 
             # Calculate statistics
-            mean = statistics.mean(values)
-            stdev = statistics.stdev(values) if len(values) > 1 else 0
+            arr = np.asarray(values, dtype=np.float64)
+            mean = float(arr.mean())
+            stdev = float(arr.std(ddof=1)) if arr.size > 1 else 0.0
 
             # Calculate Cp and Cpk
             if usl and lsl and stdev > 0:
@@ -136,7 +142,7 @@ class QualityInspection:
             lcl = mean - 3 * stdev
 
             # Check for out-of-control points
-            ooc_points = sum(1 for v in values if v < lcl or v > ucl)
+            ooc_points = int(((arr < lcl) | (arr > ucl)).sum())
 
             spc_results[characteristic] = {
                 'mean': round(mean, 4),
@@ -151,7 +157,12 @@ class QualityInspection:
 
         # Overall Cpk (minimum of all characteristics)
         if spc_results:
-            self.cpk = min(r['cpk'] for r in spc_results.values())
+            cpks = np.fromiter(
+                (r['cpk'] for r in spc_results.values()),
+                dtype=np.float64,
+                count=len(spc_results)
+            )
+            self.cpk = float(cpks.min())
 
         return spc_results
 
@@ -206,6 +217,57 @@ class NonConformanceReport:
 # SPC ENGINE
 # ============================================================================
 
+# Bits returned by _pattern_mask, in the order detect_patterns reports them
+_PATTERN_BITS: Tuple[Tuple[int, str], ...] = (
+    (1, "beyond_control_limits"),
+    (2, "seven_point_run"),
+    (4, "trending_up"),
+    (8, "trending_down"),
+)
+
+if njit is not None:
+    @njit(cache=True)
+    def _pattern_mask(arr):
+        """Control-chart rules over a float64 array of at least 7 points, as a bitmask"""
+        n = arr.shape[0]
+
+        # Welford mean and sample variance
+        mean = 0.0
+        m2 = 0.0
+        for i in range(n):
+            delta = arr[i] - mean
+            mean += delta / (i + 1)
+            m2 += delta * (arr[i] - mean)
+        stdev = math.sqrt(m2 / (n - 1))
+        ucl = mean + 3 * stdev
+        lcl = mean - 3 * stdev
+
+        # Limits, run and trend state in one fused scan
+        mask = 0
+        above = 0
+        rising = 0
+        falling = 0
+        for i in range(n):
+            x = arr[i]
+            if x > ucl or x < lcl:
+                mask |= 1
+            if i >= n - 7:
+                if x > mean:
+                    above += 1
+                if i > n - 7:
+                    if x > arr[i - 1]:
+                        rising += 1
+                    elif x < arr[i - 1]:
+                        falling += 1
+
+        if above == 7 or above == 0:
+            mask |= 2
+        if rising == 6:
+            mask |= 4
+        elif falling == 6:
+            mask |= 8
+        return mask
+
 class SPCEngine:
     """Statistical Process Control calculations"""
 
@@ -234,6 +296,10 @@ class SPCEngine:
         if len(data) < 7:
             return patterns
 
+        if njit is not None:
+            mask = _pattern_mask(np.asarray(data, dtype=np.float64))
+            return [name for bit, name in _PATTERN_BITS if mask & bit]
+
         # Rule 1: One point beyond 3-sigma
         mean = statistics.mean(data)
         stdev = statistics.stdev(data)
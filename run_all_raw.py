@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
 import os
 import time
@@ -22,7 +23,7 @@ from agents.raw_extractors import (
     ProductionRawExtractor,
     QualityRawExtractor,
 )
-from agents.raw_extractors.base import PlexRawExtractor, run_sync
+from agents.raw_extractors.base import PlexRawExtractor, run_extractor
 
 
 def _load_env() -> None:
@@ -34,23 +35,45 @@ def _load_env() -> None:
     if not env_path.exists():
         return
 
-    for line in env_path.read_text().splitlines():
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#") or "=" not in stripped:
-            continue
-        key, value = stripped.split("=", 1)
-        os.environ.setdefault(key.strip(), value.strip())
-
-
-def _available_extractors() -> Dict[str, Type[PlexRawExtractor]]:
-    return {
-        "jobs": JobsRawExtractor,
-        "production": ProductionRawExtractor,
-        "inventory": InventoryRawExtractor,
-        "performance": PerformanceRawExtractor,
-        "quality": QualityRawExtractor,
-        "master_data": MasterDataRawExtractor,
-    }
+    with env_path.open("r", encoding="utf-8") as env_file:
+        for line in env_file:
+            stripped = line.strip()
+            if not stripped or stripped[0] == "#":
+                continue
+            key, sep, value = stripped.partition("=")
+            if sep:
+                os.environ.setdefault(key.strip(), value.strip())
+
+
+_AVAILABLE_EXTRACTORS: Dict[str, Type[PlexRawExtractor]] = {
+    "jobs": JobsRawExtractor,
+    "production": ProductionRawExtractor,
+    "inventory": InventoryRawExtractor,
+    "performance": PerformanceRawExtractor,
+    "quality": QualityRawExtractor,
+    "master_data": MasterDataRawExtractor,
+}
+
+
+async def _run_one(name: str, sem: asyncio.Semaphore) -> None:
+    async with sem:
+        logging.info("Launching extractor '%s'", name)
+        extractor: PlexRawExtractor = _AVAILABLE_EXTRACTORS[name]()
+        try:
+            result = await run_extractor(extractor)
+            logging.info(
+                "Extractor '%s' finished: rows_written=%s last_timestamp=%s",
+                name,
+                result.get("rows_written"),
+                result.get("last_timestamp"),
+            )
+        except Exception as exc:  # pragma: no cover - operational logging
+            logging.exception("Extractor '%s' failed: %s", name, exc)
+
+
+async def _run_iteration(names: Sequence[str], concurrency: int) -> None:
+    sem = asyncio.Semaphore(max(concurrency, 1))
+    await asyncio.gather(*(_run_one(name, sem) for name in names))
 
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
@@ -58,7 +81,7 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     parser.add_argument(
         "--extractors",
         nargs="+",
-        choices=sorted(_available_extractors().keys()),
+        choices=sorted(_AVAILABLE_EXTRACTORS),
         help="Subset of extractors to run (defaults to all)",
     )
     parser.add_argument(
@@ -73,6 +96,12 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
         default=1,
         help="How many iterations to run (ignored when --interval=0)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=3,
+        help="Maximum extractors running at once (bounds load on Plex)",
+    )
     parser.add_argument(
         "--log-level",
         default="INFO",
@@ -91,7 +120,7 @@ def main(argv: Sequence[str] | None = None) -> None:
 
     _load_env()
 
-    registry = _available_extractors()
+    registry = _AVAILABLE_EXTRACTORS
     selected_names: List[str]
     if args.extractors:
         selected_names = list(dict.fromkeys(args.extractors))
@@ -108,21 +137,7 @@ def main(argv: Sequence[str] | None = None) -> None:
         iteration += 1
         logging.info("Starting iteration %s", iteration)
 
-        for name in selected_names:
-            extractor_cls = registry[name]
-            logging.info("Launching extractor '%s'", name)
-            extractor: PlexRawExtractor = extractor_cls()
-            try:
-                result = run_sync(extractor)
-                logging.info(
-                    "Extractor '%s' finished: rows_written=%s last_timestamp=%s",
-                    name,
-                    result.get("rows_written"),
-                    result.get("last_timestamp"),
-                )
-            except Exception as exc:  # pragma: no cover - operational logging
-                logging.exception("Extractor '%s' failed: %s", name, exc)
-                continue
+        asyncio.run(_run_iteration(selected_names, args.concurrency))
 
         if interval <= 0 or iteration >= max_iterations:
             break
@@ -14,11 +14,20 @@ import os
 import sys
 import asyncio
 import logging
+import shelve
+import time
+from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Set, Tuple
 
 from dotenv import load_dotenv
-from cognite.client.data_classes import Sequence, SequenceData, SequenceRow
+from cognite.client.data_classes import Sequence
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
 
 from base_extractor import BaseExtractor, BaseExtractorConfig
 from multi_facility_config import MultiTenantNamingConvention, FacilityConfig
@@ -33,6 +42,111 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Jobs whose Plex endpoints are fetched at once (each job makes up to 3 calls)
+MAX_CONCURRENT_JOBS = 16
+# CDF writer tasks, and how many built jobs may wait for them
+INSERT_WORKERS = 8
+INSERT_QUEUE_SIZE = 64
+# Jobs a writer drains per round, and the sequence data request limits
+INSERT_BATCH_JOBS = 50
+SEQUENCES_PER_INSERT = 100
+ROWS_PER_INSERT = 10_000
+# Seconds a part's routing is reused across jobs for the same part
+PART_OPERATIONS_TTL = 600
+# Seconds a sequence recorded on disk by an earlier run is still skipped
+SEQUENCE_STATE_TTL = 86400
+
+ROUTING_COLUMNS = [
+    {'externalId': 'operation_number', 'valueType': 'LONG'},
+    {'externalId': 'operation_code', 'valueType': 'STRING'},
+    {'externalId': 'operation_description', 'valueType': 'STRING'},
+    {'externalId': 'workcenter_id', 'valueType': 'STRING'},
+    {'externalId': 'setup_time_minutes', 'valueType': 'DOUBLE'},
+    {'externalId': 'cycle_time_seconds', 'valueType': 'DOUBLE'},
+    {'externalId': 'status', 'valueType': 'STRING'},
+    {'externalId': 'quantity_complete', 'valueType': 'LONG'},
+    {'externalId': 'quantity_remaining', 'valueType': 'LONG'},
+    {'externalId': 'actual_start', 'valueType': 'LONG'},
+    {'externalId': 'actual_end', 'valueType': 'LONG'}
+]
+
+PRODLOG_COLUMNS = [
+    {'externalId': 'timestamp', 'valueType': 'LONG'},
+    {'externalId': 'event_type', 'valueType': 'STRING'},
+    {'externalId': 'quantity', 'valueType': 'LONG'},
+    {'externalId': 'scrap_quantity', 'valueType': 'LONG'},
+    {'externalId': 'operator', 'valueType': 'STRING'},
+    {'externalId': 'workcenter_id', 'valueType': 'STRING'},
+    {'externalId': 'operation_number', 'valueType': 'LONG'},
+    {'externalId': 'reason_code', 'valueType': 'STRING'},
+    {'externalId': 'notes', 'valueType': 'STRING'}
+]
+
+
+# datetime.fromisoformat accepts a trailing 'Z' from Python 3.11
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+
+@lru_cache(maxsize=4096)
+def _iso_to_ms(value: str) -> Optional[int]:
+    """Epoch milliseconds for a Plex ISO-8601 timestamp, None if it does not parse
+    
+    Production entries often share boundary timestamps, so results are cached.
+    """
+    try:
+        if not _FROMISOFORMAT_ACCEPTS_Z and value.endswith('Z'):
+            value = value.removesuffix('Z') + '+00:00'
+        dt = datetime.fromisoformat(value)
+    except (ValueError, TypeError, AttributeError):
+        return None
+    return int(dt.timestamp() * 1000)
+
+
+def _iso_batch_to_ms(values: List[Optional[str]]) -> List[Optional[int]]:
+    """Epoch milliseconds for many timestamps, None where one is missing or does not parse
+    
+    When numpy is installed and every stamp is UTC ('Z'), the whole batch goes
+    through numpy's datetime64 parser in one call. Anything else (offsets,
+    naive local times, odd formats) keeps the per-value _iso_to_ms semantics.
+    """
+    if np is not None and values and all(not v or (isinstance(v, str) and v.endswith('Z')) for v in values):
+        try:
+            stamps = np.array([v[:-1] if v else '' for v in values], dtype='datetime64[ms]')
+        except (ValueError, TypeError):
+            pass
+        else:
+            nat = np.iinfo(np.int64).min
+            return [None if ms == nat else ms for ms in stamps.astype('int64').tolist()]
+    return [_iso_to_ms(v) if v else None for v in values]
+
+
+ROUTING_COLUMN_IDS = [column['externalId'] for column in ROUTING_COLUMNS]
+PRODLOG_COLUMN_IDS = [column['externalId'] for column in PRODLOG_COLUMNS]
+
+# (key, default) pairs read from each Plex record when building rows
+_ROUTING_FIELDS = (
+    ('operationCode', ''),
+    ('description', ''),
+    ('workcenterId', ''),
+    ('setupTime', 0),
+    ('cycleTime', 0)
+)
+_PRODLOG_FIELDS = (
+    ('quantity', 0),
+    ('scrapQuantity', 0),
+    ('operator', ''),
+    ('workcenterId', ''),
+    ('operationNumber', 0),
+    ('reasonCode', ''),
+    ('notes', '')
+)
+
+
+def _extract(record: Dict, fields: Tuple[Tuple[str, Any], ...]) -> List[Any]:
+    """Values of the given (key, default) fields from one record, in order"""
+    get = record.get
+    return [get(key, default) for key, default in fields]
+
 
 class SequenceConfig(BaseExtractorConfig):
     """Configuration for Sequence Extractor"""
@@ -50,8 +164,27 @@ class SequenceExtractor(BaseExtractor):
     def __init__(self, config: SequenceConfig):
         super().__init__(config, 'sequence')
         
-        # Track processed sequences
-        self.processed_sequences = set()
+        # Track processed sequences by (job_id, sequence type)
+        self.processed_sequences: Set[Tuple[str, str]] = set()
+        # State file key for each sequence built this run, by external id
+        self._state_keys: Dict[str, str] = {}
+        
+        # The same keys persisted with a last-built time, so a restarted
+        # extractor skips sequences an earlier run already wrote
+        state_dir = os.getenv('PLEX_STATE_DIR', 'state')
+        os.makedirs(state_dir, exist_ok=True)
+        self._sequence_state = shelve.open(os.path.join(state_dir, f"{config.facility.pcn}_sequences"))
+        
+        # Part routings by part id as (fetched_at, operations), and a lock per
+        # part so concurrent jobs for one part share a single request
+        self._part_ops_cache: Dict[str, Tuple[float, List[Dict]]] = {}
+        self._part_ops_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        
+        # Facility tags shared by every sequence's metadata
+        self._static_tags = dict(self.naming.get_metadata_tags())
+        
+        # Stamp shared by every sequence built in one extract() run
+        self._now_iso = datetime.now(timezone.utc).isoformat()
         
         logger.info(f"Sequence Extractor initialized for PCN {config.facility.pcn}")
     
@@ -59,17 +192,66 @@ class SequenceExtractor(BaseExtractor):
         """Return required dataset types for sequences"""
         return ['scheduling', 'production']  # Needs both datasets
     
-    async def fetch_part_operations(self, part_id: str) -> List[Dict]:
-        """Fetch part operations (routing) from Plex"""
-        endpoint = "/mdm/v1/part-operations"
-        params = {'partId': part_id}
+    def _is_processed(self, key: Tuple[str, str]) -> bool:
+        """Whether this run or a recent earlier one already built the sequence"""
+        if key in self.processed_sequences:
+            return True
+        built_at = self._sequence_state.get(':'.join(key))
+        if built_at is not None and time.time() - built_at < SEQUENCE_STATE_TTL:
+            self.processed_sequences.add(key)
+            return True
+        return False
+    
+    def _mark_processed(self, key: Tuple[str, str], external_id: str) -> None:
+        """Record a built sequence in memory; the state file waits for the CDF write"""
+        self.processed_sequences.add(key)
+        self._state_keys[external_id] = ':'.join(key)
+    
+    def _persist_written(self, external_ids: Set[str]) -> None:
+        """Record sequences whose create and row insert both succeeded on disk"""
+        now = time.time()
+        for external_id in external_ids:
+            state_key = self._state_keys.pop(external_id, None)
+            if state_key is not None:
+                self._sequence_state[state_key] = now
+    
+    async def close(self):
+        """Close the Plex session and the sequence state file"""
+        await super().close()
+        self._sequence_state.close()
+    
+    @staticmethod
+    def _rows(data: Any) -> List[Dict]:
+        """Rows from a fetch_plex_data result
         
-        try:
-            data = await self.fetch_plex_data(endpoint, params)
+        fetch_plex_data decodes the body with orjson and already unwraps a
+        top-level 'data' key, so the result is usually the row list itself.
+        """
+        if isinstance(data, list):
+            return data
+        if isinstance(data, dict):
             return data.get('data', [])
-        except Exception as e:
-            logger.error(f"Error fetching operations for part {part_id}: {e}")
-            return []
+        return []
+    
+    async def fetch_part_operations(self, part_id: str) -> List[Dict]:
+        """Fetch part operations (routing) from Plex, cached per part for PART_OPERATIONS_TTL"""
+        async with self._part_ops_locks[part_id]:
+            cached = self._part_ops_cache.get(part_id)
+            if cached and time.monotonic() - cached[0] < PART_OPERATIONS_TTL:
+                return cached[1]
+            
+            endpoint = "/mdm/v1/part-operations"
+            params = {'partId': part_id}
+            
+            try:
+                data = await self.fetch_plex_data(endpoint, params)
+            except Exception as e:
+                logger.error(f"Error fetching operations for part {part_id}: {e}")
+                return []
+            
+            operations = self._rows(data)
+            self._part_ops_cache[part_id] = (time.monotonic(), operations)
+            return operations
     
     async def fetch_job_operations(self, job_id: str) -> List[Dict]:
         """Fetch job-specific operation status"""
@@ -79,9 +261,10 @@ class SequenceExtractor(BaseExtractor):
         
         try:
             data = await self.fetch_plex_data(endpoint)
-            return data.get('data', [])
-        except:
+            return self._rows(data)
+        except Exception as e:
             # If job-specific operations not available, fall back to part operations
+            logger.debug(f"No job operations for job {job_id}, using part routing only: {e}")
             return []
     
     async def fetch_production_log(self, job_id: str) -> List[Dict]:
@@ -95,7 +278,7 @@ class SequenceExtractor(BaseExtractor):
         
         try:
             data = await self.fetch_plex_data(endpoint, params)
-            return data.get('data', [])
+            return self._rows(data)
         except Exception as e:
             logger.error(f"Error fetching production log for job {job_id}: {e}")
             return []
@@ -106,47 +289,32 @@ class SequenceExtractor(BaseExtractor):
         if not job_id or not operations:
             return None
         
-        external_id = self.create_sequence_external_id('routing', str(job_id))
-        
-        if external_id in self.processed_sequences:
+        key = (str(job_id), 'routing')
+        if self._is_processed(key):
             return None
         
-        # Define columns for routing sequence
-        columns = [
-            {'externalId': 'operation_number', 'valueType': 'LONG'},
-            {'externalId': 'operation_code', 'valueType': 'STRING'},
-            {'externalId': 'operation_description', 'valueType': 'STRING'},
-            {'externalId': 'workcenter_id', 'valueType': 'STRING'},
-            {'externalId': 'setup_time_minutes', 'valueType': 'DOUBLE'},
-            {'externalId': 'cycle_time_seconds', 'valueType': 'DOUBLE'},
-            {'externalId': 'status', 'valueType': 'STRING'},
-            {'externalId': 'quantity_complete', 'valueType': 'LONG'},
-            {'externalId': 'quantity_remaining', 'valueType': 'LONG'},
-            {'externalId': 'actual_start', 'valueType': 'LONG'},
-            {'externalId': 'actual_end', 'valueType': 'LONG'}
-        ]
-        
+        external_id = self.create_sequence_external_id('routing', key[0])
         sequence = Sequence(
             external_id=external_id,
             name=f"Job {job_id} Routing",
             description=f"Routing sequence for job {job_id} - Part {job.get('partNumber', '')}",
-            columns=columns,
+            columns=ROUTING_COLUMNS,
             data_set_id=self.get_dataset_id('scheduling'),
             metadata={
-                **self.naming.get_metadata_tags(),
+                **self._static_tags,
                 'job_id': str(job_id),
                 'part_number': job.get('partNumber', ''),
                 'sequence_type': 'job_routing',
-                'last_updated': datetime.now(timezone.utc).isoformat()
+                'last_updated': self._now_iso
             }
         )
         
-        self.processed_sequences.add(external_id)
+        self._mark_processed(key, external_id)
         return sequence
     
     def create_routing_rows(self, job: Dict, operations: List[Dict], 
-                           job_operations: List[Dict] = None) -> List[SequenceRow]:
-        """Create sequence rows for routing operations"""
+                           job_operations: List[Dict] = None) -> List[Dict]:
+        """Create sequence rows for routing operations, shaped as sequence data request rows"""
         rows = []
         job_id = job.get('jobId') or job.get('jobNumber') or job.get('id')
         
@@ -178,36 +346,28 @@ class SequenceExtractor(BaseExtractor):
             actual_start = None
             actual_end = None
             if job_op.get('actualStartDate'):
-                try:
-                    dt = datetime.fromisoformat(job_op['actualStartDate'].replace('Z', '+00:00'))
-                    actual_start = int(dt.timestamp() * 1000)
-                except:
-                    pass
+                actual_start = _iso_to_ms(job_op['actualStartDate'])
             
             if job_op.get('actualEndDate'):
-                try:
-                    dt = datetime.fromisoformat(job_op['actualEndDate'].replace('Z', '+00:00'))
-                    actual_end = int(dt.timestamp() * 1000)
-                except:
-                    pass
+                actual_end = _iso_to_ms(job_op['actualEndDate'])
             
-            row = SequenceRow(
-                rowNumber=op_num,
-                values=[
+            code, description, workcenter_id, setup_time, cycle_time = _extract(op, _ROUTING_FIELDS)
+            rows.append({
+                'rowNumber': op_num,
+                'values': [
                     op_num,  # operation_number
-                    op.get('operationCode', ''),  # operation_code
-                    op.get('description', ''),  # operation_description
-                    str(op.get('workcenterId', '')),  # workcenter_id
-                    float(op.get('setupTime', 0)),  # setup_time_minutes
-                    float(op.get('cycleTime', 0)),  # cycle_time_seconds
+                    code,  # operation_code
+                    description,  # operation_description
+                    str(workcenter_id),  # workcenter_id
+                    float(setup_time),  # setup_time_minutes
+                    float(cycle_time),  # cycle_time_seconds
                     status,  # status
                     job_op.get('quantityComplete', 0),  # quantity_complete
                     job_op.get('quantityRemaining', job.get('quantityOrdered', 0)),  # quantity_remaining
                     actual_start,  # actual_start
                     actual_end  # actual_end
                 ]
-            )
-            rows.append(row)
+            })
         
         return rows
     
@@ -216,84 +376,208 @@ class SequenceExtractor(BaseExtractor):
         if not entries:
             return None
         
-        external_id = self.create_sequence_external_id('prodlog', str(job_id))
-        
-        if external_id in self.processed_sequences:
+        key = (str(job_id), 'prodlog')
+        if self._is_processed(key):
             return None
         
-        # Define columns for production log
-        columns = [
-            {'externalId': 'timestamp', 'valueType': 'LONG'},
-            {'externalId': 'event_type', 'valueType': 'STRING'},
-            {'externalId': 'quantity', 'valueType': 'LONG'},
-            {'externalId': 'scrap_quantity', 'valueType': 'LONG'},
-            {'externalId': 'operator', 'valueType': 'STRING'},
-            {'externalId': 'workcenter_id', 'valueType': 'STRING'},
-            {'externalId': 'operation_number', 'valueType': 'LONG'},
-            {'externalId': 'reason_code', 'valueType': 'STRING'},
-            {'externalId': 'notes', 'valueType': 'STRING'}
-        ]
-        
+        external_id = self.create_sequence_external_id('prodlog', key[0])
         sequence = Sequence(
             external_id=external_id,
             name=f"Job {job_id} Production Log",
             description=f"Production log entries for job {job_id}",
-            columns=columns,
+            columns=PRODLOG_COLUMNS,
             data_set_id=self.get_dataset_id('production'),
             metadata={
-                **self.naming.get_metadata_tags(),
+                **self._static_tags,
                 'job_id': str(job_id),
                 'sequence_type': 'production_log',
-                'last_updated': datetime.now(timezone.utc).isoformat()
+                'last_updated': self._now_iso
             }
         )
         
-        self.processed_sequences.add(external_id)
+        self._mark_processed(key, external_id)
         return sequence
     
-    def create_production_log_rows(self, entries: List[Dict]) -> List[SequenceRow]:
-        """Create sequence rows for production log entries"""
+    def create_production_log_rows(self, entries: List[Dict]) -> List[Dict]:
+        """Create sequence rows for production log entries, shaped as sequence data request rows"""
         rows = []
         
-        for i, entry in enumerate(entries):
-            # Parse timestamp
-            timestamp = None
-            if entry.get('timestamp') or entry.get('createdAt'):
-                try:
-                    dt_str = entry.get('timestamp') or entry.get('createdAt')
-                    dt = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
-                    timestamp = int(dt.timestamp() * 1000)
-                except:
-                    pass
+        # Parse every entry's timestamp in one pass
+        timestamps = _iso_batch_to_ms([entry.get('timestamp') or entry.get('createdAt') for entry in entries])
+        
+        for i, (entry, timestamp) in enumerate(zip(entries, timestamps)):
+            quantity, scrap, operator, workcenter_id, op_num, reason_code, notes = _extract(entry, _PRODLOG_FIELDS)
             
             # Determine event type
             event_type = 'produce'
-            if entry.get('scrapQuantity', 0) > 0:
+            if scrap > 0:
                 event_type = 'scrap'
             elif entry.get('eventType'):
                 event_type = entry['eventType'].lower()
             
-            row = SequenceRow(
-                rowNumber=i,
-                values=[
+            rows.append({
+                'rowNumber': i,
+                'values': [
                     timestamp,  # timestamp
                     event_type,  # event_type
-                    entry.get('quantity', 0),  # quantity
-                    entry.get('scrapQuantity', 0),  # scrap_quantity
-                    entry.get('operator', ''),  # operator
-                    str(entry.get('workcenterId', '')),  # workcenter_id
-                    entry.get('operationNumber', 0),  # operation_number
-                    entry.get('reasonCode', ''),  # reason_code
-                    entry.get('notes', '')  # notes
+                    quantity,  # quantity
+                    scrap,  # scrap_quantity
+                    operator,  # operator
+                    str(workcenter_id),  # workcenter_id
+                    op_num,  # operation_number
+                    reason_code,  # reason_code
+                    notes  # notes
                 ]
-            )
-            rows.append(row)
+            })
         
         return rows
     
+    async def _process_job(self, job: Dict, sem: asyncio.Semaphore) -> Tuple[List[Sequence], List[Dict]]:
+        """Fetch one job's routing and production log concurrently and build its sequences"""
+        sequences: List[Sequence] = []
+        sequence_data: List[Dict] = []
+        
+        job_id = job.get('jobId') or job.get('jobNumber') or job.get('id')
+        part_id = job.get('partId') or job.get('partNumber')
+        
+        if not job_id:
+            return sequences, sequence_data
+        
+        # Only fetch what feeds a sequence this run has not built yet
+        job_key = str(job_id)
+        need_routing = bool(part_id) and not self._is_processed((job_key, 'routing'))
+        need_prodlog = not self._is_processed((job_key, 'prodlog'))
+        if not (need_routing or need_prodlog):
+            return sequences, sequence_data
+        
+        async def no_rows() -> List[Dict]:
+            return []
+        
+        async with sem:
+            job_operations, production_entries, operations = await asyncio.gather(
+                self.fetch_job_operations(job_id) if need_routing else no_rows(),
+                self.fetch_production_log(job_id) if need_prodlog else no_rows(),
+                self.fetch_part_operations(part_id) if need_routing else no_rows()
+            )
+        
+        # Routing sequence for the part's operations
+        if operations:
+            sequence = self.create_routing_sequence(job, operations)
+            if sequence:
+                sequences.append(sequence)
+                
+                # Create rows for the sequence
+                rows = self.create_routing_rows(job, operations, job_operations)
+                if rows:
+                    sequence_data.append({
+                        'external_id': sequence.external_id,
+                        'columns': ROUTING_COLUMN_IDS,
+                        'rows': rows
+                    })
+        
+        # Production log sequence
+        if production_entries:
+            log_sequence = self.create_production_log_sequence(job_id, production_entries)
+            if log_sequence:
+                sequences.append(log_sequence)
+                
+                # Create rows for the production log
+                log_rows = self.create_production_log_rows(production_entries)
+                if log_rows:
+                    sequence_data.append({
+                        'external_id': log_sequence.external_id,
+                        'columns': PRODLOG_COLUMN_IDS,
+                        'rows': log_rows
+                    })
+        
+        return sequences, sequence_data
+    
+    async def _insert_worker(self, queue: asyncio.Queue) -> None:
+        """Write queued jobs to CDF until a None sentinel
+        
+        Each round takes every job already waiting (up to INSERT_BATCH_JOBS),
+        creates their sequences in one call and then inserts all their rows
+        in as few requests as the API limits allow.
+        """
+        stop = False
+        while not stop:
+            item = await queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while len(batch) < INSERT_BATCH_JOBS:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            
+            sequences = [sequence for job_sequences, _ in batch for sequence in job_sequences]
+            sequence_data = [data for _, job_data in batch for data in job_data]
+            created = await asyncio.to_thread(self._create_sequences, sequences)
+            failed = await asyncio.to_thread(self._insert_sequence_data, sequence_data)
+            self._persist_written(created - failed)
+    
+    def _create_sequences(self, sequences: List[Sequence]) -> Set[str]:
+        """Create sequences in CDF, tolerating ones that already exist
+        
+        Returns the external ids known to exist in CDF afterwards.
+        """
+        try:
+            created = self.cognite_client.sequences.create(sequences)
+            logger.info(f"Created {len(created)} sequences")
+            return {sequence.external_id for sequence in sequences}
+        except Exception as e:
+            # Batched creates fail as a whole; retry without the ones CDF reports as existing
+            duplicated = {item.get('externalId') for item in getattr(e, 'duplicated', None) or []}
+            remaining = [sequence for sequence in sequences if sequence.external_id not in duplicated]
+            if duplicated and 0 < len(remaining) < len(sequences):
+                logger.info(f"{len(duplicated)} sequences already exist, creating the other {len(remaining)}")
+                return duplicated | self._create_sequences(remaining)
+            elif "already exists" in str(e).lower() or duplicated:
+                logger.info("Some sequences already exist, updating data only")
+            else:
+                logger.error(f"Error creating sequences: {e}")
+            return duplicated
+    
+    def _insert_sequence_data(self, sequence_data: List[Dict]) -> Set[str]:
+        """Insert rows for many sequences, several sequences per request
+        
+        Returns the external ids whose rows could not be inserted.
+        """
+        failed: Set[str] = set()
+        for items in self._batch_sequence_items(sequence_data):
+            try:
+                self.cognite_client.post("/sequences/data", json={'items': items})
+                logger.debug(f"Inserted data for {len(items)} sequences")
+            except Exception as e:
+                external_ids = [item['externalId'] for item in items]
+                failed.update(external_ids)
+                logger.error(f"Error inserting data for sequences {', '.join(external_ids)}: {e}")
+        return failed
+    
+    @staticmethod
+    def _batch_sequence_items(sequence_data: List[Dict]):
+        """Yield sequence data request items within SEQUENCES_PER_INSERT and ROWS_PER_INSERT"""
+        items: List[Dict] = []
+        row_count = 0
+        for data in sequence_data:
+            rows = data['rows']
+            if items and (len(items) >= SEQUENCES_PER_INSERT or row_count + len(rows) > ROWS_PER_INSERT):
+                yield items
+                items, row_count = [], 0
+            items.append({'externalId': data['external_id'], 'columns': data['columns'], 'rows': rows})
+            row_count += len(rows)
+        if items:
+            yield items
+    
     async def extract(self):
         """Main extraction logic"""
         logger.info(f"Starting sequence extraction for PCN {self.config.facility.pcn}")
+        self._now_iso = datetime.now(timezone.utc).isoformat()
         
         # First fetch active jobs
         jobs_endpoint = "/production/v1/scheduling/jobs"
@@ -303,7 +587,7 @@ class SequenceExtractor(BaseExtractor):
         }
         
         jobs_data = await self.fetch_plex_data(jobs_endpoint, jobs_params)
-        jobs = jobs_data.get('data', [])
+        jobs = self._rows(jobs_data)
         
         if not jobs:
             logger.info("No active jobs found for sequence extraction")
@@ -311,74 +595,28 @@ class SequenceExtractor(BaseExtractor):
         
         logger.info(f"Processing sequences for {len(jobs)} active jobs")
         
-        sequences_to_create = []
-        sequence_data_to_insert = []
+        # Pipeline: jobs are fetched and built concurrently, and each built job is
+        # handed to CDF writer tasks while the remaining jobs are still fetching
+        sem = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=INSERT_QUEUE_SIZE)
+        workers = [asyncio.create_task(self._insert_worker(queue)) for _ in range(INSERT_WORKERS)]
         
-        for job in jobs:
-            job_id = job.get('jobId') or job.get('jobNumber') or job.get('id')
-            part_id = job.get('partId') or job.get('partNumber')
-            
-            if not job_id:
-                continue
-            
-            # Fetch routing operations for the part
-            if part_id:
-                operations = await self.fetch_part_operations(part_id)
-                if operations:
-                    # Try to get job-specific operation status
-                    job_operations = await self.fetch_job_operations(job_id)
-                    
-                    # Create routing sequence
-                    sequence = self.create_routing_sequence(job, operations)
-                    if sequence:
-                        sequences_to_create.append(sequence)
-                        
-                        # Create rows for the sequence
-                        rows = self.create_routing_rows(job, operations, job_operations)
-                        if rows:
-                            external_id = self.create_sequence_external_id('routing', str(job_id))
-                            sequence_data_to_insert.append({
-                                'external_id': external_id,
-                                'rows': rows
-                            })
-            
-            # Fetch and create production log sequence
-            production_entries = await self.fetch_production_log(job_id)
-            if production_entries:
-                log_sequence = self.create_production_log_sequence(job_id, production_entries)
-                if log_sequence:
-                    sequences_to_create.append(log_sequence)
-                    
-                    # Create rows for the production log
-                    log_rows = self.create_production_log_rows(production_entries)
-                    if log_rows:
-                        external_id = self.create_sequence_external_id('prodlog', str(job_id))
-                        sequence_data_to_insert.append({
-                            'external_id': external_id,
-                            'rows': log_rows
-                        })
-        
-        # Create sequences
-        if sequences_to_create:
-            try:
-                created = self.cognite_client.sequences.create(sequences_to_create)
-                logger.info(f"Created {len(created)} sequences")
-            except Exception as e:
-                if "already exists" in str(e).lower():
-                    logger.info("Some sequences already exist, updating data only")
-                else:
-                    logger.error(f"Error creating sequences: {e}")
+        async def produce(job: Dict) -> None:
+            sequences, sequence_data = await self._process_job(job, sem)
+            if sequences:
+                await queue.put((sequences, sequence_data))
         
-        # Insert sequence data
-        for data in sequence_data_to_insert:
-            try:
-                self.cognite_client.sequences.data.insert(
-                    external_id=data['external_id'],
-                    rows=data['rows']
-                )
-                logger.debug(f"Inserted data for sequence {data['external_id']}")
-            except Exception as e:
-                logger.error(f"Error inserting data for sequence {data['external_id']}: {e}")
+        try:
+            # A failing producer cancels its siblings, so none is left blocked on
+            # queue.put() once the workers have taken their sentinels and exited
+            async with asyncio.TaskGroup() as tg:
+                for job in jobs:
+                    tg.create_task(produce(job))
+        finally:
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+            self._sequence_state.sync()
         
         logger.info(f"Sequence extraction completed for PCN {self.config.facility.pcn}")
 
@@ -412,5 +650,18 @@ async def main():
         sys.exit(1)
 
 
+def _install_fast_event_loop() -> None:
+    """Use an io_uring (uringcore) or libuv (uvloop) event loop when one is installed"""
+    for module_name in ('uringcore', 'uvloop'):
+        try:
+            module = __import__(module_name)
+        except ImportError:
+            continue
+        asyncio.set_event_loop_policy(module.EventLoopPolicy())
+        logger.info(f"Using {module_name} event loop")
+        return
+
+
 if __name__ == "__main__":
+    _install_fast_event_loop()
     asyncio.run(main())
\ No newline at end of file
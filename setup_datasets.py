@@ -34,6 +34,98 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Creation stamp shared by every dataset's metadata, taken once at import
+_CREATED_DATE = datetime.now().isoformat()
+
+# All datasets to be created
+_DATASETS_CONFIG: List[Dict] = [
+    {
+        "external_id": "plex_production",
+        "name": "Plex Production Operations",
+        "description": "Real-time production operations data from Plex MES including workcenter status, "
+                      "production entries, OEE metrics, and throughput measurements",
+        "metadata": {
+            "source": "Plex MES",
+            "domain": "production",
+            "update_frequency": "1-5 minutes",
+            "data_types": "time_series,events,assets",
+            "owner": "Production Team",
+            "created_date": _CREATED_DATE
+        }
+    },
+    {
+        "external_id": "plex_scheduling",
+        "name": "Plex Job Scheduling",
+        "description": "Job scheduling and planning data including production orders, job operations, "
+                      "and schedule adherence metrics",
+        "metadata": {
+            "source": "Plex MES",
+            "domain": "scheduling",
+            "update_frequency": "10-15 minutes",
+            "data_types": "assets,events,time_series",
+            "owner": "Planning Team",
+            "created_date": _CREATED_DATE
+        }
+    },
+    {
+        "external_id": "plex_quality",
+        "name": "Plex Quality Management",
+        "description": "Quality management data including inspections, non-conformances, "
+                      "defect rates, and quality KPIs",
+        "metadata": {
+            "source": "Plex MES",
+            "domain": "quality",
+            "update_frequency": "on_event",
+            "data_types": "events,time_series,assets",
+            "owner": "Quality Team",
+            "created_date": _CREATED_DATE
+        }
+    },
+    {
+        "external_id": "plex_inventory",
+        "name": "Plex Inventory Management",
+        "description": "Inventory and material management data including stock levels, "
+                      "material movements, consumption rates, and warehouse operations",
+        "metadata": {
+            "source": "Plex MES",
+            "domain": "inventory",
+            "update_frequency": "15-30 minutes",
+            "data_types": "time_series,events,assets",
+            "owner": "Supply Chain Team",
+            "created_date": _CREATED_DATE
+        }
+    },
+    {
+        "external_id": "plex_maintenance",
+        "name": "Plex Maintenance Management",
+        "description": "Equipment maintenance data including work orders, preventive maintenance, "
+                      "equipment failures, and maintenance KPIs",
+        "metadata": {
+            "source": "Plex MES",
+            "domain": "maintenance",
+            "update_frequency": "on_event",
+            "data_types": "events,time_series,assets",
+            "owner": "Maintenance Team",
+            "created_date": _CREATED_DATE
+        }
+    },
+    {
+        "external_id": "plex_master",
+        "name": "Plex Master Data",
+        "description": "Master data and reference information including plant hierarchy, "
+                      "equipment registry, part numbers, BOMs, and routing definitions",
+        "metadata": {
+            "source": "Plex MES",
+            "domain": "master_data",
+            "update_frequency": "daily",
+            "data_types": "assets,raw_tables",
+            "owner": "Data Management Team",
+            "created_date": _CREATED_DATE
+        }
+    }
+]
+
+
 class DatasetManager:
     """Manages CDF dataset creation and configuration for Plex MES data"""
     
@@ -61,106 +153,25 @@ class DatasetManager:
     
     def _get_datasets_config(self) -> List[Dict]:
         """Define all datasets to be created"""
-        return [
-            {
-                "external_id": "plex_production",
-                "name": "Plex Production Operations",
-                "description": "Real-time production operations data from Plex MES including workcenter status, "
-                              "production entries, OEE metrics, and throughput measurements",
-                "metadata": {
-                    "source": "Plex MES",
-                    "domain": "production",
-                    "update_frequency": "1-5 minutes",
-                    "data_types": "time_series,events,assets",
-                    "owner": "Production Team",
-                    "created_date": datetime.now().isoformat()
-                }
-            },
-            {
-                "external_id": "plex_scheduling",
-                "name": "Plex Job Scheduling",
-                "description": "Job scheduling and planning data including production orders, job operations, "
-                              "and schedule adherence metrics",
-                "metadata": {
-                    "source": "Plex MES",
-                    "domain": "scheduling",
-                    "update_frequency": "10-15 minutes",
-                    "data_types": "assets,events,time_series",
-                    "owner": "Planning Team",
-                    "created_date": datetime.now().isoformat()
-                }
-            },
-            {
-                "external_id": "plex_quality",
-                "name": "Plex Quality Management",
-                "description": "Quality management data including inspections, non-conformances, "
-                              "defect rates, and quality KPIs",
-                "metadata": {
-                    "source": "Plex MES",
-                    "domain": "quality",
-                    "update_frequency": "on_event",
-                    "data_types": "events,time_series,assets",
-                    "owner": "Quality Team",
-                    "created_date": datetime.now().isoformat()
-                }
-            },
-            {
-                "external_id": "plex_inventory",
-                "name": "Plex Inventory Management",
-                "description": "Inventory and material management data including stock levels, "
-                              "material movements, consumption rates, and warehouse operations",
-                "metadata": {
-                    "source": "Plex MES",
-                    "domain": "inventory",
-                    "update_frequency": "15-30 minutes",
-                    "data_types": "time_series,events,assets",
-                    "owner": "Supply Chain Team",
-                    "created_date": datetime.now().isoformat()
-                }
-            },
-            {
-                "external_id": "plex_maintenance",
-                "name": "Plex Maintenance Management",
-                "description": "Equipment maintenance data including work orders, preventive maintenance, "
-                              "equipment failures, and maintenance KPIs",
-                "metadata": {
-                    "source": "Plex MES",
-                    "domain": "maintenance",
-                    "update_frequency": "on_event",
-                    "data_types": "events,time_series,assets",
-                    "owner": "Maintenance Team",
-                    "created_date": datetime.now().isoformat()
-                }
-            },
-            {
-                "external_id": "plex_master",
-                "name": "Plex Master Data",
-                "description": "Master data and reference information including plant hierarchy, "
-                              "equipment registry, part numbers, BOMs, and routing definitions",
-                "metadata": {
-                    "source": "Plex MES",
-                    "domain": "master_data",
-                    "update_frequency": "daily",
-                    "data_types": "assets,raw_tables",
-                    "owner": "Data Management Team",
-                    "created_date": datetime.now().isoformat()
-                }
-            }
-        ]
+        return _DATASETS_CONFIG
     
     def check_existing_datasets(self) -> Dict[str, DataSet]:
         """Check for existing datasets"""
         logger.info("Checking for existing datasets...")
         existing = {}
         
-        for config in self.datasets_config:
-            try:
-                dataset = self.client.data_sets.retrieve(external_id=config["external_id"])
-                if dataset:
-                    existing[config["external_id"]] = dataset
-                    logger.info(f"  Found existing dataset: {config['external_id']} (ID: {dataset.id})")
-            except:
-                pass
+        try:
+            found = self.client.data_sets.retrieve_multiple(
+                external_ids=[config["external_id"] for config in self.datasets_config],
+                ignore_unknown_ids=True
+            )
+        except CogniteAPIError as e:
+            logger.error(f"  Failed to look up existing datasets: {e}")
+            return existing
+        
+        for dataset in found:
+            existing[dataset.external_id] = dataset
+            logger.info(f"  Found existing dataset: {dataset.external_id} (ID: {dataset.id})")
         
         return existing
     
@@ -181,31 +192,44 @@ class DatasetManager:
         """Create all configured datasets"""
         logger.info("Creating datasets...")
         created_datasets = []
+        existing_ids = []
+        
+        writes = [
+            DataSetWrite(
+                external_id=config["external_id"],
+                name=config["name"],
+                description=config["description"],
+                metadata=config["metadata"]
+            )
+            for config in self.datasets_config
+        ]
         
-        for config in self.datasets_config:
+        try:
             try:
-                dataset = DataSetWrite(
-                    external_id=config["external_id"],
-                    name=config["name"],
-                    description=config["description"],
-                    metadata=config["metadata"]
-                )
-                
-                created = self.client.data_sets.create(dataset)
-                created_datasets.append(created)
-                logger.info(f"  Created dataset: {config['external_id']} (ID: {created.id})")
-                
+                created_datasets.extend(self.client.data_sets.create(writes))
             except CogniteAPIError as e:
-                if "already exists" in str(e).lower():
-                    logger.warning(f"  Dataset already exists: {config['external_id']}")
-                    # Retrieve the existing dataset
-                    existing = self.client.data_sets.retrieve(external_id=config["external_id"])
-                    if existing:
-                        created_datasets.append(existing)
-                else:
-                    logger.error(f"  Failed to create {config['external_id']}: {e}")
-            except Exception as e:
-                logger.error(f"  Unexpected error creating {config['external_id']}: {e}")
+                # The request is rejected as a whole; retry without the duplicates
+                existing_ids = [d.get("externalId") for d in (e.duplicated or [])]
+                if not existing_ids:
+                    raise
+                remaining = [w for w in writes if w.external_id not in existing_ids]
+                if remaining:
+                    created_datasets.extend(self.client.data_sets.create(remaining))
+        except CogniteAPIError as e:
+            logger.error(f"  Failed to create datasets: {e}")
+        except Exception as e:
+            logger.error(f"  Unexpected error creating datasets: {e}")
+        
+        for dataset in created_datasets:
+            logger.info(f"  Created dataset: {dataset.external_id} (ID: {dataset.id})")
+        
+        if existing_ids:
+            for external_id in existing_ids:
+                logger.warning(f"  Dataset already exists: {external_id}")
+            # Retrieve the existing datasets
+            created_datasets.extend(self.client.data_sets.retrieve_multiple(
+                external_ids=existing_ids, ignore_unknown_ids=True
+            ))
         
         return created_datasets
     
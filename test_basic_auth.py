@@ -3,16 +3,29 @@
 Basic authentication test for Plex API
 """
 
-import os
+import asyncio
+import orjson
 import httpx
-from dotenv import load_dotenv
 
-load_dotenv()
+from config import settings
 
-def test_plex_auth():
+async def _try_endpoint(client: httpx.AsyncClient, url: str):
+    """GET one candidate endpoint, returning (url, status, body, error)
+    
+    Only the status of a 401 or 404 is reported, so their bodies are never read.
+    """
+    try:
+        async with client.stream("GET", url) as response:
+            body = None if response.status_code in (401, 404) else await response.aread()
+            return url, response.status_code, body, None
+    except Exception as e:
+        return url, None, None, e
+
+async def test_plex_auth():
     """Test basic Plex API authentication"""
-    api_key = os.getenv("PLEX_API_KEY")
-    customer_id = os.getenv("PLEX_CUSTOMER_ID", "340884")
+    config = settings()
+    api_key = config.plex_api_key
+    customer_id = config.plex_customer_id
     
     if not api_key:
         print("ERROR: PLEX_API_KEY not configured")
@@ -29,33 +42,47 @@ def test_plex_auth():
         f"https://connect.plex.com/mdm/v1/parts?limit=1",
     ]
     
-    for url in endpoints:
-        print(f"\nTrying: {url}")
+    # Try every variation at once and stop at the first that answers 200
+    async with httpx.AsyncClient(
+        headers={
+            "X-Plex-Connect-Api-Key": api_key,
+            "X-Plex-Connect-Customer-Id": customer_id,
+            "Content-Type": "application/json"
+        },
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=75.0)
+    ) as client:
+        tasks = [asyncio.create_task(_try_endpoint(client, url)) for url in endpoints]
         try:
-            response = httpx.get(
-                url,
-                headers={
-                    "X-Plex-Connect-Api-Key": api_key,
-                    "X-Plex-Connect-Customer-Id": customer_id,
-                    "Content-Type": "application/json"
-                },
-                timeout=10.0
-            )
-            print(f"  Status: {response.status_code}")
-            if response.status_code == 200:
-                print("  ✓ Success!")
-                data = response.json()
-                if isinstance(data, dict):
-                    print(f"  Response keys: {list(data.keys())[:5]}")
-                break
-            elif response.status_code == 401:
-                print("  ✗ Authentication failed")
-            elif response.status_code == 404:
-                print("  ✗ Endpoint not found")
-            else:
-                print(f"  Response: {response.text[:200]}")
-        except Exception as e:
-            print(f"  Error: {e}")
+            for finished in asyncio.as_completed(tasks):
+                url, status, body, error = await finished
+                print(f"\nTried: {url}")
+                if error is not None:
+                    print(f"  Error: {error}")
+                    continue
+                print(f"  Status: {status}")
+                if status == 200:
+                    print("  ✓ Success!")
+                    data = orjson.loads(body)
+                    if isinstance(data, dict):
+                        print(f"  Response keys: {list(data.keys())[:5]}")
+                    break
+                elif status == 401:
+                    print("  ✗ Authentication failed")
+                elif status == 404:
+                    print("  ✗ Endpoint not found")
+                else:
+                    print(f"  Response: {body[:200].decode('utf-8', errors='replace')}")
+        finally:
+            for task in tasks:
+                task.cancel()
 
 if __name__ == "__main__":
-    test_plex_auth()
\ No newline at end of file
+    # Use uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
+    asyncio.run(test_plex_auth())
\ No newline at end of file
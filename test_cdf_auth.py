@@ -3,40 +3,24 @@
 Simple CDF authentication test using the default (non-enhanced) method
 """
 
-import os
-from dotenv import load_dotenv
-from cognite.client import CogniteClient
-from cognite.client.config import ClientConfig
-from cognite.client.credentials import OAuthClientCredentials
+import sys
+import traceback
 
-# Load environment variables
-load_dotenv()
+from cdf_client_factory import get_client
+from config import settings
 
 def test_cdf_auth():
     """Test CDF authentication"""
+    config = settings()
     print("Testing CDF authentication...")
-    print(f"CDF_HOST: {os.getenv('CDF_HOST')}")
-    print(f"CDF_PROJECT: {os.getenv('CDF_PROJECT')}")
-    print(f"CDF_CLIENT_ID: {os.getenv('CDF_CLIENT_ID')[:10]}...")
-    print(f"CDF_TOKEN_URL: {os.getenv('CDF_TOKEN_URL')}")
+    print(f"CDF_HOST: {config.cdf_host}")
+    print(f"CDF_PROJECT: {config.cdf_project}")
+    print(f"CDF_CLIENT_ID: {config.cdf_client_id[:10]}...")
+    print(f"CDF_TOKEN_URL: {config.cdf_token_url}")
 
     try:
-        # Use the same authentication as base_extractor.py
-        creds = OAuthClientCredentials(
-            token_url=os.getenv('CDF_TOKEN_URL'),
-            client_id=os.getenv('CDF_CLIENT_ID'),
-            client_secret=os.getenv('CDF_CLIENT_SECRET'),
-            scopes=["user_impersonation"]
-        )
-
-        config = ClientConfig(
-            client_name="test-auth-client",
-            base_url=os.getenv('CDF_HOST'),
-            project=os.getenv('CDF_PROJECT'),
-            credentials=creds
-        )
-
-        client = CogniteClient(config)
+        # Same authentication as base_extractor.py
+        client = get_client()
 
         # Test the connection
         print("\n✓ Client initialized")
@@ -52,8 +36,8 @@ def test_cdf_auth():
 
     except Exception as e:
         print(f"\n✗ Authentication failed: {e}")
-        import traceback
-        traceback.print_exc()
+        # Format the traceback once and write it in a single call
+        sys.stderr.write(traceback.format_exc())
         return False
 
 if __name__ == "__main__":
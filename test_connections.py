@@ -5,92 +5,188 @@ Tests API endpoints, authentication, and basic data retrieval.
 """
 
 import asyncio
-import os
+import importlib.util
 import sys
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import httpx
-from dotenv import load_dotenv
-import json
+import orjson
 import base64
+import random
+import traceback
+from types import MappingProxyType
 
-# Load environment variables
-load_dotenv()
+from config import settings
+
+# Plex probes in flight at once, kept low to stay clear of Plex rate limits
+MAX_CONCURRENT_PROBES = 8
+# Retries of a probe answered with 429 Too Many Requests
+PROBE_MAX_RETRIES = 3
+
+# Endpoints probed per group, as (path or datasource id, display name)
+_MASTER_ENDPOINTS: Tuple[Tuple[str, str], ...] = (
+    ("/mdm/v1/parts", "Parts API"),
+    ("/mdm/v1/part-operations", "Operations API"),
+    ("/mdm/v1/boms", "BOM API"),
+    ("/mdm/v1/routings", "Routing API"),
+    ("/mdm/v1/resources", "Resources API"),
+)
+# Regular API endpoints - using mdm prefix for quality
+_QUALITY_ENDPOINTS: Tuple[Tuple[str, str], ...] = (
+    ("/quality/v1/defects", "NCR/Defects API"),
+    ("/quality/v1/quality-checks", "Quality Checks API"),
+    ("/mdm/v1/quality/checksheets", "Checksheets API"),
+    ("/mdm/v1/quality/inspections", "Inspections API"),
+    ("/quality/v1/issues", "Quality Issues API"),
+)
+_DATASOURCES: Tuple[Tuple[int, str], ...] = (
+    (6429, "Specification_Get"),
+    (4142, "Checksheets_Get"),
+    (4760, "Inspection_Modes_Get"),
+)
 
 class TestResults:
-    """Track test results"""
+    """Track test results
+    
+    Result lines are buffered and written in one go by flush(), so probes
+    running concurrently don't interleave their output.
+    """
     def __init__(self):
         self.passed: List[str] = []
         self.failed: List[Dict[str, Any]] = []
         self.warnings: List[str] = []
+        self._buffer: List[str] = []
     
     def add_pass(self, test_name: str):
         self.passed.append(test_name)
-        print(f"✓ {test_name}")
+        self._buffer.append(f"✓ {test_name}")
     
-    def add_fail(self, test_name: str, error: str):
-        self.failed.append({"test": test_name, "error": error})
-        print(f"✗ {test_name}: {error}")
+    def add_fail(self, test_name: str, error: str, traceback_text: Optional[str] = None):
+        fail = {"test": test_name, "error": error}
+        if traceback_text:
+            fail["traceback"] = traceback_text
+        self.failed.append(fail)
+        self._buffer.append(f"✗ {test_name}: {error}")
     
     def add_warning(self, message: str):
         self.warnings.append(message)
-        print(f"⚠ {message}")
+        self._buffer.append(f"⚠ {message}")
+    
+    def flush(self):
+        """Write buffered result lines to stdout in a single call"""
+        if self._buffer:
+            sys.stdout.write("\n".join(self._buffer) + "\n")
+            sys.stdout.flush()
+            self._buffer.clear()
     
     def print_summary(self):
-        print("\n" + "="*60)
-        print("TEST SUMMARY")
-        print("="*60)
-        print(f"Passed: {len(self.passed)}")
-        print(f"Failed: {len(self.failed)}")
-        print(f"Warnings: {len(self.warnings)}")
+        self.flush()
+        lines = [
+            "\n" + "="*60,
+            "TEST SUMMARY",
+            "="*60,
+            f"Passed: {len(self.passed)}",
+            f"Failed: {len(self.failed)}",
+            f"Warnings: {len(self.warnings)}",
+        ]
         
         if self.failed:
-            print("\nFailed Tests:")
+            lines.append("\nFailed Tests:")
             for fail in self.failed:
-                print(f"  - {fail['test']}: {fail['error']}")
+                lines.append(f"  - {fail['test']}: {fail['error']}")
+                if "traceback" in fail:
+                    lines.append(fail["traceback"].rstrip())
         
         if self.warnings:
-            print("\nWarnings:")
-            for warning in self.warnings:
-                print(f"  - {warning}")
+            lines.append("\nWarnings:")
+            lines.extend(f"  - {warning}" for warning in self.warnings)
         
+        sys.stdout.write("\n".join(lines) + "\n")
         return len(self.failed) == 0
 
 class PlexAPITester:
     """Test Plex API connections"""
     
     def __init__(self):
-        self.api_key = os.getenv("PLEX_API_KEY")
-        self.customer_id = os.getenv("PLEX_CUSTOMER_ID", "340884")
+        config = settings()
+        self.api_key = config.plex_api_key
+        self.customer_id = config.plex_customer_id
         self.base_url = "https://connect.plex.com"
         self.results = TestResults()
         
         # Plex API headers
-        self.plex_headers = {
+        self.plex_headers = MappingProxyType({
             "X-Plex-Connect-Api-Key": self.api_key,
             "X-Plex-Connect-Customer-Id": self.customer_id,
             "Content-Type": "application/json"
-        }
+        })
         
         # Data Source API credentials
-        self.ds_username = os.getenv("PLEX_DS_USERNAME")
-        self.ds_password = os.getenv("PLEX_DS_PASSWORD")
+        self.ds_username = config.plex_ds_username
+        self.ds_password = config.plex_ds_password
+        
+        # One pooled client shared by every probe, opened in run_all_tests
+        self._client: Optional[httpx.AsyncClient] = None
+        self._probe_sem = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+        self._probe_limit = MAX_CONCURRENT_PROBES
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared Plex client, created on first use"""
+        if self._client is None or self._client.is_closed:
+            # Connect headers go on each Connect request, never on the
+            # DataSource calls, which authenticate with Basic auth only
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=10.0,
+                # Keep idle sockets as long as a typical edge (75s) so groups reuse them
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=75.0)
+            )
+        return self._client
+    
+    async def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send one rate-limited Plex request on the shared client
+        
+        A 429 is retried up to PROBE_MAX_RETRIES times, waiting Retry-After or
+        an exponential backoff. When X-RateLimit-Remaining drops below the
+        current concurrency, this request keeps its semaphore slot so one fewer
+        probe runs at a time from then on.
+        """
+        client = self._get_client()
+        await self._probe_sem.acquire()
+        retire_slot = False
+        try:
+            for attempt in range(PROBE_MAX_RETRIES + 1):
+                response = await client.request(method, url, **kwargs)
+                if response.status_code != 429 or attempt == PROBE_MAX_RETRIES:
+                    break
+                retry_after = response.headers.get("Retry-After", "")
+                delay = float(retry_after) if retry_after.isdigit() else 2 ** attempt + random.random()
+                await asyncio.sleep(delay)
+            
+            remaining = response.headers.get("X-RateLimit-Remaining", "")
+            if remaining.isdigit() and int(remaining) < self._probe_limit and self._probe_limit > 1:
+                self._probe_limit -= 1
+                retire_slot = True
+            return response
+        finally:
+            if not retire_slot:
+                self._probe_sem.release()
     
     async def test_basic_auth(self) -> bool:
         """Test basic Plex API authentication"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/scheduling/v1/jobs",
-                    params={"limit": 1},
-                    headers=self.plex_headers
-                )
-                if response.status_code == 200:
-                    self.results.add_pass("Basic API Authentication")
-                    return True
-                else:
-                    self.results.add_fail("Basic API Authentication", f"Status {response.status_code}")
-                    return False
+            response = await self._request(
+                "GET",
+                "/scheduling/v1/jobs",
+                params={"limit": 1},
+                headers=self.plex_headers
+            )
+            if response.status_code == 200:
+                self.results.add_pass("Basic API Authentication")
+                return True
+            else:
+                self.results.add_fail("Basic API Authentication", f"Status {response.status_code}")
+                return False
         except Exception as e:
             self.results.add_fail("Basic API Authentication", str(e))
             return False
@@ -99,99 +195,87 @@ class PlexAPITester:
         """Test Master Data API endpoints"""
         print("\n--- Testing Master Data Endpoints ---")
         
-        endpoints = [
-            ("/mdm/v1/parts", "Parts API"),
-            ("/mdm/v1/part-operations", "Operations API"),
-            ("/mdm/v1/boms", "BOM API"),
-            ("/mdm/v1/routings", "Routing API"),
-            ("/mdm/v1/resources", "Resources API"),
-        ]
-        
-        async with httpx.AsyncClient() as client:
-            for endpoint, name in endpoints:
-                try:
-                    # Test with limit=1 to avoid large responses
-                    response = await client.get(
-                        f"{self.base_url}{endpoint}",
-                        params={"limit": 1},
-                        headers=self.plex_headers,
-                        timeout=10.0
-                    )
+        async def probe(endpoint: str, name: str):
+            try:
+                # Test with limit=1 to avoid large responses
+                response = await self._request(
+                    "GET",
+                    endpoint,
+                    params={"limit": 1},
+                    headers=self.plex_headers,
+                    timeout=10.0
+                )
+                
+                if response.status_code == 200:
+                    data = orjson.loads(response.content)
+                    self.results.add_pass(f"{name} - Connection OK")
                     
-                    if response.status_code == 200:
-                        data = response.json()
-                        self.results.add_pass(f"{name} - Connection OK")
-                        
-                        # Handle both list and dict responses
-                        if isinstance(data, list):
-                            if data:
-                                self.results.add_pass(f"{name} - Has data ({len(data)} items)")
-                            else:
-                                self.results.add_warning(f"{name} - No data returned")
-                        elif isinstance(data, dict):
-                            if data.get("data"):
-                                self.results.add_pass(f"{name} - Has data")
-                            else:
-                                self.results.add_warning(f"{name} - No data in response")
+                    # Handle both list and dict responses
+                    if isinstance(data, list):
+                        if data:
+                            self.results.add_pass(f"{name} - Has data ({len(data)} items)")
                         else:
-                            self.results.add_warning(f"{name} - Unexpected response type: {type(data)}")
+                            self.results.add_warning(f"{name} - No data returned")
+                    elif isinstance(data, dict):
+                        if data.get("data"):
+                            self.results.add_pass(f"{name} - Has data")
+                        else:
+                            self.results.add_warning(f"{name} - No data in response")
                     else:
-                        self.results.add_fail(name, f"Status {response.status_code}")
+                        self.results.add_warning(f"{name} - Unexpected response type: {type(data)}")
+                else:
+                    self.results.add_fail(name, f"Status {response.status_code}")
                         
-                except httpx.TimeoutException:
-                    self.results.add_fail(name, "Timeout")
-                except Exception as e:
-                    self.results.add_fail(name, str(e))
+            except httpx.TimeoutException:
+                self.results.add_fail(name, "Timeout")
+            except Exception as e:
+                self.results.add_fail(name, str(e))
+        
+        await asyncio.gather(*(probe(endpoint, name) for endpoint, name in _MASTER_ENDPOINTS))
     
     async def test_quality_endpoints(self):
         """Test Quality API endpoints"""
         print("\n--- Testing Quality Endpoints ---")
         
-        # Regular API endpoints - using mdm prefix for quality
-        endpoints = [
-            ("/quality/v1/defects", "NCR/Defects API"),
-            ("/quality/v1/quality-checks", "Quality Checks API"),
-            ("/mdm/v1/quality/checksheets", "Checksheets API"),
-            ("/mdm/v1/quality/inspections", "Inspections API"),
-            ("/quality/v1/issues", "Quality Issues API"),
-        ]
+        # Date range for NCRs, computed once and shared by the concurrent probes
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=7)
+        ncr_params = {
+            "startDate": start_date.isoformat(),
+            "endDate": end_date.isoformat(),
+            "limit": 1
+        }
+        default_params = {"limit": 1}
         
-        async with httpx.AsyncClient() as client:
-            for endpoint, name in endpoints:
-                try:
-                    # Calculate date range for NCRs
-                    if "ncrs" in endpoint:
-                        end_date = datetime.now()
-                        start_date = end_date - timedelta(days=7)
-                        params = {
-                            "startDate": start_date.isoformat(),
-                            "endDate": end_date.isoformat(),
-                            "limit": 1
-                        }
-                    else:
-                        params = {"limit": 1}
-                    
-                    response = await client.get(
-                        f"{self.base_url}{endpoint}",
-                        params=params,
-                        headers=self.plex_headers,
-                        timeout=10.0
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        self.results.add_pass(f"{name} - Connection OK")
-                        if data:
-                            self.results.add_pass(f"{name} - Has data")
-                        else:
-                            self.results.add_warning(f"{name} - No data returned")
+        async def probe(endpoint: str, name: str):
+            try:
+                params = ncr_params if "ncrs" in endpoint else default_params
+                
+                response = await self._request(
+                    "GET",
+                    endpoint,
+                    params=params,
+                    headers=self.plex_headers,
+                    timeout=10.0
+                )
+                
+                if response.status_code == 200:
+                    # An empty body needs no JSON parse to know there's no data
+                    data = None if response.headers.get("content-length") == "0" else orjson.loads(response.content)
+                    self.results.add_pass(f"{name} - Connection OK")
+                    if data:
+                        self.results.add_pass(f"{name} - Has data")
                     else:
-                        self.results.add_fail(name, f"Status {response.status_code}")
+                        self.results.add_warning(f"{name} - No data returned")
+                else:
+                    self.results.add_fail(name, f"Status {response.status_code}")
                         
-                except httpx.TimeoutException:
-                    self.results.add_fail(name, "Timeout")
-                except Exception as e:
-                    self.results.add_fail(name, str(e))
+            except httpx.TimeoutException:
+                self.results.add_fail(name, "Timeout")
+            except Exception as e:
+                self.results.add_fail(name, str(e))
+        
+        await asyncio.gather(*(probe(endpoint, name) for endpoint, name in _QUALITY_ENDPOINTS))
     
     async def test_datasource_api(self):
         """Test Data Source API authentication and endpoints"""
@@ -206,49 +290,46 @@ class PlexAPITester:
         encoded = base64.b64encode(credentials.encode('utf-8')).decode('ascii')
         auth_header = f"Basic {encoded}"
         
-        # Data source IDs to test
-        datasources = [
-            (6429, "Specification_Get"),
-            (4142, "Checksheets_Get"),
-            (4760, "Inspection_Modes_Get"),
-        ]
+        # Test with minimal parameters, shared by every datasource request
+        body = {
+            "inputs": {
+                "Format Type": 2,  # JSON format
+                "Company Code": "MANUTENCAO"  # Default company
+            }
+        }
+        headers = {"Authorization": auth_header}
+        url_prefix = f"https://cloud.plex.com/api/datasource/execute/{self.customer_id}/"
         
-        async with httpx.AsyncClient() as client:
-            for ds_id, name in datasources:
-                try:
-                    url = f"https://cloud.plex.com/api/datasource/execute/{self.customer_id}/{ds_id}"
-                    
-                    # Test with minimal parameters
-                    inputs = {
-                        "Format Type": 2,  # JSON format
-                        "Company Code": "MANUTENCAO"  # Default company
-                    }
-                    
-                    response = await client.post(
-                        url,
-                        json={"inputs": inputs},
-                        headers={"Authorization": auth_header},
-                        timeout=15.0
-                    )
+        async def probe(ds_id: int, name: str):
+            try:
+                response = await self._request(
+                    "POST",
+                    f"{url_prefix}{ds_id}",
+                    json=body,
+                    headers=headers,
+                    timeout=15.0
+                )
+                
+                if response.status_code == 200:
+                    data = orjson.loads(response.content)
+                    self.results.add_pass(f"Data Source API - {name}")
                     
-                    if response.status_code == 200:
-                        data = response.json()
-                        self.results.add_pass(f"Data Source API - {name}")
-                        
-                        # Check if we got data
-                        if "outputs" in data:
-                            self.results.add_pass(f"Data Source API - {name} has outputs")
-                        else:
-                            self.results.add_warning(f"Data Source API - {name} no outputs")
-                    elif response.status_code == 401:
-                        self.results.add_fail(f"Data Source API - {name}", "Authentication failed")
+                    # Check if we got data
+                    if "outputs" in data:
+                        self.results.add_pass(f"Data Source API - {name} has outputs")
                     else:
-                        self.results.add_fail(f"Data Source API - {name}", f"Status {response.status_code}")
+                        self.results.add_warning(f"Data Source API - {name} no outputs")
+                elif response.status_code == 401:
+                    self.results.add_fail(f"Data Source API - {name}", "Authentication failed")
+                else:
+                    self.results.add_fail(f"Data Source API - {name}", f"Status {response.status_code}")
                         
-                except httpx.TimeoutException:
-                    self.results.add_fail(f"Data Source API - {name}", "Timeout")
-                except Exception as e:
-                    self.results.add_fail(f"Data Source API - {name}", str(e))
+            except httpx.TimeoutException:
+                self.results.add_fail(f"Data Source API - {name}", "Timeout")
+            except Exception as e:
+                self.results.add_fail(f"Data Source API - {name}", str(e))
+        
+        await asyncio.gather(*(probe(ds_id, name) for ds_id, name in _DATASOURCES))
     
     async def test_cdf_connection(self):
         """Test CDF connection"""
@@ -259,18 +340,19 @@ class PlexAPITester:
             from cognite.client.credentials import OAuthClientCredentials
             from cognite.client.config import ClientConfig
             
+            config = settings()
             creds = OAuthClientCredentials(
-                token_url=os.getenv("CDF_TOKEN_URL"),
-                client_id=os.getenv("CDF_CLIENT_ID"),
-                client_secret=os.getenv("CDF_CLIENT_SECRET"),
-                scopes=[f"{os.getenv('CDF_HOST')}/.default"]
+                token_url=config.cdf_token_url,
+                client_id=config.cdf_client_id,
+                client_secret=config.cdf_client_secret,
+                scopes=[f"{config.cdf_host}/.default"]
             )
             
             client = CogniteClient(
                 ClientConfig(
                     client_name="plex-test",
-                    base_url=os.getenv("CDF_HOST"),
-                    project=os.getenv("CDF_PROJECT"),
+                    base_url=config.cdf_host,
+                    project=config.cdf_project,
                     credentials=creds
                 )
             )
@@ -285,27 +367,45 @@ class PlexAPITester:
                 
             # Test dataset access
             dataset_ids = {
-                "Master": os.getenv("CDF_DATASET_PLEXMASTER"),
-                "Quality": os.getenv("CDF_DATASET_PLEXQUALITY"),
+                "Master": config.cdf_dataset_plexmaster,
+                "Quality": config.cdf_dataset_plexquality,
             }
             
+            configured: Dict[str, int] = {}
             for name, dataset_id in dataset_ids.items():
                 if dataset_id:
                     try:
-                        dataset = client.data_sets.retrieve(id=int(dataset_id))
+                        configured[name] = int(dataset_id)
+                    except ValueError as e:
+                        self.results.add_fail(f"CDF Dataset {name}", str(e))
+                else:
+                    self.results.add_warning(f"CDF Dataset {name} ID not configured")
+            
+            # Look up every configured dataset in one request
+            if configured:
+                try:
+                    found = {
+                        dataset.id: dataset
+                        for dataset in client.data_sets.retrieve_multiple(
+                            ids=list(dict.fromkeys(configured.values())),
+                            ignore_unknown_ids=True
+                        )
+                    }
+                except Exception as e:
+                    for name in configured:
+                        self.results.add_fail(f"CDF Dataset {name}", str(e))
+                else:
+                    for name, dataset_id in configured.items():
+                        dataset = found.get(dataset_id)
                         if dataset:
                             self.results.add_pass(f"CDF Dataset {name}: {dataset.name}")
                         else:
                             self.results.add_fail(f"CDF Dataset {name}", "Not found")
-                    except Exception as e:
-                        self.results.add_fail(f"CDF Dataset {name}", str(e))
-                else:
-                    self.results.add_warning(f"CDF Dataset {name} ID not configured")
                     
         except ImportError:
             self.results.add_fail("CDF Connection", "cognite-sdk not installed")
         except Exception as e:
-            self.results.add_fail("CDF Connection", str(e))
+            self.results.add_fail("CDF Connection", str(e), traceback.format_exc())
     
     async def run_all_tests(self):
         """Run all connection tests"""
@@ -318,14 +418,21 @@ class PlexAPITester:
             print("ERROR: PLEX_API_KEY not configured")
             return False
         
-        # Run tests in sequence
-        auth_ok = await self.test_basic_auth()
-        
-        if auth_ok:
-            # Test API endpoints
-            await self.test_master_data_endpoints()
-            await self.test_quality_endpoints()
-            await self.test_datasource_api()
+        try:
+            # Run tests in sequence, writing each phase's results as it ends
+            auth_ok = await self.test_basic_auth()
+            self.results.flush()
+            
+            if auth_ok:
+                # Test API endpoints
+                for phase in (self.test_master_data_endpoints,
+                              self.test_quality_endpoints,
+                              self.test_datasource_api):
+                    await phase()
+                    self.results.flush()
+        finally:
+            if self._client is not None:
+                await self._client.aclose()
         
         # Test CDF connection independently
         await self.test_cdf_connection()
@@ -342,11 +449,16 @@ async def main():
     sys.exit(0 if success else 1)
 
 if __name__ == "__main__":
-    # Check for cognite-sdk
-    try:
-        from cognite.client.config import ClientConfig
-    except ImportError:
+    # Check for cognite-sdk without importing it; test_cdf_connection imports it when it runs
+    if importlib.util.find_spec("cognite") is None:
         print("Warning: cognite-sdk not installed. CDF tests will be skipped.")
         print("Install with: pip install cognite-sdk")
     
+    # Use uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
     asyncio.run(main())
\ No newline at end of file
@@ -1,55 +1,55 @@
 #!/usr/bin/env python3
 """Quick test of enhanced extractors"""
 
+import argparse
 import asyncio
-import os
-from jobs_extractor_enhanced import EnhancedJobsExtractor
-from master_data_extractor_enhanced import EnhancedMasterDataExtractor
-from production_extractor_enhanced import EnhancedProductionExtractor
-from inventory_extractor_enhanced import EnhancedInventoryExtractor
+import importlib
 
-async def test_extractors():
-    """Test each extractor individually"""
+# Label, "module:class" of the extractor, and the created-count shown for it.
+# Extractor modules are imported only when their extractor is run.
+EXTRACTORS = [
+    ("Jobs", "jobs_extractor_enhanced:EnhancedJobsExtractor", "Events", "events_created"),
+    ("Master", "master_data_extractor_enhanced:EnhancedMasterDataExtractor", "Assets", "assets_created"),
+    ("Production", "production_extractor_enhanced:EnhancedProductionExtractor", "Events", "events_created"),
+    ("Inventory", "inventory_extractor_enhanced:EnhancedInventoryExtractor", "Assets", "assets_created"),
+]
+
+async def _run_extractor(target: str):
+    """Import, build and run one extractor for a single extraction"""
+    module_name, class_name = target.split(":")
+    extractor_class = getattr(importlib.import_module(module_name), class_name)
+    return await extractor_class().extract()
+
+async def test_extractors(only=None):
+    """Test each extractor individually, running them concurrently"""
+    selected = [entry for entry in EXTRACTORS if not only or entry[0].lower() in only]
     
-    print("Testing Jobs Extractor...")
-    try:
-        jobs = EnhancedJobsExtractor()
-        result = await jobs.extract()
-        print(f"  Jobs: {result.success}, Items: {result.items_processed}, Events: {result.events_created}")
-        if result.errors:
-            print(f"  Errors: {result.errors[:2]}")  # First 2 errors only
-    except Exception as e:
-        print(f"  Jobs error: {e}")
+    print(f"Testing {', '.join(label for label, *_ in selected)} extractors concurrently...")
+    results = await asyncio.gather(
+        *(_run_extractor(target) for _, target, _, _ in selected),
+        return_exceptions=True
+    )
     
-    print("\nTesting Master Data Extractor...")
-    try:
-        master = EnhancedMasterDataExtractor()
-        result = await master.extract()
-        print(f"  Master: {result.success}, Items: {result.items_processed}, Assets: {result.assets_created}")
+    for (label, _, count_label, count_attr), result in zip(selected, results):
+        if isinstance(result, Exception):
+            print(f"  {label} error: {result}")
+            continue
+        print(f"  {label}: {result.success}, Items: {result.items_processed}, "
+              f"{count_label}: {getattr(result, count_attr)}")
         if result.errors:
-            print(f"  Errors: {result.errors[:2]}")
-    except Exception as e:
-        print(f"  Master error: {e}")
+            print(f"  Errors: {result.errors[:2]}")  # First 2 errors only
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quick test of enhanced extractors")
+    parser.add_argument("--only", nargs="+", choices=[label.lower() for label, *_ in EXTRACTORS],
+                        help="Run only these extractors")
+    args = parser.parse_args()
     
-    print("\nTesting Production Extractor...")
+    # Use uvloop's faster event loop when it is installed
     try:
-        prod = EnhancedProductionExtractor()
-        result = await prod.extract()
-        print(f"  Production: {result.success}, Items: {result.items_processed}, Events: {result.events_created}")
-        if result.errors:
-            print(f"  Errors: {result.errors[:2]}")
-    except Exception as e:
-        print(f"  Production error: {e}")
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     
-    print("\nTesting Inventory Extractor...")
-    try:
-        inv = EnhancedInventoryExtractor()
-        result = await inv.extract()
-        print(f"  Inventory: {result.success}, Items: {result.items_processed}, Assets: {result.assets_created}")
-        if result.errors:
-            print(f"  Errors: {result.errors[:2]}")
-    except Exception as e:
-        print(f"  Inventory error: {e}")
-
-if __name__ == "__main__":
-    asyncio.run(test_extractors())
\ No newline at end of file
+    asyncio.run(test_extractors(args.only))
\ No newline at end of file
@@ -5,18 +5,69 @@ Validates that Master Data and available endpoints are working
 """
 
 import asyncio
+import collections
+import importlib.util
 import os
 from datetime import datetime, timedelta
 import httpx
 from dotenv import load_dotenv
-import json
+import argparse
+import orjson
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from probe_cache import DiscoveryCache
+
+try:
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
 
 load_dotenv()
 
+# Plex probes in flight at once across every category
+MAX_CONCURRENT_PROBES = int(os.getenv("PLEX_MAX_CONCURRENT", "16"))
+
+# Records kept from each probe response for the sample field listings
+PROBE_SAMPLE_SIZE = 5
+
+# Retries for throttled (429/503) or dropped probe requests
+PROBE_MAX_RETRIES = 2
+
+# (category, name, endpoint, parameter tag); None sends just a limit, "history"
+# adds the production history date window
+PROBE_TABLE = (
+    ("master_data", "Parts", "/mdm/v1/parts", None),
+    ("master_data", "Operations/Routings", "/mdm/v1/part-operations", None),
+    ("master_data", "Operations", "/mdm/v1/operations", None),
+    ("master_data", "Suppliers", "/mdm/v1/suppliers", None),
+    ("master_data", "Customers", "/mdm/v1/customers", None),
+    ("jobs", "Jobs", "/scheduling/v1/jobs", None),
+    ("production", "Production Entries", "/production/v1/production-history/production-entries", "history"),
+    ("production", "Production Summaries", "/production/v1/production-history/production-summaries", "history"),
+    ("production", "Workcenters", "/production/v1/workcenters", None),
+    ("inventory", "Containers", "/inventory/v1/inventory-tracking/containers", None),
+    ("inventory", "Locations", "/inventory/v1/inventory-tracking/locations", None),
+    ("inventory", "Movements", "/inventory/v1/inventory-tracking/movements", None),
+)
+
+CATEGORY_TITLES = {
+    "master_data": "MASTER DATA EXTRACTOR",
+    "jobs": "JOBS EXTRACTOR",
+    "production": "PRODUCTION EXTRACTOR",
+    "inventory": "INVENTORY EXTRACTOR",
+}
+
+# Categories whose 400s mean missing parameters rather than a broken endpoint
+PARAMS_HINT_CATEGORIES = {"production"}
+
+# How many sample field names to show per category
+SAMPLE_FIELD_COUNTS = {"master_data": 5, "jobs": 8}
+
 class EnhancedExtractorTester:
     """Test enhanced extractor connectivity"""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = False):
         self.api_key = os.getenv("PLEX_API_KEY")
         self.customer_id = os.getenv("PLEX_CUSTOMER_ID", "340884")
         self.base_url = "https://connect.plex.com"
@@ -29,215 +80,242 @@ class EnhancedExtractorTester:
         
         self.results = {
             "master_data": {},
+            "jobs": {},
             "production": {},
             "inventory": {},
             "quality": {},
             "cdf": {}
         }
-    
-    async def test_master_data_extractor(self):
-        """Test Master Data Extractor endpoints"""
-        print("\n" + "="*60)
-        print("MASTER DATA EXTRACTOR - Connectivity Test")
-        print("="*60)
         
-        endpoints = [
-            ("/mdm/v1/parts", "Parts"),
-            ("/mdm/v1/part-operations", "Operations/Routings"),
-            ("/mdm/v1/operations", "Operations"),
-            ("/mdm/v1/suppliers", "Suppliers"),
-            ("/mdm/v1/customers", "Customers"),
-        ]
-        
-        async with httpx.AsyncClient() as client:
-            for endpoint, name in endpoints:
-                try:
-                    response = await client.get(
-                        f"{self.base_url}{endpoint}",
-                        params={"limit": 5},
-                        headers=self.headers,
-                        timeout=10.0
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        count = len(data) if isinstance(data, list) else len(data.get("data", []))
-                        print(f"✓ {name}: {count} records fetched")
-                        self.results["master_data"][name] = {"status": "OK", "count": count}
-                        
-                        # Show sample data structure
-                        if count > 0:
-                            sample = data[0] if isinstance(data, list) else data["data"][0]
-                            print(f"  Sample fields: {list(sample.keys())[:5]}")
-                    else:
-                        print(f"✗ {name}: Status {response.status_code}")
-                        self.results["master_data"][name] = {"status": f"Error {response.status_code}"}
-                        
-                except Exception as e:
-                    print(f"✗ {name}: {str(e)[:50]}")
-                    self.results["master_data"][name] = {"status": "Exception", "error": str(e)[:50]}
+        # One keep-alive client for every probe; HTTP/2 when the h2 package is installed
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30),
+            http2=importlib.util.find_spec("h2") is not None
+        )
+        self._sem = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+        self._throttled = False
+        # (category, "ok" | "fail") tallies, kept as results are recorded
+        self.counters: collections.Counter = collections.Counter()
+        self.cache = DiscoveryCache(self.customer_id, enabled=use_cache)
     
-    async def test_production_extractor(self):
-        """Test Production Extractor endpoints"""
-        print("\n" + "="*60)
-        print("PRODUCTION EXTRACTOR - Connectivity Test")
-        print("="*60)
-        
-        endpoints = [
-            ("/production/v1/production-history/production-entries", "Production Entries"),
-            ("/production/v1/production-history/production-summaries", "Production Summaries"),
-            ("/production/v1/workcenters", "Workcenters"),
-        ]
+    async def __aenter__(self) -> "EnhancedExtractorTester":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the shared Plex client"""
+        await self.client.aclose()
+        self.cache.save()
+    
+    @staticmethod
+    def _banner(title: str) -> List[str]:
+        """Header lines for one category's output block"""
+        return ["\n" + "="*60, title, "="*60]
+    
+    def _record(self, category: str, name: str, result: Dict[str, Any]):
+        """Store one result and tally it for the summary"""
+        self.results[category][name] = result
+        self.counters[(category, "ok" if result["status"] == "OK" else "fail")] += 1
+    
+    @staticmethod
+    def _short_err(e: Exception, n: int = 50) -> str:
+        """Exception type and first argument, cut to n characters
         
-        async with httpx.AsyncClient() as client:
-            for endpoint, name in endpoints:
-                try:
-                    # Production endpoints often need date parameters
-                    params = {"limit": 5}
-                    if "production-history" in endpoint:
-                        end_date = datetime.now()
-                        start_date = end_date - timedelta(days=7)
-                        params.update({
-                            "startDate": start_date.isoformat(),
-                            "endDate": end_date.isoformat()
-                        })
-                    
-                    response = await client.get(
-                        f"{self.base_url}{endpoint}",
-                        params=params,
-                        headers=self.headers,
-                        timeout=10.0
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        count = len(data) if isinstance(data, list) else len(data.get("data", []))
-                        print(f"✓ {name}: {count} records fetched")
-                        self.results["production"][name] = {"status": "OK", "count": count}
-                    elif response.status_code == 400:
-                        print(f"⚠ {name}: Needs parameters (Status 400)")
-                        self.results["production"][name] = {"status": "Needs params"}
-                    else:
-                        print(f"✗ {name}: Status {response.status_code}")
-                        self.results["production"][name] = {"status": f"Error {response.status_code}"}
-                        
-                except Exception as e:
-                    print(f"✗ {name}: {str(e)[:50]}")
-                    self.results["production"][name] = {"status": "Exception", "error": str(e)[:50]}
+        Avoids str(e), which for httpx errors can format whole URLs and
+        headers only to be truncated.
+        """
+        name = type(e).__name__
+        if isinstance(e, httpx.HTTPStatusError):
+            return f"{name}: {e.response.status_code}"[:n]
+        msg = e.args[0] if e.args else ""
+        return f"{name}: {msg if isinstance(msg, str) else repr(msg)}"[:n]
     
-    async def test_inventory_extractor(self):
-        """Test Inventory Extractor endpoints"""
-        print("\n" + "="*60)
-        print("INVENTORY EXTRACTOR - Connectivity Test")
-        print("="*60)
+    @staticmethod
+    def _items(data: Any) -> List[Dict[str, Any]]:
+        """Records from a Plex body, which is a bare list or a {"data": [...]} wrapper"""
+        if isinstance(data, list):
+            return data
+        return data.get("data", []) if isinstance(data, dict) else []
+    
+    @classmethod
+    def _sample_records(cls, content: bytes) -> Tuple[int, List[Dict[str, Any]]]:
+        """Count a response's records and keep the first PROBE_SAMPLE_SIZE
         
-        endpoints = [
-            ("/inventory/v1/inventory-tracking/containers", "Containers"),
-            ("/inventory/v1/inventory-tracking/locations", "Locations"),
-            ("/inventory/v1/inventory-tracking/movements", "Movements"),
-        ]
+        Plex answers with either a bare list or a {"data": [...]} wrapper.
+        With ijson installed the records are decoded one at a time, so only
+        the sample is held in memory.
+        """
+        if ijson is None:
+            records = cls._items(orjson.loads(content))
+            return len(records), records[:PROBE_SAMPLE_SIZE]
         
-        async with httpx.AsyncClient() as client:
-            for endpoint, name in endpoints:
-                try:
-                    response = await client.get(
-                        f"{self.base_url}{endpoint}",
-                        params={"limit": 5},
-                        headers=self.headers,
-                        timeout=10.0
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        count = len(data) if isinstance(data, list) else len(data.get("data", []))
-                        print(f"✓ {name}: {count} records fetched")
-                        self.results["inventory"][name] = {"status": "OK", "count": count}
-                    else:
-                        print(f"✗ {name}: Status {response.status_code}")
-                        self.results["inventory"][name] = {"status": f"Error {response.status_code}"}
-                        
-                except Exception as e:
-                    print(f"✗ {name}: {str(e)[:50]}")
-                    self.results["inventory"][name] = {"status": "Exception", "error": str(e)[:50]}
+        prefix = "item" if content.lstrip()[:1] == b"[" else "data.item"
+        count = 0
+        sample: List[Dict[str, Any]] = []
+        for record in ijson.items(content, prefix):
+            if count < PROBE_SAMPLE_SIZE:
+                sample.append(record)
+            count += 1
+        return count, sample
     
-    async def test_jobs_extractor(self):
-        """Test Jobs/Scheduling Extractor endpoints"""
-        print("\n" + "="*60)
-        print("JOBS EXTRACTOR - Connectivity Test")
-        print("="*60)
+    async def _get(self, endpoint: str, params: Dict[str, Any]) -> httpx.Response:
+        """GET on the shared client, retrying throttling and transport errors
         
-        async with httpx.AsyncClient() as client:
+        429/503 responses wait Retry-After (or an exponential backoff) and
+        transport errors a short jittered backoff, up to PROBE_MAX_RETRIES
+        times. The final response or error is returned to the caller. The
+        first 429 also retires one semaphore permit for the rest of the run.
+        """
+        for attempt in range(PROBE_MAX_RETRIES + 1):
             try:
-                response = await client.get(
-                    f"{self.base_url}/scheduling/v1/jobs",
-                    params={"limit": 5},
-                    headers=self.headers,
-                    timeout=10.0
-                )
+                async with self._sem:
+                    response = await self.client.get(endpoint, params=params)
+            except httpx.TransportError:
+                if attempt == PROBE_MAX_RETRIES:
+                    raise
+                await asyncio.sleep(2 ** attempt * 0.2 + random.random() * 0.1)
+                continue
+            
+            if response.status_code == 429 and not self._throttled and MAX_CONCURRENT_PROBES > 1:
+                self._throttled = True
+                await self._sem.acquire()
+            if response.status_code not in (429, 503) or attempt == PROBE_MAX_RETRIES:
+                return response
+            retry_after = response.headers.get("Retry-After", "")
+            await asyncio.sleep(float(retry_after) if retry_after.isdigit() else 2 ** attempt)
+    
+    async def _probe(self, category: str, name: str, endpoint: str,
+                     param_tag: Optional[str]) -> Tuple[Any, List[str]]:
+        """GET one PROBE_TABLE endpoint and record its outcome
+        
+        Returns a sample of the decoded records (None unless the call
+        succeeded) and the lines to print for it, so run_probes can add
+        detail and print each category in table order once every probe
+        finishes.
+        """
+        params = self._probe_params[param_tag]
+        params_hint = category in PARAMS_HINT_CATEGORIES
+        lines: List[str] = []
+        data = None
+        
+        if self.cache.is_fresh_ok(endpoint):
+            lines.append(f"✓ {name}: OK (cached, not re-verified)")
+            self._record(category, name, {"status": "OK", "cached": True})
+            return data, lines
+        
+        try:
+            response = await self._get(endpoint, params)
+            self.cache.put(endpoint, response.status_code)
+            
+            if response.status_code == 200:
+                count, data = self._sample_records(response.content)
+                lines.append(f"✓ {name}: {count} records fetched")
+                self._record(category, name, {"status": "OK", "count": count})
+            elif response.status_code == 400 and params_hint:
+                lines.append(f"⚠ {name}: Needs parameters (Status 400)")
+                self._record(category, name, {"status": "Needs params"})
+            else:
+                lines.append(f"✗ {name}: Status {response.status_code}")
+                self._record(category, name, {"status": f"Error {response.status_code}"})
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    count = len(data) if isinstance(data, list) else len(data.get("data", []))
-                    print(f"✓ Jobs: {count} records fetched")
-                    
-                    if count > 0:
-                        sample = data[0] if isinstance(data, list) else data["data"][0]
-                        print(f"  Sample fields: {list(sample.keys())[:8]}")
-                        
-                        # Check job statuses
-                        statuses = set()
-                        jobs = data if isinstance(data, list) else data.get("data", [])
-                        for job in jobs:
-                            if "status" in job:
-                                statuses.add(job["status"])
-                        if statuses:
-                            print(f"  Job statuses found: {statuses}")
-                else:
-                    print(f"✗ Jobs: Status {response.status_code}")
-                    
-            except Exception as e:
-                print(f"✗ Jobs: {str(e)[:50]}")
+        except Exception as e:
+            error = self._short_err(e)
+            lines.append(f"✗ {name}: {error}")
+            self._record(category, name, {"status": "Exception", "error": error})
+        
+        return data, lines
     
-    async def test_cdf_basics(self):
+    async def run_probes(self):
+        """Probe every PROBE_TABLE endpoint concurrently, then print by category"""
+        # Production history endpoints need a date window; one shared window
+        # keeps every endpoint's results comparable
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=7)
+        self._probe_params = {
+            None: {"limit": 5},
+            "history": {
+                "limit": 5,
+                "startDate": start_date.isoformat(),
+                "endDate": end_date.isoformat()
+            },
+        }
+        
+        probes = await asyncio.gather(*(self._probe(*row) for row in PROBE_TABLE))
+        
+        blocks: Dict[str, List[str]] = {}
+        for (category, _, _, _), (data, lines) in zip(PROBE_TABLE, probes):
+            output = blocks.setdefault(category, self._banner(f"{CATEGORY_TITLES[category]} - Connectivity Test"))
+            output.extend(lines)
+            # Show sample data structure
+            if data and category in SAMPLE_FIELD_COUNTS:
+                output.append(f"  Sample fields: {list(data[0].keys())[:SAMPLE_FIELD_COUNTS[category]]}")
+                if category == "jobs":
+                    statuses = {job["status"] for job in data if "status" in job}
+                    if statuses:
+                        output.append(f"  Job statuses found: {statuses}")
+        
+        for output in blocks.values():
+            print("\n".join(output))
+    
+    @staticmethod
+    async def _import_cdf_sdk() -> Optional[str]:
+        """Import the CDF SDK in a worker thread; returns the error, if any"""
+        if os.getenv("SKIP_CDF_PROBE") == "1":
+            return None
+        if importlib.util.find_spec("cognite") is None:
+            return "No module named 'cognite'"
+        try:
+            await asyncio.to_thread(importlib.import_module, "cognite.client")
+        except ImportError as e:
+            return str(e)
+        return None
+    
+    async def test_cdf_basics(self, sdk_import: Optional[asyncio.Task] = None):
         """Test basic CDF connectivity"""
         print("\n" + "="*60)
         print("CDF - Basic Connectivity Test")
         print("="*60)
         
-        try:
-            from cognite.client import CogniteClient
-            from cognite.client.credentials import OAuthClientCredentials
-            from cognite.client.config import ClientConfig
-            
-            print("✓ CDF SDK imported successfully")
+        if os.getenv("SKIP_CDF_PROBE") == "1":
+            print("- CDF probe skipped (SKIP_CDF_PROBE=1)")
+            return
+        
+        error = await (sdk_import if sdk_import is not None else self._import_cdf_sdk())
+        if error:
+            print(f"✗ CDF SDK not installed: {error}")
+            self._record("cdf", "sdk", {"status": "Not installed"})
+            return
+        
+        print("✓ CDF SDK imported successfully")
+        
+        # Check environment variables
+        required_vars = ["CDF_HOST", "CDF_PROJECT", "CDF_CLIENT_ID", "CDF_CLIENT_SECRET", "CDF_TOKEN_URL"]
+        missing = [var for var in required_vars if not os.getenv(var)]
+        
+        if missing:
+            print(f"✗ Missing environment variables: {missing}")
+            self._record("cdf", "config", {"status": "Missing vars", "missing": missing})
+        else:
+            print("✓ All CDF environment variables configured")
+            self._record("cdf", "config", {"status": "OK"})
             
-            # Check environment variables
-            required_vars = ["CDF_HOST", "CDF_PROJECT", "CDF_CLIENT_ID", "CDF_CLIENT_SECRET", "CDF_TOKEN_URL"]
-            missing = [var for var in required_vars if not os.getenv(var)]
+            # Check dataset IDs
+            datasets = {
+                "Master": os.getenv("CDF_DATASET_PLEXMASTER"),
+                "Quality": os.getenv("CDF_DATASET_PLEXQUALITY"),
+                "Production": os.getenv("CDF_DATASET_PLEXPRODUCTION"),
+                "Inventory": os.getenv("CDF_DATASET_PLEXINVENTORY"),
+                "Scheduling": os.getenv("CDF_DATASET_PLEXSCHEDULING"),
+            }
             
-            if missing:
-                print(f"✗ Missing environment variables: {missing}")
-                self.results["cdf"]["config"] = {"status": "Missing vars", "missing": missing}
-            else:
-                print("✓ All CDF environment variables configured")
-                self.results["cdf"]["config"] = {"status": "OK"}
-                
-                # Check dataset IDs
-                datasets = {
-                    "Master": os.getenv("CDF_DATASET_PLEXMASTER"),
-                    "Quality": os.getenv("CDF_DATASET_PLEXQUALITY"),
-                    "Production": os.getenv("CDF_DATASET_PLEXPRODUCTION"),
-                    "Inventory": os.getenv("CDF_DATASET_PLEXINVENTORY"),
-                    "Scheduling": os.getenv("CDF_DATASET_PLEXSCHEDULING"),
-                }
-                
-                configured = {k: v for k, v in datasets.items() if v}
-                print(f"✓ Datasets configured: {list(configured.keys())}")
-                self.results["cdf"]["datasets"] = configured
-                
-        except ImportError as e:
-            print(f"✗ CDF SDK not installed: {e}")
-            self.results["cdf"]["sdk"] = {"status": "Not installed"}
+            configured = {k: v for k, v in datasets.items() if v}
+            print(f"✓ Datasets configured: {list(configured.keys())}")
+            self.results["cdf"]["datasets"] = configured
     
     async def run_all_tests(self):
         """Run all extractor tests"""
@@ -247,12 +325,11 @@ class EnhancedExtractorTester:
         print(f"Testing with Customer ID: {self.customer_id}")
         print(f"Base URL: {self.base_url}")
         
-        # Run tests
-        await self.test_master_data_extractor()
-        await self.test_jobs_extractor()
-        await self.test_production_extractor()
-        await self.test_inventory_extractor()
-        await self.test_cdf_basics()
+        # Start the slow CDF SDK import now so it overlaps the Plex probes
+        sdk_import = asyncio.create_task(self._import_cdf_sdk())
+        
+        await self.run_probes()
+        await self.test_cdf_basics(sdk_import)
         
         # Print summary
         print("\n" + "="*60)
@@ -263,15 +340,14 @@ class EnhancedExtractorTester:
         total_ok = 0
         total_failed = 0
         
-        for category, results in self.results.items():
-            if isinstance(results, dict):
-                ok_count = sum(1 for r in results.values() if isinstance(r, dict) and r.get("status") == "OK")
-                fail_count = sum(1 for r in results.values() if isinstance(r, dict) and r.get("status") not in ["OK", None])
-                
-                if ok_count > 0 or fail_count > 0:
-                    print(f"{category.upper()}: {ok_count} OK, {fail_count} Failed")
-                    total_ok += ok_count
-                    total_failed += fail_count
+        for category in self.results:
+            ok_count = self.counters[(category, "ok")]
+            fail_count = self.counters[(category, "fail")]
+            
+            if ok_count > 0 or fail_count > 0:
+                print(f"{category.upper()}: {ok_count} OK, {fail_count} Failed")
+                total_ok += ok_count
+                total_failed += fail_count
         
         print(f"\nTOTAL: {total_ok} endpoints working, {total_failed} failed")
         
@@ -294,10 +370,15 @@ class EnhancedExtractorTester:
         print("3. Configure Data Source API credentials for quality data")
         print("4. Set up CDF authentication for full pipeline testing")
 
-async def main():
+async def main(use_cache: bool = False):
     """Main test runner"""
-    tester = EnhancedExtractorTester()
-    await tester.run_all_tests()
+    async with EnhancedExtractorTester(use_cache) as tester:
+        await tester.run_all_tests()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Test connectivity for enhanced extractors")
+    parser.add_argument("--use-cache", action="store_true",
+                        help="Skip endpoints that answered 200 within PROBE_CACHE_TTL instead of re-probing them")
+    args = parser.parse_args()
+    
+    asyncio.run(main(use_cache=args.use_cache))
\ No newline at end of file
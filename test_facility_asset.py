@@ -4,39 +4,19 @@ Test creating facility asset
 """
 
 import os
-import asyncio
 from dotenv import load_dotenv
-from cognite.client import CogniteClient
-from cognite.client.config import ClientConfig
-from cognite.client.credentials import OAuthClientCredentials
 from cognite.client.data_classes import Asset
 
+from cdf_client_factory import get_client
+
 # Load environment variables
 load_dotenv()
 
-def init_cdf_client():
-    """Initialize CDF client"""
-    creds = OAuthClientCredentials(
-        token_url=os.getenv("CDF_TOKEN_URL"),
-        client_id=os.getenv("CDF_CLIENT_ID"),
-        client_secret=os.getenv("CDF_CLIENT_SECRET"),
-        scopes=["user_impersonation"]
-    )
-    
-    return CogniteClient(
-        ClientConfig(
-            client_name="test-facility",
-            base_url=os.getenv("CDF_HOST"),
-            project=os.getenv("CDF_PROJECT"),
-            credentials=creds
-        )
-    )
-
 def main():
     """Create facility asset"""
     print("Creating facility asset...")
     
-    client = init_cdf_client()
+    client = get_client()
     pcn = os.getenv("PLEX_CUSTOMER_ID", "340884")
     
     # Create facility asset
@@ -56,22 +36,19 @@ def main():
         data_set_id=int(os.getenv("CDF_DATASET_PLEXMASTER"))
     )
     
+    # Master root hangs off the facility by external id, so both can go in one request
+    master_root = Asset(
+        external_id=f"PCN{pcn}_master_root_{pcn}",
+        name=f"RADEMO - Master Data",
+        parent_external_id=facility_asset.external_id,
+        metadata={'type': 'master_root'},
+        data_set_id=int(os.getenv("CDF_DATASET_PLEXMASTER"))
+    )
+    
     try:
-        # Upsert facility asset
-        result = client.assets.upsert([facility_asset])
-        print(f"✓ Created facility asset: {result[0].external_id}")
-        
-        # Now create master root with facility as parent
-        master_root = Asset(
-            external_id=f"PCN{pcn}_master_root_{pcn}",
-            name=f"RADEMO - Master Data",
-            parent_external_id=f"PCN{pcn}_facility_{pcn}",
-            metadata={'type': 'master_root'},
-            data_set_id=int(os.getenv("CDF_DATASET_PLEXMASTER"))
-        )
-        
-        result = client.assets.upsert([master_root])
-        print(f"✓ Created master root: {result[0].external_id}")
+        result = client.assets.upsert([facility_asset, master_root])
+        for asset in result:
+            print(f"✓ Created {asset.external_id}")
         
     except Exception as e:
         print(f"✗ Error: {e}")
@@ -3,18 +3,78 @@
 Test Master Data and Quality API endpoints specifically
 """
 
+import argparse
+import asyncio
+import importlib.util
 import httpx
 import os
 from dotenv import load_dotenv
-import json
+import orjson
+
+from probe_cache import DiscoveryCache
 
 load_dotenv()
 
-def test_endpoints():
+# Plex probes in flight at once
+MAX_CONCURRENT_PROBES = int(os.getenv("PLEX_MAX_CONCURRENT", "16"))
+
+def _short_err(e: Exception, n: int = 50) -> str:
+    """Exception type and first argument, cut to n characters"""
+    name = type(e).__name__
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"{name}: {e.response.status_code}"[:n]
+    msg = e.args[0] if e.args else ""
+    return f"{name}: {msg if isinstance(msg, str) else repr(msg)}"[:n]
+
+async def _probe(client: httpx.AsyncClient, sem: asyncio.Semaphore, endpoint: str,
+                 cache: DiscoveryCache, inspect_body: bool = False) -> str:
+    """Probe one endpoint with limit=1 and describe the outcome in one line
+    
+    Availability only needs the status code, so a HEAD request is sent
+    unless inspect_body asks for a sample payload; endpoints that reject
+    HEAD with 405 are retried once with GET.
+    """
+    if cache.is_fresh_ok(endpoint):
+        return f"✓ {endpoint}: OK (cached, not re-verified)"
+    try:
+        params = {"limit": 1}
+        resp = None
+        async with sem:
+            if not inspect_body:
+                resp = await client.head(endpoint, params=params)
+            if resp is None or resp.status_code == 405:
+                resp = await client.get(endpoint, params=params)
+        cache.put(endpoint, resp.status_code)
+        if resp.status_code == 200:
+            if resp.request.method == "HEAD":
+                return f"✓ {endpoint}: OK"
+            data = orjson.loads(resp.content)
+            if isinstance(data, list):
+                return f"✓ {endpoint}: OK (list with {len(data)} items)"
+            elif isinstance(data, dict):
+                keys = list(data.keys())[:3]
+                return f"✓ {endpoint}: OK (dict with keys: {keys})"
+            else:
+                return f"✓ {endpoint}: OK ({type(data).__name__})"
+        else:
+            return f"✗ {endpoint}: {resp.status_code}"
+    except Exception as e:
+        return f"✗ {endpoint}: Error - {_short_err(e)}"
+
+async def _probe_group(client: httpx.AsyncClient, sem: asyncio.Semaphore, cache: DiscoveryCache,
+                       title: str, endpoints, inspect_body: bool = False):
+    """Probe a group of endpoints concurrently and print them in order"""
+    lines = await asyncio.gather(*(_probe(client, sem, endpoint, cache, inspect_body) for endpoint in endpoints))
+    print(f"\n--- {title} ---")
+    print("\n".join(lines))
+
+async def test_endpoints(use_cache: bool = False, inspect_body: bool = False):
     """Test various API endpoints to find what's available"""
     
     api_key = os.getenv("PLEX_API_KEY")
     customer_id = os.getenv("PLEX_CUSTOMER_ID", "340884")
+    cache = DiscoveryCache(customer_id, enabled=use_cache)
+    sem = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
     
     headers = {
         "X-Plex-Connect-Api-Key": api_key,
@@ -39,25 +99,6 @@ def test_endpoints():
         "/mdm/v1/customers",
     ]
     
-    print("\n--- Master Data Endpoints ---")
-    for endpoint in master_endpoints:
-        url = f"https://connect.plex.com{endpoint}"
-        try:
-            resp = httpx.get(url, params={"limit": 1}, headers=headers, timeout=5.0)
-            if resp.status_code == 200:
-                data = resp.json()
-                if isinstance(data, list):
-                    print(f"✓ {endpoint}: OK (list with {len(data)} items)")
-                elif isinstance(data, dict):
-                    keys = list(data.keys())[:3]
-                    print(f"✓ {endpoint}: OK (dict with keys: {keys})")
-                else:
-                    print(f"✓ {endpoint}: OK ({type(data).__name__})")
-            else:
-                print(f"✗ {endpoint}: {resp.status_code}")
-        except Exception as e:
-            print(f"✗ {endpoint}: Error - {str(e)[:50]}")
-    
     # Quality endpoints to test
     quality_endpoints = [
         "/quality/v1/defects",
@@ -70,25 +111,6 @@ def test_endpoints():
         "/mdm/v1/quality/checksheets",
     ]
     
-    print("\n--- Quality Endpoints ---")
-    for endpoint in quality_endpoints:
-        url = f"https://connect.plex.com{endpoint}"
-        try:
-            resp = httpx.get(url, params={"limit": 1}, headers=headers, timeout=5.0)
-            if resp.status_code == 200:
-                data = resp.json()
-                if isinstance(data, list):
-                    print(f"✓ {endpoint}: OK (list with {len(data)} items)")
-                elif isinstance(data, dict):
-                    keys = list(data.keys())[:3]
-                    print(f"✓ {endpoint}: OK (dict with keys: {keys})")
-                else:
-                    print(f"✓ {endpoint}: OK ({type(data).__name__})")
-            else:
-                print(f"✗ {endpoint}: {resp.status_code}")
-        except Exception as e:
-            print(f"✗ {endpoint}: Error - {str(e)[:50]}")
-    
     # Test production endpoints that might have quality data
     production_endpoints = [
         "/production/v1/scheduling/jobs",
@@ -97,24 +119,25 @@ def test_endpoints():
         "/production/v1/workcenters/status",
     ]
     
-    print("\n--- Production Endpoints (for context) ---")
-    for endpoint in production_endpoints:
-        url = f"https://connect.plex.com{endpoint}"
-        try:
-            resp = httpx.get(url, params={"limit": 1}, headers=headers, timeout=5.0)
-            if resp.status_code == 200:
-                data = resp.json()
-                if isinstance(data, list):
-                    print(f"✓ {endpoint}: OK (list with {len(data)} items)")
-                elif isinstance(data, dict):
-                    keys = list(data.keys())[:3]
-                    print(f"✓ {endpoint}: OK (dict with keys: {keys})")
-                else:
-                    print(f"✓ {endpoint}: OK ({type(data).__name__})")
-            else:
-                print(f"✗ {endpoint}: {resp.status_code}")
-        except Exception as e:
-            print(f"✗ {endpoint}: Error - {str(e)[:50]}")
+    # One keep-alive client serves every probe; HTTP/2 when h2 is installed
+    async with httpx.AsyncClient(
+        base_url="https://connect.plex.com",
+        headers=headers,
+        timeout=5.0,
+        limits=httpx.Limits(max_keepalive_connections=20),
+        http2=importlib.util.find_spec("h2") is not None
+    ) as client:
+        await _probe_group(client, sem, cache, "Master Data Endpoints", master_endpoints, inspect_body)
+        await _probe_group(client, sem, cache, "Quality Endpoints", quality_endpoints, inspect_body)
+        await _probe_group(client, sem, cache, "Production Endpoints (for context)", production_endpoints, inspect_body)
+    
+    cache.save()
 
 if __name__ == "__main__":
-    test_endpoints()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Discover available Plex master data and quality endpoints")
+    parser.add_argument("--use-cache", action="store_true",
+                        help="Skip endpoints that answered 200 within PROBE_CACHE_TTL instead of re-probing them")
+    parser.add_argument("--inspect-body", action="store_true", help="GET each endpoint and describe a sample payload")
+    args = parser.parse_args()
+    
+    asyncio.run(test_endpoints(use_cache=args.use_cache, inspect_body=args.inspect_body))
\ No newline at end of file
@@ -37,16 +37,29 @@ async def main():
     # Create and run orchestrator
     orchestrator = EnhancedOrchestrator(config)
     
-    # Run with timeout
+    # Run until the single pass completes, giving up after 5 seconds
+    start_task = asyncio.create_task(orchestrator.start())
+    completed = asyncio.create_task(orchestrator.completion_event.wait())
     try:
-        await asyncio.wait_for(orchestrator.start(), timeout=5)
-        print("\n✓ Orchestrator completed successfully!")
-    except asyncio.TimeoutError:
-        print("\n✓ Orchestrator is running (stopped by timeout)")
+        done, _ = await asyncio.wait(
+            {start_task, completed},
+            timeout=5,
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        if start_task in done:
+            start_task.result()  # Re-raise anything start() failed with
+        if done:
+            print("\n✓ Orchestrator completed successfully!")
+        else:
+            print("\n✓ Orchestrator is running (stopped by timeout)")
     except Exception as e:
         print(f"\n✗ Error: {e}")
     finally:
+        completed.cancel()
         await orchestrator.stop()
+        if not start_task.done():
+            start_task.cancel()
+        await asyncio.gather(start_task, return_exceptions=True)
         
     # Show results
     if orchestrator.health: